@@ -0,0 +1,200 @@
+"""Benchmarks of the websocket client hot paths.
+
+Measures WebsocketClient.on_message decode and dispatch throughput for
+updateStream, deal and asset frames, send_websocket_request latency from a
+caller thread to the socket write, and the end-to-end buy round trip
+against pocketoptionapi.local_server.
+
+Usage:
+    python -m benchmarks.bench_client
+    python -m benchmarks.bench_client --quick
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+
+from pocketoptionapi.local_server import LocalServer, default_price
+from pocketoptionapi.session_state import SessionState
+
+# Реальный счет: демо-счета всегда подключаются к демо-серверу, а не к регионам
+SSID = '42["auth",{"session":"local","isDemo":0,"uid":1,"platform":2}]'
+
+
+class NullWebsocket:
+    """Websocket stand-in that accepts every frame"""
+
+    closed = False
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, data):
+        self.sent += 1
+
+
+def make_api():
+    """PocketOptionAPI for the current event loop"""
+    from pocketoptionapi.api import PocketOptionAPI
+    return PocketOptionAPI(SSID, state=SessionState(SSID, demo=False))
+
+
+async def attach(client):
+    """Bind the client to the running loop with a NullWebsocket and a sender task"""
+    client._attach_loop(asyncio.get_running_loop())
+    client.websocket = NullWebsocket()
+    return asyncio.ensure_future(client.sender())
+
+
+def binary_event(event, payload):
+    return f'451-["{event}",{{"_placeholder":true,"num":0}}]', json.dumps(payload).encode()
+
+
+def format_time(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(timestamp))
+
+
+def make_deal(index, now=1700000000):
+    return {
+        "id": f"deal-{index}", "openTime": format_time(now + index), "closeTime": format_time(now + index + 60),
+        "uid": 1, "isDemo": 1, "amount": 1, "profit": 0.92 if index % 2 else -1, "percentProfit": 92,
+        "openPrice": 1.1, "closePrice": 1.1001, "command": index % 2, "asset": "EURUSD_otc",
+        "requestId": str(index), "currency": "USD",
+    }
+
+
+def make_frames(kind, count):
+    """(header, binary payload) pairs of one frame kind"""
+    if kind == 'stream':
+        return [binary_event("updateStream", [["EURUSD_otc", 1700000000 + i / 4, default_price("EURUSD_otc", i)]])
+                for i in range(count)]
+    if kind == 'deals':
+        return [binary_event("successopenOrder", make_deal(i)) for i in range(count)]
+    if kind == 'assets':
+        rows = [[i, f"ASSET{i}_otc", f"Asset {i}", "currency", 2, 92, 60, 30, 3, 0, 170, 0, [], 0, True,
+                 [{"time": 60}], -1601, 60, 0] for i in range(150)]
+        return [binary_event("updateAssets", rows)] * count
+    raise ValueError(kind)
+
+
+def bench_on_message(kind, count):
+    """Frames per second through on_message"""
+    frames = make_frames(kind, count)
+
+    async def run():
+        client = make_api().websocket
+        sender = await attach(client)
+        started = time.perf_counter()
+        for header, payload in frames:
+            await client.on_message(header)
+            await client.on_message(payload)
+        elapsed = time.perf_counter() - started
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+        return elapsed
+
+    elapsed = asyncio.run(run())
+    return {'name': f'on_message[{kind}]', 'size': count, 'value': count / elapsed, 'unit': 'msg/s',
+            'better': 'higher'}
+
+
+def bench_send_latency(count):
+    """Latency of send_websocket_request from a caller thread until the frame is written"""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    api = sender = None
+
+    def run_loop():
+        nonlocal api, sender
+        asyncio.set_event_loop(loop)
+        api = make_api()
+        sender = loop.run_until_complete(attach(api.websocket))
+        ready.set()
+        loop.run_forever()
+        sender.cancel()
+        loop.run_until_complete(asyncio.gather(sender, return_exceptions=True))
+        loop.close()
+
+    thread = threading.Thread(target=run_loop, daemon=True)
+    thread.start()
+    ready.wait(5)
+
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        api.send_websocket_request("sendMessage", ["ps"]).result(5)
+        latencies.append(time.perf_counter() - started)
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    latencies.sort()
+    return [
+        {'name': 'send_websocket_request[p50]', 'size': count, 'value': statistics.median(latencies), 'unit': 's',
+         'better': 'lower'},
+        {'name': 'send_websocket_request[p99]', 'size': count, 'value': latencies[int(len(latencies) * 0.99) - 1],
+         'unit': 's', 'better': 'lower'},
+    ]
+
+
+def bench_buy_roundtrip(count, batch=20):
+    """Order round trips against the local stand-in server"""
+    from pocketoptionapi.async_api import AsyncPocketOption
+
+    server = LocalServer(tick_rate=0, deal_duration=3600).start_in_thread()
+
+    async def run():
+        client = AsyncPocketOption(SSID, state=SessionState())
+        client.api.websocket.region.REGIONS = server.regions
+        async with client:
+            latencies = []
+            for _ in range(count):
+                started = time.perf_counter()
+                ok, _ = await client.buy(1, "EURUSD_otc", "call", 60)
+                assert ok, "Order was not opened"
+                latencies.append(time.perf_counter() - started)
+
+            result = await client.buy_many([(1, "EURUSD_otc", "call", 60)] * batch)
+            assert result.ok, result.errors
+            return latencies, result.elapsed
+
+    try:
+        latencies, batch_elapsed = asyncio.run(run())
+    finally:
+        server.stop_thread()
+
+    latencies.sort()
+    return [
+        {'name': 'buy_roundtrip[p50]', 'size': count, 'value': statistics.median(latencies), 'unit': 's',
+         'better': 'lower'},
+        {'name': 'buy_roundtrip[p99]', 'size': count, 'value': latencies[int(len(latencies) * 0.99) - 1],
+         'unit': 's', 'better': 'lower'},
+        {'name': 'buy_many', 'size': batch, 'value': batch_elapsed, 'unit': 's', 'better': 'lower'},
+    ]
+
+
+def run(quick=False):
+    """Run the client benchmarks and return a list of result rows"""
+    scale = 10 if quick else 1
+    results = [
+        bench_on_message('stream', 50_000 // scale),
+        bench_on_message('deals', 20_000 // scale),
+        bench_on_message('assets', 500 // scale),
+    ]
+    results += bench_send_latency(5_000 // scale)
+    results += bench_buy_roundtrip(500 // scale)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help='Smaller sizes for a fast check')
+    args = parser.parse_args()
+
+    for row in run(args.quick):
+        print(f"{row['name']:<36} {row['size']:>8} {row['value']:>14.6g} {row['unit']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Benchmarks of candle and trade data processing.
+
+Measures process_data_history and process_candle at several history sizes,
+EnhancedCandles.update_realtime at growing cache sizes and
+TradeData.get_filtered_history at 10k and 100k trades.
+
+Usage:
+    python -m benchmarks.bench_data
+    python -m benchmarks.bench_data --quick
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_resample import make_history, measure
+
+
+def make_candles(count, period=60, start=1700000000):
+    return [{'time': start + i * period, 'open': 1.1, 'high': 1.1002, 'low': 1.0998, 'close': 1.1001}
+            for i in range(count)]
+
+
+def bench_process_history(sizes, period=60, repeat=3):
+    from pocketoptionapi.stable_api import PocketOption
+
+    results = []
+    for size in sizes:
+        data = make_history(size)
+        results.append({'name': 'process_data_history', 'size': size,
+                        'value': measure(PocketOption.process_data_history, data, period, repeat),
+                        'unit': 's', 'better': 'lower'})
+
+        candles = make_candles(size // 240 or 1, period)
+        results.append({'name': 'process_candle', 'size': len(candles),
+                        'value': measure(PocketOption.process_candle, candles, period, repeat),
+                        'unit': 's', 'better': 'lower'})
+    return results
+
+
+def bench_update_realtime(cache_sizes, updates=20_000):
+    """Realtime candle updates per second with a filled cache"""
+    from pocketoptionapi.ws.objects.enhanced_candles import EnhancedCandles
+
+    results = []
+    for cache_size in cache_sizes:
+        candles = EnhancedCandles(max_candles=cache_size)
+        start = 1700000000
+        for candle in make_candles(cache_size, start=start):
+            candles.update_realtime("EURUSD_otc", 60, candle)
+
+        # Обновления текущей свечи и открытие новых, как в живом потоке
+        stream = [{'time': start + (cache_size + i // 60) * 60, 'open': 1.1, 'high': 1.1002, 'low': 1.0998,
+                   'close': 1.1 + (i % 7) * 1e-5} for i in range(updates)]
+        started = time.perf_counter()
+        for candle in stream:
+            candles.update_realtime("EURUSD_otc", 60, candle)
+        elapsed = time.perf_counter() - started
+        results.append({'name': 'EnhancedCandles.update_realtime', 'size': cache_size, 'value': updates / elapsed,
+                        'unit': 'updates/s', 'better': 'higher'})
+    return results
+
+
+def make_trades(count, seed=0):
+    rng = random.Random(seed)
+    assets = ["EURUSD_otc", "AUDNZD_otc", "EURJPY_otc", "GBPUSD_otc", "#AAPL_otc"]
+    start = 1700000000
+    trades = []
+    for i in range(count):
+        opened = start + i * 30
+        profit = 0.92 if rng.random() > 0.5 else -1
+        trades.append({
+            'id': f"trade-{i}",
+            'openTime': time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(opened)),
+            'closeTime': time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(opened + 60)),
+            'asset': rng.choice(assets), 'amount': rng.choice([1, 2, 5, 10]), 'profit': profit,
+            'percentProfit': 92, 'openPrice': 1.1, 'closePrice': 1.1001, 'command': i % 2,
+            'isDemo': i % 3 == 0, 'currency': 'USD',
+        })
+    return trades
+
+
+def bench_filtered_history(sizes, repeat=5):
+    from pocketoptionapi.session_state import SessionState
+    from pocketoptionapi.ws.objects.trade_data import TradeData
+
+    results = []
+    for size in sizes:
+        trade_data = TradeData(state=SessionState())
+        trade_data.process_trade_message(make_trades(size))
+
+        # Один день по одному активу и месяц по всем активам
+        day = ("2023-11-20 00:00:00", "2023-11-21 00:00:00")
+        queries = {
+            'asset_day': dict(asset="EURUSD_otc", start_date=day[0], end_date=day[1]),
+            'demo_all': dict(is_demo=True),
+            'all_min_amount': dict(min_amount=5),
+        }
+        for label, query in queries.items():
+            best = float('inf')
+            for _ in range(repeat):
+                started = time.perf_counter()
+                trade_data.get_filtered_history(**query)
+                best = min(best, time.perf_counter() - started)
+            results.append({'name': f'TradeData.get_filtered_history[{label}]', 'size': size, 'value': best,
+                            'unit': 's', 'better': 'lower'})
+    return results
+
+
+def run(quick=False):
+    """Run the data benchmarks and return a list of result rows"""
+    if quick:
+        return (bench_process_history([10_000, 100_000]) + bench_update_realtime([1_000, 10_000], 5_000)
+                + bench_filtered_history([10_000]))
+    return (bench_process_history([10_000, 100_000, 1_000_000]) + bench_update_realtime([1_000, 10_000, 100_000])
+            + bench_filtered_history([10_000, 100_000]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help='Smaller sizes for a fast check')
+    args = parser.parse_args()
+
+    for row in run(args.quick):
+        print(f"{row['name']:<48} {row['size']:>8} {row['value']:>14.6g} {row['unit']}")
+
+
+if __name__ == '__main__':
+    main()
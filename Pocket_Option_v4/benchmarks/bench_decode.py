@@ -0,0 +1,87 @@
+"""Benchmark of binary frame JSON decoding.
+
+Compares the previous on_message path, decode('utf-8') followed by
+json.loads, with FrameDecoder on every installed backend for updateStream,
+deal list, updateAssets and loadHistoryPeriod payloads.
+
+Usage:
+    python -m benchmarks.bench_decode
+    python -m benchmarks.bench_decode --quick
+"""
+import argparse
+import json
+import time
+
+from benchmarks.bench_client import make_deal, make_frames
+from benchmarks.bench_resample import make_history
+from pocketoptionapi.ws.decoder import FrameDecoder, available_backends
+
+
+def legacy_decode(event, data):
+    """Binary frame decoding as on_message did it before FrameDecoder"""
+    return json.loads(data.decode('utf-8'))
+
+
+def make_payloads(history_size):
+    """Event name, size and encoded payload of each frame kind"""
+    rows = [["EURUSD_otc", 1700000000 + i / 4, 1.1 + i * 1e-5] for i in range(100)]
+    history = dict(make_history(history_size), asset="EURUSD_otc", period=60)
+    return {
+        'stream': ('updateStream', 1, json.dumps(rows[:1]).encode()),
+        'stream_batch': ('updateStream', len(rows), json.dumps(rows).encode()),
+        'deals': ('updateClosedDeals', 100, json.dumps([make_deal(i) for i in range(100)]).encode()),
+        'assets': ('updateAssets', 150, make_frames('assets', 1)[0][1]),
+        'history': ('loadHistoryPeriod', history_size, json.dumps(history).encode()),
+    }
+
+
+def measure(decode, event, data, seconds=0.2):
+    """Best time per call over several timed rounds"""
+    count = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(count):
+            decode(event, data)
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds / 5:
+            break
+        count *= 2
+
+    best = elapsed / count
+    for _ in range(4):
+        started = time.perf_counter()
+        for _ in range(count):
+            decode(event, data)
+        best = min(best, (time.perf_counter() - started) / count)
+    return best
+
+
+def bench_decode(history_size):
+    decoders = {'legacy': legacy_decode}
+    for backend in available_backends():
+        decoders[backend] = FrameDecoder(backend).decode
+
+    results = []
+    for kind, (event, size, data) in make_payloads(history_size).items():
+        for name, decode in decoders.items():
+            results.append({'name': f'decode[{kind}][{name}]', 'size': size, 'value': measure(decode, event, data),
+                            'unit': 's', 'better': 'lower'})
+    return results
+
+
+def run(quick=False):
+    """Run the decoding benchmarks and return a list of result rows"""
+    return bench_decode(10_000 if quick else 100_000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help='Smaller sizes for a fast check')
+    args = parser.parse_args()
+
+    for row in run(args.quick):
+        print(f"{row['name']:<36} {row['size']:>8} {row['value'] * 1e6:>12.2f} us")
+
+
+if __name__ == '__main__':
+    main()
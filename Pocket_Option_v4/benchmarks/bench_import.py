@@ -0,0 +1,94 @@
+"""Benchmark of the cold import time of pocketoptionapi.stable_api.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+takes the best cumulative import time of the module. Also checks that the
+lazily loaded dependencies (pandas, requests, tzlocal) are not imported.
+Exits with status 1 when the time is over the budget or a lazy dependency
+got imported, so it can gate a release.
+
+Usage:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --budget 0.3 --top 15
+"""
+import argparse
+import subprocess
+import sys
+
+MODULE = 'pocketoptionapi.stable_api'
+
+# Цель: импорт без pandas/requests/tzlocal, основное время - numpy и asyncio
+# (~0.2 с против ~0.75 с с pandas; измерено с заглушками модулей из benchmarks.suite)
+DEFAULT_BUDGET = 0.3
+
+# Зависимости, которые должны загружаться только при использовании
+LAZY_MODULES = ('pandas', 'requests', 'tzlocal', 'pyarrow')
+
+
+def import_profile(module=MODULE):
+    """Import module in a fresh interpreter
+
+    Returns:
+        tuple: ({module: (self seconds, cumulative seconds)}, list of lazy modules that got imported)
+    """
+    code = f"import sys, {module}; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                             timeout=60)
+    if process.returncode != 0:
+        raise RuntimeError(f"Import of {module} failed:\n{process.stderr[-2000:]}")
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own) / 1e6, int(cumulative) / 1e6)
+    loaded = [name for name in process.stdout.strip().split(',') if name]
+    return times, loaded
+
+
+def measure(module=MODULE, repeat=5):
+    """Best cumulative import time of module over repeat runs"""
+    best, best_times, loaded = float('inf'), {}, []
+    for _ in range(repeat):
+        times, loaded = import_profile(module)
+        if times[module][1] < best:
+            best, best_times = times[module][1], times
+    return best, best_times, loaded
+
+
+def run(quick=False):
+    """Run the import benchmark and return a list of result rows"""
+    best, _, loaded = measure(repeat=3 if quick else 10)
+    return [
+        {'name': f'import[{MODULE}]', 'size': None, 'value': best, 'unit': 's', 'better': 'lower'},
+        {'name': f'import[{MODULE}][lazy modules loaded]', 'size': None, 'value': len(loaded), 'unit': 'modules',
+         'better': 'lower'},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default=MODULE)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help='Allowed import time in seconds')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest modules to list')
+    args = parser.parse_args()
+
+    best, times, loaded = measure(args.module, args.repeat)
+    print(f"{args.module}: {best * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)")
+    print(f"{'module':<48} {'self ms':>9} {'cumulative ms':>14}")
+    for name, (own, cumulative) in sorted(times.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{name:<48} {own * 1000:>9.1f} {cumulative * 1000:>14.1f}")
+
+    status = 0
+    if loaded:
+        print(f"Lazy dependencies imported: {', '.join(loaded)}", file=sys.stderr)
+        status = 1
+    if best > args.budget:
+        print(f"Import time {best * 1000:.1f} ms is over the budget", file=sys.stderr)
+        status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Benchmark of typed records against the raw dicts and lists.
+
+Measures memory per object with tracemalloc, the time to build the
+objects and the time to sum one field over all objects, for ticks, deals,
+trades and candles. Field values are created before the measurement and
+shared by both variants, so the memory figure is the cost of the container
+itself. Fields are read by a loop compiled from the field expression,
+`obj.profit` or `obj['profit']`, as strategy code reads them, so the
+access time is not hidden behind a function call per object.
+
+Usage:
+    python -m benchmarks.bench_records
+    python -m benchmarks.bench_records --quick
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.bench_client import make_deal
+from pocketoptionapi.ws.objects.enhanced_candles import CandleData
+from pocketoptionapi.ws.objects.records import Deal, Tick, Trade
+
+
+class LegacyCandleData:
+    """CandleData as it was before __slots__"""
+
+    def __init__(self, time, open, close, high, low):
+        self.time = time
+        self.open = open
+        self.close = close
+        self.high = high
+        self.low = low
+
+
+def legacy_trade(deal):
+    """Trade dict as TradeData built it before Trade records"""
+    return {
+        'id': deal['id'], 'openTime': deal.get('openTime'), 'closeTime': deal.get('closeTime'),
+        'asset': deal.get('asset'), 'amount': deal.get('amount'), 'profit': deal.get('profit'),
+        'percentProfit': deal.get('percentProfit'), 'openPrice': deal.get('openPrice'),
+        'closePrice': deal.get('closePrice'), 'direction': deal.get('command'), 'isDemo': deal.get('isDemo'),
+        'currency': deal.get('currency'), 'status': 'win' if deal.get('profit', 0) > 0 else 'loss',
+        'openTimestamp': 1700000000, 'closeTimestamp': 1700000060,
+    }
+
+
+def record_trade(deal):
+    trade = Trade.from_deal(deal)
+    trade.openTimestamp = 1700000000
+    trade.closeTimestamp = 1700000060
+    return trade
+
+
+def memory_per_object(build, sources):
+    """Bytes allocated per object built by build(source)"""
+    objects = [None] * len(sources)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i, source in enumerate(sources):
+        objects[i] = build(source)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(sources), objects
+
+
+def make_reader(expression):
+    """Compile a function summing expression of obj over a list of objects"""
+    namespace = {}
+    exec(f"def read_all(objects):\n"
+         f"    total = 0\n"
+         f"    for obj in objects:\n"
+         f"        total += {expression}\n"
+         f"    return total\n", namespace)
+    return namespace['read_all']
+
+
+def access_time(objects, expression, repeat=5):
+    """Best time to sum one field over all objects"""
+    read_all = make_reader(expression)
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        read_all(objects)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def build_time(build, sources, repeat=5):
+    """Best time to build an object from every source"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(map(build, sources))
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def make_sources(kind, count):
+    """Field values of count objects of one kind"""
+    if kind == 'tick':
+        return [["EURUSD_otc", 1700000000.0 + i, 1.1 + i * 1e-9] for i in range(count)]
+    if kind == 'candle':
+        return [(1700000000 + i * 60, 1.1, 1.2, 1.3, 1.0) for i in range(count)]
+    return [make_deal(i) for i in range(count)]
+
+
+# Вид -> (вариант -> (конструктор, выражение чтения поля obj))
+KINDS = {
+    'tick': {
+        'list': (list, "obj[2]"),
+        'Tick': (lambda row: Tick(row[0], row[1], row[2]), "obj.price"),
+    },
+    'deal': {
+        'dict': (dict, "obj['profit']"),
+        'Deal': (Deal.from_dict, "obj.profit"),
+    },
+    'trade': {
+        'dict': (legacy_trade, "obj['profit']"),
+        'Trade': (record_trade, "obj.profit"),
+    },
+    'candle': {
+        'object': (lambda values: LegacyCandleData(*values), "obj.close"),
+        'CandleData': (lambda values: CandleData(*values), "obj.close"),
+    },
+}
+
+
+def bench_records(count):
+    results = []
+    for kind, variants in KINDS.items():
+        sources = make_sources(kind, count)
+        for variant, (build, read) in variants.items():
+            per_object, objects = memory_per_object(build, sources)
+            results.append({'name': f'memory[{kind}][{variant}]', 'size': count, 'value': per_object,
+                            'unit': 'bytes', 'better': 'lower'})
+            results.append({'name': f'build[{kind}][{variant}]', 'size': count,
+                            'value': build_time(build, sources), 'unit': 's', 'better': 'lower'})
+            results.append({'name': f'access[{kind}][{variant}]', 'size': count,
+                            'value': access_time(objects, read), 'unit': 's', 'better': 'lower'})
+    return results
+
+
+def run(quick=False):
+    """Run the record benchmarks and return a list of result rows"""
+    return bench_records(20_000 if quick else 200_000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help='Smaller sizes for a fast check')
+    args = parser.parse_args()
+
+    for row in run(args.quick):
+        print(f"{row['name']:<32} {row['size']:>8} {row['value']:>14.6g} {row['unit']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark of tick-to-OHLC resampling used by process_data_history.
+
+Compares the previous pandas groupby implementation with the NumPy
+resampler from pocketoptionapi.resample.
+
+Usage:
+    python -m benchmarks.bench_resample
+    python -m benchmarks.bench_resample --sizes 10000 100000 --period 60
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pocketoptionapi.resample import resample_ticks, history_to_arrays, candles_to_records
+
+
+def legacy_process_data_history(data, period):
+    """process_data_history as it was implemented with pandas groupby"""
+    df = pd.DataFrame(data['history'], columns=['timestamp', 'price'])
+    df['datetime'] = pd.to_datetime(df['timestamp'], unit='s', utc=True)
+    df['minute_rounded'] = df['datetime'].dt.floor(f'{period / 60}min')
+
+    ohlcv = df.groupby('minute_rounded').agg(
+        open=('price', 'first'),
+        high=('price', 'max'),
+        low=('price', 'min'),
+        close=('price', 'last')
+    ).reset_index()
+
+    ohlcv['time'] = ohlcv['minute_rounded'].apply(lambda x: int(x.timestamp()))
+    ohlcv = ohlcv.drop(columns='minute_rounded')
+    ohlcv = ohlcv.iloc[:-1]
+    return ohlcv.to_dict(orient='records')
+
+
+def numpy_process_data_history(data, period):
+    timestamps, prices = history_to_arrays(data['history'])
+    return candles_to_records(resample_ticks(timestamps, prices, period, drop_last=True)[period])
+
+
+def numpy_resample_array(data, period):
+    timestamps, prices = history_to_arrays(data['history'])
+    return resample_ticks(timestamps, prices, period, drop_last=True)[period]
+
+
+def make_history(size, seed=0):
+    """Generate loadHistoryPeriod-like history with ~4 ticks per second"""
+    rng = np.random.default_rng(seed)
+    timestamps = 1700000000 + np.cumsum(rng.uniform(0.05, 0.45, size))
+    prices = 1.1 + np.cumsum(rng.normal(0, 1e-5, size))
+    return {'history': np.column_stack((np.round(timestamps, 3), np.round(prices, 6))).tolist()}
+
+
+def measure(func, data, period, repeat):
+    """Best wall time of repeat runs in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data, period)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=(10_000, 100_000, 1_000_000), period=60, repeat=3):
+    """Run the benchmark and return a list of result rows"""
+    results = []
+    for size in sizes:
+        data = make_history(size)
+        legacy = legacy_process_data_history(data, period)
+        current = numpy_process_data_history(data, period)
+        assert len(legacy) == len(current), "Implementations disagree on candle count"
+        assert all(a['time'] == b['time'] and a['close'] == b['close'] for a, b in zip(legacy, current))
+
+        for name, func in (('pandas_groupby', legacy_process_data_history),
+                           ('numpy_records', numpy_process_data_history),
+                           ('numpy_array', numpy_resample_array)):
+            results.append({
+                'name': f'process_data_history[{name}]',
+                'size': size,
+                'seconds': measure(func, data, period, repeat),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--period', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for row in run(args.sizes, args.period, args.repeat):
+        print(f"{row['name']:<40} {row['size']:>10} ticks {row['seconds'] * 1000:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
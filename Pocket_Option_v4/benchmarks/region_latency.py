@@ -0,0 +1,179 @@
+"""Verification of latency-aware region selection and standby failover.
+
+Starts local stand-in servers (pocketoptionapi.local_server) behind TCP proxies that add a fixed
+one-way delay, checks that RegionProbe ranks them by the injected latency and
+measures how long WebsocketClient needs to fail over to the HotStandby
+connection when the main connection drops.
+
+Usage:
+    python -m benchmarks.region_latency
+    python -m benchmarks.region_latency --delays 0.08 0.01 0.04 --pings 5
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from pocketoptionapi.constants import REGION
+from pocketoptionapi.local_server import LocalServer
+from pocketoptionapi.region_probe import RegionProbe, HotStandby
+from pocketoptionapi.session_state import SessionState
+
+SSID = '42["auth",{"session":"local","isDemo":0,"uid":1,"platform":2}]'
+
+
+class DelayProxy:
+    """TCP proxy adding `delay` seconds to every chunk in both directions"""
+
+    def __init__(self, target_port, delay):
+        self.target_port = target_port
+        self.delay = delay
+        self.server = None
+        self.port = None
+        self.connections = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def _pipe(self, reader, writer):
+        # Очередь сохраняет порядок, задержка отсчитывается от момента чтения
+        chunks = asyncio.Queue()
+
+        async def delayed_writer():
+            while True:
+                due, data = await chunks.get()
+                if data is None:
+                    break
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+
+        writing = asyncio.ensure_future(delayed_writer())
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                chunks.put_nowait((time.perf_counter() + self.delay, data))
+        except ConnectionError:
+            pass
+        finally:
+            chunks.put_nowait((0, None))
+            await asyncio.gather(writing, return_exceptions=True)
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection('127.0.0.1', self.target_port)
+        self.connections.append((client_writer, server_writer))
+        try:
+            await asyncio.gather(self._pipe(client_reader, server_writer), self._pipe(server_reader, client_writer),
+                                 return_exceptions=True)
+        except asyncio.CancelledError:
+            # Остановка цикла при завершении проверки
+            pass
+
+    def drop_connections(self):
+        """Reset every proxied connection, like a network blip"""
+        for client_writer, server_writer in self.connections:
+            client_writer.transport.abort()
+            server_writer.transport.abort()
+        self.connections.clear()
+
+    def close(self):
+        self.drop_connections()
+        self.server.close()
+
+
+async def start_regions(delays):
+    """Start one stand-in server per delay, return (name -> url, name -> proxy, servers)"""
+    regions, proxies, servers = {}, {}, []
+    for index, delay in enumerate(delays):
+        server = await LocalServer(tick_rate=0).start()
+        servers.append(server)
+        proxy = await DelayProxy(server.port, delay).start()
+        name = f"LOCAL{index}_{int(delay * 1000)}MS"
+        regions[name] = f"ws://127.0.0.1:{proxy.port}/socket.io/?EIO=4&transport=websocket"
+        proxies[name] = proxy
+    return regions, proxies, servers
+
+
+async def run_probe(delays, pings=3):
+    """Probe the stand-in regions and check the ranking follows the delays"""
+    regions, proxies, servers = await start_regions(delays)
+    try:
+        region = REGION()
+        region.REGIONS = regions
+        probe = RegionProbe(regions, region=region, pings=pings)
+        results = await probe.probe()
+
+        expected = [name for name, _ in sorted(zip(regions, delays), key=lambda item: item[1])]
+        ranked = [result.name for result in results]
+        assert ranked == expected, f"Ranking {ranked} does not follow delays {expected}"
+        assert region.get_regions(True)[:len(regions)] == probe.ranked_urls()
+        return results
+    finally:
+        for proxy in proxies.values():
+            proxy.close()
+        for server in servers:
+            await server.stop()
+
+
+async def run_failover(delays, timeout=10.0):
+    """Measure failover time from a dropped connection to the standby one"""
+    from pocketoptionapi.ws.client import WebsocketClient
+
+    regions, proxies, servers = await start_regions(delays)
+    connect_task = None
+    try:
+        state = SessionState(SSID, demo=False)
+        client = WebsocketClient(SimpleNamespace(state=state))
+        client.region.REGIONS = regions
+        probe = RegionProbe(regions, region=client.region)
+        await probe.probe()
+        client.standby = HotStandby(client, probe, retry_delay=0.1)
+
+        connect_task = asyncio.ensure_future(client.connect())
+        deadline = time.perf_counter() + timeout
+        while not (client.websocket is not None and client.standby.ready):
+            if time.perf_counter() > deadline:
+                raise TimeoutError("Client and standby did not connect")
+            await asyncio.sleep(0.01)
+
+        main_url = client.url
+        main_name = next(name for name, url in regions.items() if url == main_url)
+        started = time.perf_counter()
+        proxies[main_name].drop_connections()
+        while client.url in (main_url, None) or not state.websocket_is_connected:
+            if time.perf_counter() > deadline:
+                raise TimeoutError("Client did not fail over")
+            await asyncio.sleep(0.001)
+        failover = time.perf_counter() - started
+        return {'main': main_url, 'standby': client.url, 'seconds': failover}
+    finally:
+        if connect_task is not None:
+            client.standby.stop()
+            connect_task.cancel()
+            await asyncio.gather(connect_task, return_exceptions=True)
+        for proxy in proxies.values():
+            proxy.close()
+        for server in servers:
+            await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--delays', type=float, nargs='+', default=[0.08, 0.01, 0.04, 0.12])
+    parser.add_argument('--pings', type=int, default=3)
+    args = parser.parse_args()
+
+    for result in asyncio.run(run_probe(args.delays, args.pings)):
+        print(f"{result.name:<20} handshake {result.handshake * 1000:>8.1f} ms   rtt {result.rtt * 1000:>8.1f} ms")
+
+    failover = asyncio.run(run_failover(args.delays))
+    print(f"failover {failover['main']} -> {failover['standby']}: {failover['seconds'] * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Benchmark suite runner with JSON results and regression comparison.
+
+`run` executes the benchmark modules and writes one JSON file with the
+environment and a row per measurement. `compare` matches two result files
+by name and size and exits with status 1 when a measurement got worse by
+more than the threshold, so it can gate a release.
+
+The client, data and import suites import pocketoptionapi.api, which needs
+three modules that are not part of this source tree:
+
+    pocketoptionapi.ws.objects.base   Base(api) with
+                                      send_websocket_request(name, msg, request_id)
+                                      forwarding to api.send_websocket_request
+    pocketoptionapi.ws.channels.base  the same Base class for the channels
+    pocketoptionapi.ws.objects.asset  AssetManager() with process_assets(rows)
+
+Numbers quoted in the history of the benchmarks were measured with minimal
+stand-ins with exactly these interfaces. Without the modules `run` stops
+before measuring and lists the missing ones; the decode and records suites
+do not need them.
+
+Usage:
+    python -m benchmarks.suite run --output baseline.json
+    python -m benchmarks.suite run --quick --only client --output current.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.10
+"""
+import argparse
+import importlib
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+import time
+
+# Имя набора -> модуль с функцией run(quick)
+SUITES = {
+    'client': 'benchmarks.bench_client',
+    'data': 'benchmarks.bench_data',
+    'decode': 'benchmarks.bench_decode',
+    'records': 'benchmarks.bench_records',
+    'import': 'benchmarks.bench_import',
+}
+
+# Наборы, которым нужен полный пакет, и модули, которых нет в этом дереве
+API_SUITES = ('client', 'data', 'import')
+REQUIRED_MODULES = (
+    'pocketoptionapi.ws.objects.base',
+    'pocketoptionapi.ws.channels.base',
+    'pocketoptionapi.ws.objects.asset',
+)
+
+
+def missing_modules():
+    """Required modules that can not be found, see the module docstring"""
+    return [name for name in REQUIRED_MODULES
+            if name not in sys.modules and importlib.util.find_spec(name) is None]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def run_suites(names, quick=False):
+    """Run benchmark suites and return the results document"""
+    results = []
+    for name in names:
+        module = importlib.import_module(SUITES[name])
+        started = time.perf_counter()
+        for row in module.run(quick):
+            results.append(dict(row, suite=name))
+        print(f"{name}: {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return {'environment': environment(), 'quick': quick, 'results': results}
+
+
+def row_key(row):
+    return row['name'], row.get('size')
+
+
+def compare(baseline, current, threshold=0.10):
+    """Compare two results documents
+
+    Returns:
+        list: (key, baseline value, current value, change, status) rows, change > 0 means worse
+    """
+    base_rows = {row_key(row): row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        key = row_key(row)
+        base = base_rows.get(key)
+        if base is None or not base['value']:
+            rows.append((key, None, row['value'], None, 'new'))
+            continue
+        ratio = row['value'] / base['value']
+        change = ratio - 1 if row.get('better', 'lower') == 'lower' else 1 / ratio - 1 if ratio else float('inf')
+        if change > threshold:
+            status = 'REGRESSION'
+        elif change < -threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append((key, base['value'], row['value'], change, status))
+    return rows
+
+
+def print_comparison(rows):
+    for (name, size), base, value, change, status in rows:
+        label = f"{name}[{size}]" if size is not None else name
+        base_text = f"{base:.6g}" if base is not None else '-'
+        change_text = f"{change * 100:+.1f}%" if change is not None else ''
+        print(f"{label:<56} {base_text:>12} {value:>12.6g} {change_text:>9}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run benchmarks and save JSON results')
+    run_parser.add_argument('--only', nargs='+', choices=sorted(SUITES), default=sorted(SUITES))
+    run_parser.add_argument('--quick', action='store_true', help='Smaller sizes for a fast check')
+    run_parser.add_argument('--output', help='JSON file to write, stdout if omitted')
+
+    compare_parser = commands.add_parser('compare', help='Compare two JSON result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='Allowed relative slowdown')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        missing = missing_modules() if set(args.only) & set(API_SUITES) else []
+        if missing:
+            print(f"Suites {', '.join(name for name in args.only if name in API_SUITES)} need modules "
+                  f"missing from this tree: {', '.join(missing)}. See `python -m benchmarks.suite --help`, "
+                  f"or run with --only decode records", file=sys.stderr)
+            return 2
+        document = run_suites(args.only, args.quick)
+        text = json.dumps(document, indent=2)
+        if args.output:
+            with open(args.output, 'w') as file:
+                file.write(text)
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    rows = compare(baseline, current, args.threshold)
+    print_comparison(rows)
+    regressions = [row for row in rows if row[4] == 'REGRESSION']
+    if regressions:
+        print(f"{len(regressions)} regressions over {args.threshold * 100:.0f}%", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
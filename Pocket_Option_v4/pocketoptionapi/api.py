@@ -5,7 +5,6 @@ import time
 import json
 import logging
 import threading
-import requests
 import ssl
 import atexit
 import pocketoptionapi.global_value as global_value
@@ -18,9 +17,17 @@ from pocketoptionapi.ws.channels.buyv3 import *
 from pocketoptionapi.ws.objects.timesync import TimeSync
 from pocketoptionapi.ws.objects.candles import Candles
 from pocketoptionapi.ws.channels.change_symbol import ChangeSymbol
+from pocketoptionapi.ws.channels.subscribe_symbol import SubscribeSymbol, UnsubscribeSymbol
 from pocketoptionapi.ws.objects.time_sync import TimeSynchronizer
 from pocketoptionapi.ws.channels.get_assets import GetAssets
 from pocketoptionapi.ws.channels.buy_advanced import BuyAdvanced
+from pocketoptionapi.ws.objects.pending_requests import PendingRequests
+from pocketoptionapi.ws.objects.order_registry import OrderRegistry
+from pocketoptionapi.ws.objects.tick_stream import TickStreams
+from pocketoptionapi.history import HistoryDownloader
+from pocketoptionapi.scheduler import TIMEFRAMES, CandleScheduler
+
+logger = logging.getLogger(__name__)
 
 def nested_dict(n, type):
     if n == 1:
@@ -85,6 +92,17 @@ class PocketOptionAPI(object):
     historyNew = None
     server_timestamp = None
     sync_datetime = None
+    _session = None
+
+    @property
+    def session(self):
+        """HTTP session, created on first use so that requests is not imported with the package"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.verify = False
+            self._session.trust_env = False
+        return self._session
 
     def parse_demo_status(self, ssid):
         """
@@ -104,8 +122,8 @@ class PocketOptionAPI(object):
             # Get isDemo flag (1 = demo, 0 = real)
             is_demo = bool(data.get('isDemo', 0))
 
-            # Set global demo flag
-            global_value.DEMO = is_demo
+            # Set demo flag of the session
+            self.state.DEMO = is_demo
 
             return is_demo
 
@@ -121,99 +139,142 @@ class PocketOptionAPI(object):
         else:
             return "wss://api-l.po.market/socket.io/?EIO=4&transport=websocket"
 
-    def __init__(self, ssid=None, proxies=None):
+    def __init__(self, ssid=None, proxies=None, state=None):
         """
         Initialize Pocket Option API
 
         Args:
             ssid (str): SSID string for authentication
             proxies (dict): (optional) The http request proxies
+            state (SessionState): (optional) Isolated session state, global_value module by default
         """
+        self.state = state if state is not None else global_value
         self.websocket_client = None
         self.websocket_thread = None
-        self.session = requests.Session()
-        self.session.verify = False
-        self.session.trust_env = False
         self.proxies = proxies
         self.buy_successful = None
         self.loop = asyncio.get_event_loop()
+        self.pending = PendingRequests()
+        self.orders = OrderRegistry()
+        # Данные экземпляра, чтобы соединения разных аккаунтов их не делили
+        self.time_sync = TimeSync()
+        self.sync = TimeSynchronizer()
+        self.candles = Candles()
+        self.live_deal_data = nested_dict(3, deque)
+        self.real_time_candles = nested_dict(3, dict)
+        self.real_time_candles_maxdict_table = nested_dict(2, dict)
 
         # Parse SSID if provided
         if ssid:
             is_demo = self.parse_demo_status(ssid)
             self.wss_url = self.get_ws_url(is_demo)
-            global_value.SSID = ssid
+            self.state.SSID = ssid
             logger = logging.getLogger(__name__)
             logger.info(f"Initializing {'Demo' if is_demo else 'Real'} account connection")
         else:
             self.wss_url = "wss://api-l.po.market/socket.io/?EIO=4&transport=websocket"
 
         self.websocket_client = WebsocketClient(self)
+        self.streams = TickStreams(self)
+        self.websocket_client.on("updateStream", self.streams.on_stream)
+        self.history_downloader = HistoryDownloader(self)
+        self.scheduler = CandleScheduler(self)
 
     @property
     def websocket(self):
         """Property to get websocket."""
         return self.websocket_client
 
-    def send_websocket_request(self, name, msg, request_id="", no_force_send=True):
-        """Send websocket request to Pocket Option server."""
-        logger = logging.getLogger(__name__)
-        data = f'42{json.dumps(msg)}'
+    def send_websocket_request(self, name, msg, request_id="", no_force_send=True, wait=False):
+        """Send websocket request to Pocket Option server.
 
-        while (global_value.ssl_Mutual_exclusion or global_value.ssl_Mutual_exclusion_write) and no_force_send:
-            pass
-        global_value.ssl_Mutual_exclusion_write = True
+        The frame is handed to the sender queue of the websocket client loop,
+        so the call costs a single loop hop.
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(self.websocket.send_message(data))
+        Args:
+            name (str): Channel name
+            msg: Message to serialize
+            request_id (str): Request identifier
+            no_force_send (bool): Kept for backward compatibility, frames are always sent in order
+            wait (bool): Block until the frame is written to the socket
 
+        Returns:
+            concurrent.futures.Future: Resolved once the frame is written
+        """
+        logger = logging.getLogger(__name__)
+        data = f'42{json.dumps(msg)}'
+
+        future = self.websocket.submit(data, wait=wait)
         logger.debug(data)
-        global_value.ssl_Mutual_exclusion_write = False
+        return future
 
     def start_websocket(self):
-        """Start websocket connection"""
-        global_value.websocket_is_connected = False
-        global_value.check_websocket_if_error = False
-        global_value.websocket_error_reason = None
+        """Run the websocket client loop until the client stops reconnecting
+
+        Returns:
+            tuple: (False, reason) once the connection is finally closed
+        """
+        self.state.websocket_is_connected = False
+        self.state.check_websocket_if_error = False
+        self.state.websocket_error_reason = None
 
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(self.websocket.connect())
-        loop.run_forever()
+        try:
+            loop.run_until_complete(self.websocket.connect())
+        finally:
+            loop.close()
 
-        while True:
-            try:
-                if global_value.check_websocket_if_error:
-                    return False, global_value.websocket_error_reason
-                if global_value.websocket_is_connected is False:
-                    return False, "Websocket connection closed."
-                elif global_value.websocket_is_connected is True:
-                    return True, None
-            except:
-                pass
-
-    def connect(self):
-        """Method for connection to Pocket Option API."""
-        global_value.ssl_Mutual_exclusion = False
-        global_value.ssl_Mutual_exclusion_write = False
-
-        check_websocket, websocket_reason = self.start_websocket()
-
-        if not check_websocket:
-            return check_websocket, websocket_reason
-
-        self.time_sync.server_timestamps = None
-        while True:
-            try:
-                if self.time_sync.server_timestamps is not None:
-                    break
-            except:
-                pass
-        return True, None
+        if self.state.check_websocket_if_error:
+            return False, self.state.websocket_error_reason
+        return False, "Websocket connection closed."
+
+    def start_websocket_thread(self):
+        """Start start_websocket() in a daemon thread if it is not running"""
+        if self.websocket_thread is None or not self.websocket_thread.is_alive():
+            self.state.ssl_Mutual_exclusion = False
+            self.state.ssl_Mutual_exclusion_write = False
+            self.websocket_thread = threading.Thread(target=self.start_websocket, daemon=True)
+            self.websocket_thread.start()
+        return self.websocket_thread
+
+    def connect(self, timeout=None):
+        """Method for connection to Pocket Option API.
+
+        Starts the websocket thread and blocks until the session is ready.
+
+        Args:
+            timeout (float, optional): Seconds to wait for readiness
+
+        Returns:
+            tuple: (True, None) when ready, (False, reason) otherwise
+        """
+        self.start_websocket_thread()
+        if self.wait_ready(timeout):
+            return True, None
+        if self.state.check_websocket_if_error:
+            return False, self.state.websocket_error_reason
+        return False, f"Timeout waiting for connection, state: {self.websocket.ready.state()}"
+
+    def wait_ready(self, timeout=None, events=None):
+        """Block until the connection is ready
+
+        Args:
+            timeout (float, optional): Seconds to wait
+            events (iterable, optional): Readiness events, connected, authenticated and first_timestamp by default
+
+        Returns:
+            bool: True if ready, False on timeout
+        """
+        return self.websocket.ready.wait(events, timeout)
+
+    async def wait_ready_async(self, timeout=None, events=None):
+        """Await until the connection is ready, see wait_ready()"""
+        return await self.websocket.ready.wait_async(events, timeout)
 
     async def close(self, error=None):
         """Close websocket connection"""
+        self.websocket.reconnect = False
         await self.websocket.on_close(error)
         self.websocket_thread.join()
 
@@ -246,15 +307,29 @@ class PocketOptionAPI(object):
         """Property for change_symbol"""
         return ChangeSymbol(self)
 
+    @property
+    def subscribe_symbol(self):
+        """Property for subscribe_symbol"""
+        return SubscribeSymbol(self)
+
+    @property
+    def unsubscribe_symbol(self):
+        """Property for unsubscribe_symbol"""
+        return UnsubscribeSymbol(self)
+
+    def server_time(self):
+        """Current server time in seconds, local time until the first server timestamp"""
+        return self.sync.now()
+
     @property
     def synced_datetime(self):
         """Get synced datetime"""
         try:
-            if self.time_sync is not None:
-                self.sync.synchronize(self.time_sync.server_timestamp)
+            if self.sync.is_synced:
+                # Модель часов обновляется с каждым updateStream
                 self.sync_datetime = self.sync.get_synced_datetime()
             else:
-                logging.error("timesync is not set")
+                logging.error("Server time is not synchronized yet")
                 self.sync_datetime = None
         except Exception as e:
             logging.error(e)
@@ -280,6 +355,45 @@ class PocketOptionAPI(object):
             logging.error(f"Error analyzing assets: {e}")
             return None
 
+    def _request_candles(self, active: str, interval: int, count: int, end_time: int = None):
+        """Validate parameters, register the reply waiter and send loadHistoryPeriod
+
+        Returns:
+            tuple: (pending request key, reply future) or None if the parameters are invalid
+        """
+        if end_time is None:
+            end_time = int(time.time())
+            end_time = (end_time // interval) * interval
+
+        # Проверяем корректность параметров
+        if not isinstance(active, str):
+            logger.error("Asset must be a string")
+            return None
+
+        if interval not in TIMEFRAMES:
+            logger.error("Invalid interval")
+            return None
+
+        if count < 1:
+            logger.error("Count must be positive")
+            return None
+
+        # Регистрируем ожидание ответа до отправки запроса
+        key = ("loadHistoryPeriod", active, interval, end_time)
+        future = self.pending.register(key, replay=lambda: self.getcandles(active, interval, count, end_time))
+
+        # Запрашиваем свечи
+        self.getcandles(active, interval, count, end_time)
+        return key, future
+
+    @staticmethod
+    def _history_from_reply(reply):
+        history_data = reply.get("data")
+        if history_data:
+            # Сортируем по времени и возвращаем
+            return sorted(history_data, key=lambda x: x['time'])
+        return None
+
     def get_candles_data(self, active: str, interval: int, count: int, end_time: int = None):
         """Get raw candles data from websocket
 
@@ -293,44 +407,40 @@ class PocketOptionAPI(object):
             list: Raw candles data
         """
         try:
-            if end_time is None:
-                end_time = int(time.time())
-                end_time = (end_time // interval) * interval
-
-            # Очищаем предыдущие данные
-            self.history_data = None
-
-            # Проверяем корректность параметров
-            if not isinstance(active, str):
-                logger.error("Asset must be a string")
+            request = self._request_candles(active, interval, count, end_time)
+            if request is None:
                 return None
+            key, future = request
 
-            if interval not in [60, 120, 180, 300, 600, 900, 1800, 3600, 7200, 14400, 28800, 86400]:
-                logger.error("Invalid interval")
+            # Ждем ответ с таймаутом
+            try:
+                reply = self.pending.wait(key, timeout=5, future=future)
+            except TimeoutError:
+                logger.error("Timeout waiting for candles")
                 return None
 
-            if count < 1:
-                logger.error("Count must be positive")
-                return None
+            return self._history_from_reply(reply)
 
-            # Запрашиваем свечи
-            self.getcandles(active, interval, count, end_time)
+        except Exception as e:
+            logger.error(f"Error getting candles data: {e}")
+            return None
 
-            # Ждем получения данных с таймаутом
-            timeout = 5
-            start_t = time.time()
-            while self.history_data is None:
-                if time.time() - start_t > timeout:
-                    logger.error("Timeout waiting for candles")
-                    return None
-                time.sleep(0.1)
+    async def get_candles_data_async(self, active: str, interval: int, count: int, end_time: int = None):
+        """Awaitable version of get_candles_data() for the client loop"""
+        try:
+            request = self._request_candles(active, interval, count, end_time)
+            if request is None:
+                return None
+            key, future = request
 
-            if self.history_data:
-                # Сортируем по времени и возвращаем
-                return sorted(self.history_data, key=lambda x: x['time'])
+            try:
+                reply = await self.pending.wait_async(key, timeout=5, future=future)
+            except TimeoutError:
+                logger.error("Timeout waiting for candles")
+                return None
 
-            return None
+            return self._history_from_reply(reply)
 
         except Exception as e:
             logger.error(f"Error getting candles data: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,470 @@
+"""Module for the asyncio interface of Pocket Option API."""
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+
+import pocketoptionapi.global_value as global_value
+from pocketoptionapi.api import PocketOptionAPI
+from pocketoptionapi.candle_store import CandleStore
+from pocketoptionapi.history import fill_gaps
+from pocketoptionapi.resample import candles_to_records, records_to_candles
+from pocketoptionapi.ws.objects.order_batch import OrderResult, BatchResult
+from pocketoptionapi.ws.objects.order_registry import OrderUnknownError
+
+logger = logging.getLogger(__name__)
+
+
+def order_args(order):
+    """Normalize an order given as a tuple or a dict
+
+    Args:
+        order: (amount, active, action, expirations) or a dict with these keys
+
+    Returns:
+        tuple: (amount, active, action, expirations)
+    """
+    if isinstance(order, dict):
+        return order["amount"], order["active"], order["action"], order["expirations"]
+    amount, active, action, expirations = order
+    return amount, active, action, expirations
+
+
+def parse_demo_status(ssid):
+    """
+    Determine account type from SSID string
+
+    Args:
+        ssid (str): SSID string like '42["auth",{"session":"...","isDemo":1...}]'
+
+    Returns:
+        bool: True for demo account, False for real account
+    """
+    try:
+        json_part = ssid.split('["auth",', 1)[1].strip(']')
+        data = json.loads(json_part)
+        return bool(data.get('isDemo', 0))
+    except Exception as e:
+        logger.error(f"Error parsing SSID demo status: {e}")
+        return False
+
+
+class AsyncPocketOption:
+    """Pocket Option client for asyncio applications
+
+    All methods are coroutines running on the loop of the WebsocketClient, so
+    many strategies can trade concurrently from one loop without threads.
+
+    Usage:
+        async with AsyncPocketOption(ssid) as client:
+            ok, order_id = await client.buy(1, "EURUSD_otc", "call", 60)
+            profit, status = await client.check_win(order_id)
+
+            async for asset, timestamp, price in client.stream("EURUSD_otc"):
+                ...
+    """
+
+    def __init__(self, ssid, cache_dir=None, state=None):
+        """
+        Args:
+            ssid (str): SSID string for authentication
+            cache_dir (str, optional): Directory of the local candle cache used by get_candles
+            state (SessionState, optional): Isolated session state, global_value module by default
+        """
+        self.state = state if state is not None else global_value
+
+        # Добавляем автоопределение demo/real режима
+        is_demo = parse_demo_status(ssid)
+        self.state.SSID = ssid
+        self.state.DEMO = is_demo
+
+        self.candle_store = CandleStore(cache_dir) if cache_dir else None
+        self.api = PocketOptionAPI(ssid, state=self.state)
+        self._connect_task = None
+
+        logger.info(f"Initializing {'Demo' if is_demo else 'Real'} account connection")
+
+    async def __aenter__(self):
+        if not await self.connect():
+            raise ConnectionError(f"Could not connect: {self.api.websocket.ready.state()}")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def connect(self, timeout=30):
+        """Connect on the running loop and wait until the session is ready
+
+        Returns:
+            bool: True if ready within timeout
+        """
+        if self._connect_task is None or self._connect_task.done():
+            self.api.websocket.reconnect = True
+            self._connect_task = asyncio.ensure_future(self.api.websocket.connect())
+        return await self.api.wait_ready_async(timeout)
+
+    async def close(self):
+        """Close the connection and stop reconnecting"""
+        self.api.websocket.reconnect = False
+        await self.api.websocket.close()
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+            await asyncio.gather(self._connect_task, return_exceptions=True)
+            self._connect_task = None
+
+    def get_balance(self):
+        if self.state.balance_updated:
+            return self.state.balance
+        return None
+
+    async def buy(self, amount, active, action, expirations, timeout=5):
+        """Open an order and wait for the server confirmation
+
+        Returns:
+            tuple: (True, order id) on success, (False, None) otherwise
+        """
+        self.api.buy_successful = None
+        key, future = self._submit_order(amount, active, action, expirations)
+        return await self.wait_order_reply(key, timeout, future)
+
+    async def buy_on_new_candle(self, amount, active, action, expirations, timeout=5):
+        """Open an order at the next candle open of the asset timeframe
+
+        The order is sent by the api scheduler at the boundary of the server
+        clock, orders waiting for the same candle are sent in one wakeup.
+
+        Returns:
+            tuple: (True, order id) on success, (False, None) otherwise
+        """
+        try:
+            key, future = await self.api.scheduler.on_new_candle(
+                active, self._submit_order, amount, active, action, expirations)
+        except ValueError as e:
+            logger.error(e)
+            return False, None
+        return await self.wait_order_reply(key, timeout, future)
+
+    def _submit_order(self, amount, active, action, expirations):
+        """Queue an openOrder frame with a new requestId
+
+        Returns:
+            tuple: (reply key, concurrent.futures.Future of the reply)
+        """
+        req_id = str(self.api.pending.next_request_id())
+
+        # Регистрируем ожидание ответа до отправки ордера
+        key = ("openOrder", req_id)
+        future = self.api.pending.register(key)
+        self.api.orders.requested(req_id, asset=active, amount=amount, direction=action, duration=expirations)
+
+        self.api.buyv3(amount, active, action, expirations, req_id)
+        return key, future
+
+    async def buy_many_iter(self, orders, timeout=5):
+        """Open several orders at once and yield results as they are confirmed
+
+        Every order gets its own requestId and all openOrder frames are queued
+        to the sender before the first reply is awaited, so they leave in one
+        burst. Orders not confirmed within `timeout` seconds of the whole batch
+        are yielded last: with error "timeout" if the order frame was still
+        queued and is dropped, with error "unknown" if it was sent and the
+        order may be open (see api.orders and OrderState.UNKNOWN).
+
+        Args:
+            orders: Iterable of (amount, active, action, expirations) tuples or dicts
+            timeout (float): Deadline for the whole batch in seconds
+
+        Yields:
+            OrderResult: In the order the replies arrive
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        deadline = loop.time() + timeout
+
+        invalid = []
+        waiters = {}
+        for index, order in enumerate(orders):
+            try:
+                args = order_args(order)
+            except (KeyError, TypeError, ValueError) as e:
+                invalid.append(OrderResult(index, error=f"invalid order: {e!r}"))
+                continue
+            key, future = self._submit_order(*args)
+            waiters[asyncio.wrap_future(future)] = (index, key)
+
+        pending = set(waiters)
+        try:
+            for result in invalid:
+                yield result
+
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    index, key = waiters[future]
+                    self.api.pending.discard(key)
+                    yield self._order_result(index, key, future, time.perf_counter() - started)
+
+            # Ответ не пришел до общего дедлайна
+            for future in sorted(pending, key=lambda item: waiters[item][0]):
+                pending.discard(future)
+                index, key = waiters[future]
+                yield OrderResult(index, key[1], error=self._abandon_order(key, future, "timeout"))
+        finally:
+            # Генератор закрыт досрочно
+            for future in pending:
+                self._abandon_order(waiters[future][1], future, "cancelled")
+
+    async def buy_many(self, orders, timeout=5, on_result=None):
+        """Open several orders at once, see buy_many_iter()
+
+        Args:
+            orders: Iterable of (amount, active, action, expirations) tuples or dicts
+            timeout (float): Deadline for the whole batch in seconds
+            on_result (callable, optional): Called with every OrderResult as soon as it is known
+
+        Returns:
+            BatchResult: Results in submission order
+        """
+        started = time.perf_counter()
+        results = []
+        async for result in self.buy_many_iter(orders, timeout):
+            results.append(result)
+            if on_result is not None:
+                try:
+                    on_result(result)
+                except Exception as e:
+                    logger.error(f"Error in buy_many callback: {e}")
+
+        batch = BatchResult(results, time.perf_counter() - started)
+        if not batch.ok:
+            logger.warning(f"{batch}: {batch.errors}")
+        return batch
+
+    def _order_result(self, index, key, future, latency):
+        try:
+            order_data = future.result()
+        except OrderUnknownError as e:
+            logger.warning(f"Order {key[1]}: {e}, the outcome is reconciled after reconnect")
+            return OrderResult(index, key[1], error="unknown", latency=latency)
+        except ConnectionError as e:
+            logger.error(f"Order {key[1]} failed: {e}")
+            return OrderResult(index, key[1], error="disconnected", latency=latency)
+
+        if "error" in order_data:
+            return OrderResult(index, key[1], error=order_data["error"], latency=latency)
+        return OrderResult(index, key[1], order_data.get("id"), latency=latency)
+
+    def _abandon_order(self, key, future, reason):
+        """Stop waiting for an order reply
+
+        Returns:
+            str: "unknown" if the order frame was sent, otherwise reason
+        """
+        self.api.pending.discard(key)
+        if future is not None:
+            future.cancel()
+        if self.api.websocket.abandon_order(key[1]):
+            # Ордер мог открыться: исход придет с ответом или сделкой
+            self.api.orders.unknown(key[1], reason)
+            return "unknown"
+        self.api.orders.failed(key[1], reason)
+        return reason
+
+    async def wait_order_reply(self, key, timeout=5, future=None):
+        """Wait for the openOrder reply registered under key
+
+        Args:
+            key: ("openOrder", request id)
+            timeout (float): Seconds to wait
+            future: Future returned by pending.register(key) before the order was sent
+
+        Returns:
+            tuple: (True, order id) on success, (None, None) if the order was
+                sent but no reply came or the connection dropped, so its outcome
+                is not known yet
+                (see api.orders and OrderState.UNKNOWN), (False, None) otherwise
+        """
+        try:
+            order_data = await self.api.pending.wait_async(key, timeout, future)
+        except TimeoutError:
+            if self._abandon_order(key, future, "timeout") == "unknown":
+                logger.warning(f"Order {key[1]}: no reply, the outcome is not known yet")
+                return None, None
+            logger.error("Unknown error occurred during buy operation")
+            return False, None
+        except OrderUnknownError as e:
+            # Ордер мог быть открыт, исход сверяется со списками сделок после переподключения
+            logger.warning(f"Order {key[1]}: {e}, the outcome is reconciled after reconnect")
+            return None, None
+        except ConnectionError as e:
+            # Соединение оборвалось до ответа сервера, ордер помечен как failed
+            logger.error(f"Order {key[1]} failed: {e}")
+            return False, None
+
+        if "error" in order_data:
+            logger.error(order_data["error"])
+            return False, None
+
+        return True, order_data.get("id", None)
+
+    async def check_win(self, id_number, timeout=120):
+        """Wait until the order closes
+
+        Returns:
+            tuple: (profit, "win" | "lose") or (None, "unknown")
+        """
+        try:
+            record = await self.api.orders.wait_closed_async(id_number, timeout)
+        except TimeoutError:
+            logger.error("Timeout: Could not retrieve order info in time.")
+            return None, "unknown"
+
+        order_info = record.deal
+        if order_info and "profit" in order_info:
+            status = "win" if order_info["profit"] > 0 else "lose"
+            return order_info["profit"], status
+        logger.error("Invalid order info retrieved.")
+        return None, "unknown"
+
+    async def get_candles(self, active, timeframe, count):
+        """Get historical candles
+
+        Returns:
+            List of candles in format [[time, open, high, low, close], ...]
+        """
+        try:
+            if self.candle_store is not None:
+                candles = await self._get_cached_candles(active, timeframe, count)
+            else:
+                candles = await self.api.get_candles_data_async(active, timeframe, count)
+            if not candles:
+                return []
+
+            formatted_candles = [
+                [candle['time'], candle['open'], candle['high'], candle['low'], candle['close']]
+                for candle in candles
+            ]
+
+            if self.check_data(formatted_candles, timeframe):
+                return formatted_candles
+            return []
+
+        except Exception as e:
+            logger.error(f"Error in get_candles: {e}")
+            return []
+
+    async def _get_cached_candles(self, active, timeframe, count):
+        """Get the last count closed candles, fetching only what the local cache lacks
+
+        Only candles received from the server are stored; missing bars are
+        filled on read.
+        """
+        end = (int(time.time()) // timeframe) * timeframe
+        start = end - count * timeframe
+
+        for gap_start, gap_end in self.candle_store.missing_ranges(active, timeframe, start, end):
+            fetched, complete = await self.api.history_downloader.fetch_complete(
+                active, timeframe, gap_start, gap_end)
+            if fetched:
+                self.candle_store.write(active, timeframe, records_to_candles(fetched))
+            if complete:
+                # Остальное сервер не прислал (рынок закрыт) - больше не запрашиваем.
+                # Последняя свеча может появиться на сервере с задержкой, ее не отмечаем
+                self.candle_store.mark_empty(active, timeframe, gap_start, min(gap_end, end - timeframe))
+
+        return fill_gaps(candles_to_records(self.candle_store.read(active, timeframe, start, end)), timeframe)
+
+    async def get_candles_range(self, active, timeframe, start, end, fill_gaps=True):
+        """Get historical candles for a time range of any length
+
+        Returns:
+            List of candles in format [[time, open, high, low, close], ...]
+        """
+        try:
+            candles = await self.api.history_downloader.fetch(active, timeframe, start, end, fill_gaps)
+            return [
+                [candle['time'], candle['open'], candle['high'], candle['low'], candle['close']]
+                for candle in candles
+            ]
+        except Exception as e:
+            logger.error(f"Error in get_candles_range: {e}")
+            return []
+
+    @staticmethod
+    def check_data(candles, timeframe):
+        """Check candles data integrity"""
+        try:
+            if not candles:
+                return False
+
+            for i in range(len(candles) - 1):
+                current = candles[i]
+                next_candle = candles[i + 1]
+
+                time_diff = next_candle[0] - current[0]
+                if time_diff != timeframe:
+                    logger.error(f"Invalid time interval: {time_diff}")
+                    return False
+
+                if current[2] < current[3]:
+                    logger.error(f"High less than Low at {datetime.fromtimestamp(current[0])}")
+                    return False
+
+                if (current[1] > current[2] or
+                        current[1] < current[3] or
+                        current[4] > current[2] or
+                        current[4] < current[3]):
+                    logger.error(f"Invalid OHLC values at {datetime.fromtimestamp(current[0])}")
+                    return False
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Error checking candles: {e}")
+            return False
+
+    def subscribe_ticks(self, active, period=60):
+        """Start streaming ticks of an asset"""
+        return self.api.streams.subscribe(active, period)
+
+    def unsubscribe_ticks(self, active):
+        """Stop streaming ticks of an asset"""
+        return self.api.streams.unsubscribe(active)
+
+    async def stream(self, *actives, period=60, maxsize=1000):
+        """Async generator of (asset, timestamp, price) ticks
+
+        Assets that are not subscribed yet are subscribed first.
+
+        Args:
+            *actives: Assets to receive, all subscribed assets if empty
+            period: Chart period used for new subscriptions
+            maxsize: Queue size before the oldest ticks are dropped
+        """
+        for active in actives:
+            if active not in self.api.streams.subscriptions:
+                self.subscribe_ticks(active, period)
+        async for tick in self.api.streams.stream(*actives, maxsize=maxsize):
+            yield tick
+
+    async def get_assets(self, timeout=10):
+        """
+        Get list of all available assets
+        Returns:
+            list: List of Asset objects
+        """
+        try:
+            if not self.state.asset_manager:
+                self.api.get_assets()
+                await self.api.wait_ready_async(timeout, ["assets_loaded"])
+
+            if self.state.asset_manager:
+                return self.state.asset_manager.get_all_assets()
+            return []
+        except Exception as e:
+            logger.error(f"Error getting assets: {e}")
+            return []
@@ -0,0 +1,162 @@
+"""Module for persistent on-disk candle storage."""
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+import numpy as np
+
+from pocketoptionapi.resample import OHLC_DTYPE
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+
+
+class CandleStore:
+    """Local candle cache partitioned by asset, timeframe and UTC day
+
+    Candles are kept as sorted structured arrays (OHLC_DTYPE) in
+    `<root>/<asset>/<timeframe>/<YYYY-MM-DD>.npy` files and read back
+    memory-mapped, so warm starts do not refetch history that is already on
+    disk. Only the missing ranges reported by missing_ranges() have to be
+    downloaded. Ranges the server has no candles for (market closed) are
+    recorded with mark_empty() in `<root>/<asset>/<timeframe>/empty.npy` and
+    are not reported as missing again.
+
+    Only real candles should be written: bars filled in for display are
+    made on read, see history.fill_gaps().
+
+    Usage:
+        store = CandleStore("~/.pocketoption/candles")
+        store.write("EURUSD_otc", 60, candles)
+        candles = store.read("EURUSD_otc", 60, start, end)
+        gaps = store.missing_ranges("EURUSD_otc", 60, start, end)
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.expanduser(root)
+
+    def _dir(self, asset: str, timeframe: int) -> str:
+        # Символы вроде '#' в '#AAPL' допустимы, но убираем разделители пути
+        safe_asset = re.sub(r'[\\/:]', '_', asset)
+        return os.path.join(self.root, safe_asset, str(int(timeframe)))
+
+    def _path(self, asset: str, timeframe: int, day: int) -> str:
+        name = datetime.fromtimestamp(day * DAY, tz=timezone.utc).strftime('%Y-%m-%d')
+        return os.path.join(self._dir(asset, timeframe), f'{name}.npy')
+
+    def _load_day(self, asset: str, timeframe: int, day: int, mmap: bool = True) -> np.ndarray:
+        path = self._path(asset, timeframe, day)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=OHLC_DTYPE)
+        try:
+            return np.load(path, mmap_mode='r' if mmap else None)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading candle file {path}: {e}")
+            return np.empty(0, dtype=OHLC_DTYPE)
+
+    def write(self, asset: str, timeframe: int, candles: np.ndarray):
+        """Merge candles into the store, newer values win for equal times"""
+        candles = np.asarray(candles, dtype=OHLC_DTYPE)
+        if candles.size == 0:
+            return
+
+        os.makedirs(self._dir(asset, timeframe), exist_ok=True)
+        days = candles['time'] // DAY
+        for day in np.unique(days):
+            day = int(day)
+            merged = np.concatenate((self._load_day(asset, timeframe, day, mmap=False), candles[days == day]))
+            # np.unique по перевернутому массиву оставляет последнее значение для каждого времени
+            reversed_times = merged['time'][::-1]
+            _, index = np.unique(reversed_times, return_index=True)
+            merged = merged[::-1][index]
+
+            path = self._path(asset, timeframe, day)
+            tmp_path = path + '.tmp.npy'
+            np.save(tmp_path, merged)
+            os.replace(tmp_path, path)
+
+    def _load_empty(self, asset: str, timeframe: int) -> np.ndarray:
+        path = os.path.join(self._dir(asset, timeframe), 'empty.npy')
+        if not os.path.exists(path):
+            return np.empty((0, 2), dtype=np.int64)
+        try:
+            return np.load(path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading empty ranges {path}: {e}")
+            return np.empty((0, 2), dtype=np.int64)
+
+    def mark_empty(self, asset: str, timeframe: int, start: int, end: int):
+        """Record that the server has no candles in [start, end) beyond the stored ones"""
+        if start >= end:
+            return
+        ranges = np.concatenate((self._load_empty(asset, timeframe), [[start, end]])).astype(np.int64)
+        ranges = ranges[np.argsort(ranges[:, 0], kind='stable')]
+
+        # Сливаем пересекающиеся и соседние диапазоны
+        merged = [list(ranges[0])]
+        for range_start, range_end in ranges[1:]:
+            if range_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], range_end)
+            else:
+                merged.append([range_start, range_end])
+
+        os.makedirs(self._dir(asset, timeframe), exist_ok=True)
+        path = os.path.join(self._dir(asset, timeframe), 'empty.npy')
+        tmp_path = path + '.tmp.npy'
+        np.save(tmp_path, np.array(merged, dtype=np.int64))
+        os.replace(tmp_path, path)
+
+    def read(self, asset: str, timeframe: int, start: int, end: int) -> np.ndarray:
+        """Read candles with start <= time < end, sorted by time"""
+        parts = []
+        for day in range(start // DAY, (end - 1) // DAY + 1):
+            data = self._load_day(asset, timeframe, day)
+            if data.size == 0:
+                continue
+            times = data['time']
+            left = np.searchsorted(times, start, side='left')
+            right = np.searchsorted(times, end, side='left')
+            if right > left:
+                parts.append(data[left:right])
+        if not parts:
+            return np.empty(0, dtype=OHLC_DTYPE)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def missing_ranges(self, asset: str, timeframe: int, start: int, end: int) -> List[Tuple[int, int]]:
+        """Get [gap_start, gap_end) ranges inside [start, end) without candles or an empty mark"""
+        start = (start // timeframe) * timeframe
+        times = self.read(asset, timeframe, start, end)['time']
+        if times.size == 0:
+            gaps = [(start, end)] if start < end else []
+        else:
+            bounds = np.concatenate(([start - timeframe], times, [-(-end // timeframe) * timeframe]))
+            steps = np.diff(bounds)
+            gaps = [(int(bounds[i] + timeframe), int(bounds[i + 1])) for i in np.flatnonzero(steps > timeframe)]
+
+        # Вычитаем диапазоны, для которых у сервера нет свечей
+        for empty_start, empty_end in self._load_empty(asset, timeframe):
+            remaining = []
+            for gap_start, gap_end in gaps:
+                if empty_end <= gap_start or empty_start >= gap_end:
+                    remaining.append((gap_start, gap_end))
+                    continue
+                if gap_start < empty_start:
+                    remaining.append((gap_start, int(empty_start)))
+                if empty_end < gap_end:
+                    remaining.append((int(empty_end), gap_end))
+            gaps = remaining
+        return gaps
+
+    def clear(self, asset: str, timeframe: int):
+        """Delete stored candles of an asset/timeframe"""
+        directory = self._dir(asset, timeframe)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.endswith('.npy'):
+                os.remove(os.path.join(directory, name))
@@ -159,6 +159,9 @@ class REGION:
          "SERVER4": "wss://api-us-south.po.market/socket.io/?EIO=4&transport=websocket"
     }
 
+    # Url регионов по возрастанию задержки, заполняется RegionProbe
+    ranking = None
+
     def __getattr__(self, key):
         try:
             return self.REGIONS[key]
@@ -166,6 +169,14 @@ class REGION:
             raise AttributeError(f"'{self.REGIONS}' object has no attribute '{key}'")
 
     def get_regions(self, randomize: bool = True):
+        if self.ranking:
+            # Сначала измеренные регионы от быстрого к медленному, затем остальные
+            urls = list(self.REGIONS.values())
+            ranked = [url for url in self.ranking if url in urls]
+            rest = [url for url in urls if url not in ranked]
+            if randomize:
+                random.shuffle(rest)
+            return ranked + rest
         if randomize:
             return sorted(list(self.REGIONS.values()), key=lambda k: random.random())
         return list(self.REGIONS.values())
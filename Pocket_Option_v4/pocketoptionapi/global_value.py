@@ -1,4 +1,6 @@
 # python
+from collections import deque
+
 websocket_is_connected = False
 # try fix ssl.SSLEOFError: EOF occurred in violation of protocol (_ssl.c:2361)
 ssl_Mutual_exclusion = False  # mutex read write
@@ -17,9 +19,10 @@ balance_type = None
 balance_updated = None
 result = None
 order_data = {}
-order_open = []
-order_closed = []
-stat = []
+# Последние ордера; полная история - в PocketOptionAPI.orders
+order_open = deque(maxlen=1000)
+order_closed = deque(maxlen=1000)
+stat = deque(maxlen=1000)
 DEMO = None
 
 # Новые переменные для хранения значений
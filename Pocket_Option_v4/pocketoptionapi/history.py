@@ -0,0 +1,209 @@
+"""Module for bulk download of historical candles from Pocket Option."""
+import asyncio
+import logging
+import queue
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def merge_candles(chunks: Iterable[List[dict]], start: int = None, end: int = None) -> List[dict]:
+    """Stitch candle chunks into one list sorted by time without duplicates
+
+    Args:
+        chunks: Lists of candle dicts with a 'time' key
+        start (int, optional): Drop candles before this timestamp
+        end (int, optional): Drop candles at or after this timestamp
+
+    Returns:
+        list: Candles sorted by time, the last received copy of a candle wins
+    """
+    by_time = {}
+    for chunk in chunks:
+        for candle in chunk:
+            candle_time = candle['time']
+            if start is not None and candle_time < start:
+                continue
+            if end is not None and candle_time >= end:
+                continue
+            by_time[candle_time] = candle
+    return [by_time[t] for t in sorted(by_time)]
+
+
+def fill_gaps(candles: List[dict], interval: int) -> List[dict]:
+    """Insert flat candles for missing bars
+
+    A missing bar gets open = high = low = close = previous close.
+    """
+    if not candles:
+        return []
+
+    filled = [candles[0]]
+    for candle in candles[1:]:
+        previous = filled[-1]
+        missing_time = previous['time'] + interval
+        while missing_time < candle['time']:
+            close = previous['close']
+            filled.append({'time': missing_time, 'open': close, 'high': close, 'low': close, 'close': close})
+            missing_time += interval
+        filled.append(candle)
+    return filled
+
+
+class HistoryDownloader:
+    """Paginated, concurrent downloader of historical candles
+
+    A [start, end) range is split into windows of `window_candles` bars, each
+    fetched with its own loadHistoryPeriod request. At most `max_in_flight`
+    requests are outstanding at once over all assets; chunks are streamed
+    back as soon as they arrive and finally stitched, de-duplicated and
+    gap-filled.
+
+    Usage:
+        downloader = api.history_downloader
+
+        # Blocking, whole range at once
+        candles = downloader.download("EURUSD_otc", 60, start, end)
+
+        # Async, chunks as they arrive
+        async for chunk in downloader.stream("EURUSD_otc", 60, start, end):
+            ...
+
+        # Many assets sharing the in-flight limit
+        data = await downloader.fetch_many(["EURUSD_otc", "AUDNZD_otc"], 60, start, end)
+    """
+
+    def __init__(self, api, window_candles: int = 1000, max_in_flight: int = 8,
+                 timeout: float = 10, retries: int = 2):
+        """
+        Args:
+            api: PocketOptionAPI instance
+            window_candles (int): Candles requested per loadHistoryPeriod
+            max_in_flight (int): Maximum concurrent requests
+            timeout (float): Seconds to wait for one reply
+            retries (int): Extra attempts for a window that timed out
+        """
+        self.api = api
+        self.window_candles = window_candles
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.retries = retries
+        self._semaphore = None
+
+    def windows(self, interval: int, start: int, end: int) -> List[tuple]:
+        """Split [start, end) into (window_end, count) request windows"""
+        start = (start // interval) * interval
+        end = -(-end // interval) * interval
+        step = self.window_candles * interval
+        result = []
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + step, end)
+            result.append((window_end, (window_end - window_start) // interval))
+            window_start = window_end
+        return result
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    async def fetch_window(self, asset: str, interval: int, window_end: int, count: int) -> Optional[List[dict]]:
+        """Fetch one window of candles, retrying on timeout
+
+        Returns:
+            list: Candles of the window, None if every attempt timed out
+        """
+        key = ("loadHistoryPeriod", asset, interval, window_end)
+        async with self._get_semaphore():
+            for attempt in range(self.retries + 1):
+                future = self.api.pending.register(
+                    key, replay=lambda: self.api.getcandles(asset, interval, count, window_end))
+                self.api.getcandles(asset, interval, count, window_end)
+                try:
+                    reply = await self.api.pending.wait_async(key, self.timeout, future)
+                    return reply.get("data") or []
+                except TimeoutError:
+                    logger.warning(f"Timeout loading {asset} {interval}s up to {window_end}, attempt {attempt + 1}")
+        logger.error(f"Failed to load {asset} {interval}s window ending at {window_end}")
+        return None
+
+    async def stream(self, asset: str, interval: int, start: int, end: int):
+        """Async generator of candle chunks in completion order
+
+        Each chunk is sorted by time and limited to [start, end).
+        """
+        tasks = [
+            asyncio.ensure_future(self.fetch_window(asset, interval, window_end, count))
+            for window_end, count in self.windows(interval, start, end)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                chunk = await task
+                if chunk:
+                    yield merge_candles([chunk], start, end)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch(self, asset: str, interval: int, start: int, end: int, gaps: bool = True) -> List[dict]:
+        """Download [start, end) for one asset
+
+        Args:
+            asset (str): Asset symbol (e.g. "EURUSD_otc")
+            interval (int): Timeframe in seconds
+            start (int): First timestamp
+            end (int): End timestamp, exclusive
+            gaps (bool): Fill missing bars with flat candles
+
+        Returns:
+            list: Candle dicts sorted by time
+        """
+        candles, _ = await self.fetch_complete(asset, interval, start, end)
+        return fill_gaps(candles, interval) if gaps else candles
+
+    async def fetch_complete(self, asset: str, interval: int, start: int, end: int) -> Tuple[List[dict], bool]:
+        """Download [start, end) for one asset without gap filling
+
+        Returns:
+            tuple: (candle dicts sorted by time, True if every window was loaded)
+        """
+        chunks = await asyncio.gather(*(self.fetch_window(asset, interval, window_end, count)
+                                        for window_end, count in self.windows(interval, start, end)))
+        complete = all(chunk is not None for chunk in chunks)
+        return merge_candles((chunk for chunk in chunks if chunk), start, end), complete
+
+    async def fetch_many(self, assets: Iterable[str], interval: int, start: int, end: int,
+                         gaps: bool = True) -> Dict[str, List[dict]]:
+        """Download the same range for many assets concurrently"""
+        assets = list(assets)
+        results = await asyncio.gather(*(self.fetch(asset, interval, start, end, gaps) for asset in assets))
+        return dict(zip(assets, results))
+
+    def download(self, asset: str, interval: int, start: int, end: int, gaps: bool = True,
+                 timeout: float = None) -> List[dict]:
+        """Blocking version of fetch() running on the websocket client loop"""
+        return self.api.websocket.run(self.fetch(asset, interval, start, end, gaps), timeout)
+
+    def iter_chunks(self, asset: str, interval: int, start: int, end: int):
+        """Blocking iterator of candle chunks as they arrive"""
+        chunks = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for chunk in self.stream(asset, interval, start, end):
+                    chunks.put(chunk)
+            finally:
+                chunks.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.api.websocket.loop)
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is done:
+                    break
+                yield chunk
+            future.result()
+        finally:
+            future.cancel()
@@ -0,0 +1,408 @@
+"""Module for a local stand-in of the Pocket Option websocket server."""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ASSETS = ["EURUSD_otc", "AUDNZD_otc", "EURJPY_otc", "GBPUSD_otc", "#AAPL_otc"]
+
+
+def default_price(asset: str, timestamp: float) -> float:
+    """Deterministic price curve, the same for every run"""
+    phase = sum(map(ord, asset)) % 360
+    return round(1.1 + 0.002 * math.sin(timestamp / 30 + phase) + 0.0005 * math.sin(timestamp * 1.7 + phase), 5)
+
+
+def _format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class _Session:
+    """State of one client connection"""
+
+    def __init__(self, server, ws, sid):
+        self.server = server
+        self.ws = ws
+        self.sid = sid
+        self.authenticated = False
+        self.subscriptions: Dict[str, int] = {}
+        self.tasks = set()
+        self._send_lock = asyncio.Lock()
+
+    def spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task):
+        self.tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and not isinstance(error, websockets.ConnectionClosed):
+            logger.error(f"Local server task failed: {error!r}")
+
+    async def send(self, data):
+        async with self._send_lock:
+            await self.ws.send(data)
+        self.server.sent["frames"] += 1
+
+    async def emit(self, event: str, payload):
+        """Send an event as 451- header plus binary attachment"""
+        # Заголовок и вложение не должны перемешаться с другими событиями
+        async with self._send_lock:
+            await self.ws.send(f'451-["{event}",{{"_placeholder":true,"num":0}}]')
+            await self.ws.send(json.dumps(payload).encode())
+        self.server.sent[event] += 1
+
+    def close(self):
+        for task in list(self.tasks):
+            task.cancel()
+
+
+class LocalServer:
+    """Local Pocket Option server speaking the Engine.IO/Socket.IO dialect of WebsocketClient
+
+    Handles the handshake (0{"sid"}, 40, 2/3 pings), auth with successauth
+    and successupdateBalance, updateAssets, changeSymbol/subfor with a
+    scriptable updateStream tick rate, loadHistoryPeriod, openOrder with
+    successopenOrder/failopenOrder and closes deals with successcloseOrder
+    and updateClosedDeals. Events go out as 451-[event,{"_placeholder"...}]
+    followed by a binary frame, like the real server.
+
+    Reply delays are scriptable per event with a number of seconds or a
+    callable returning one, prices with a callable (asset, timestamp).
+
+    Clients must use a real account SSID ("isDemo":0), demo sessions always
+    connect to the Pocket Option demo server instead of the region table.
+
+    Usage:
+        server = await LocalServer(tick_rate=50, delays={"openOrder": 0.02}).start()
+        api.websocket.region.REGIONS = server.regions
+        ...
+        await server.stop()
+
+        # Sync code: the server runs its own loop thread
+        server = LocalServer().start_in_thread()
+
+        python -m pocketoptionapi.local_server --port 8765 --tick-rate 10
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, tick_rate: float = 1.0,
+                 delays: Dict[str, object] = None, price: Callable[[str, float], float] = None,
+                 assets: List[str] = None, balance: float = 10000.0, payout: int = 92,
+                 deal_duration: float = None, clock_offset: float = 0.0, ping_interval: float = 25.0,
+                 authorize: Callable[[dict], bool] = None):
+        """
+        Args:
+            host (str): Interface to listen on
+            port (int): Port, a free one if 0
+            tick_rate (float): updateStream ticks per second for every subscribed asset, 0 to disable
+            delays (dict, optional): Event -> reply delay in seconds or callable, events are
+                "auth", "updateAssets", "loadHistoryPeriod", "openOrder" and "closeOrder"
+            price (callable, optional): (asset, timestamp) -> price, default_price by default
+            assets (list, optional): Tradable asset symbols
+            balance (float): Starting account balance
+            payout (int): Payout percent of a winning deal
+            deal_duration (float, optional): Seconds until deals close, the order time by default
+            clock_offset (float): Seconds added to the local clock for server timestamps
+            ping_interval (float): Seconds between Engine.IO pings
+            authorize (callable, optional): auth payload -> bool, every SSID is accepted by default
+        """
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.delays = dict(delays or {})
+        self.price = price or default_price
+        self.assets = list(assets or DEFAULT_ASSETS)
+        self.balance = balance
+        self.payout = payout
+        self.deal_duration = deal_duration
+        self.clock_offset = clock_offset
+        self.ping_interval = ping_interval
+        self.authorize = authorize
+        self.sessions: List[_Session] = []
+        self.received = Counter()
+        self.sent = Counter()
+        self.deals: Dict[str, dict] = {}
+        self._ids = itertools.count(1)
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/socket.io/?EIO=4&transport=websocket"
+
+    @property
+    def regions(self) -> Dict[str, str]:
+        """Region table for WebsocketClient.region.REGIONS"""
+        return {"LOCAL": self.url}
+
+    def now(self) -> float:
+        """Server clock"""
+        return time.time() + self.clock_offset
+
+    def delay(self, event: str) -> float:
+        value = self.delays.get(event, 0.0)
+        return value() if callable(value) else value
+
+    async def start(self):
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Local server listening on {self.url}")
+        return self
+
+    async def stop(self):
+        self.drop_connections()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self, timeout: float = 5.0):
+        """Run the server on its own loop thread and return once it listens"""
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="LocalServer", daemon=True)
+        self._thread.start()
+        if not started.wait(timeout):
+            raise TimeoutError("Local server did not start")
+        return self
+
+    def stop_thread(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop = None
+
+    def push(self, event: str, payload):
+        """Send an event to every authenticated client, from any thread"""
+        async def broadcast():
+            for session in list(self.sessions):
+                if session.authenticated:
+                    await session.emit(event, payload)
+
+        if self._loop is not None and self._thread is not threading.current_thread():
+            return asyncio.run_coroutine_threadsafe(broadcast(), self._loop)
+        return asyncio.ensure_future(broadcast())
+
+    def drop_connections(self):
+        """Abort every client connection, like a network blip"""
+        for session in list(self.sessions):
+            session.close()
+            session.ws.transport.abort()
+
+    async def _handle(self, ws, *args):
+        session = _Session(self, ws, f"local{next(self._ids)}")
+        self.sessions.append(session)
+        try:
+            await session.send("0" + json.dumps({"sid": session.sid, "upgrades": [],
+                                           "pingInterval": int(self.ping_interval * 1000), "pingTimeout": 20000}))
+            session.spawn(self._ping(session))
+            async for message in ws:
+                if isinstance(message, str):
+                    await self._on_text(session, message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            session.close()
+            self.sessions.remove(session)
+
+    async def _ping(self, session):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await session.send("2")
+
+    async def _on_text(self, session, message):
+        if message == "3":
+            self.received["pong"] += 1
+            return
+        if message == "40":
+            self.received["connect"] += 1
+            await session.send(f'40{{"sid":"{session.sid}"}}')
+            return
+        if not message.startswith("42["):
+            return
+
+        event, *args = json.loads(message[2:])
+        payload = args[0] if args else None
+        self.received[event] += 1
+
+        if event == "auth":
+            session.spawn(self._auth(session, payload))
+        elif not session.authenticated:
+            return
+        elif event == "openOrder":
+            session.spawn(self._open_order(session, payload))
+        elif event == "loadHistoryPeriod":
+            session.spawn(self._history(session, payload))
+        elif event == "updateAssets":
+            session.spawn(self._assets(session))
+        elif event == "changeSymbol":
+            self._subscribe(session, payload["asset"], payload.get("period", 60))
+        elif event == "subfor":
+            self._subscribe(session, payload, session.subscriptions.get(payload, 60))
+        elif event == "unsubfor":
+            session.subscriptions.pop(payload, None)
+
+    async def _auth(self, session, payload):
+        await asyncio.sleep(self.delay("auth"))
+        if self.authorize is not None and not self.authorize(payload):
+            await session.send('42["NotAuthorized",{}]')
+            return
+        session.authenticated = True
+        await session.emit("successauth", {"id": session.sid})
+        await session.emit("successupdateBalance", {"balance": self.balance, "isDemo": int(bool(payload.get("isDemo", 1)))})
+        session.spawn(self._assets(session))
+
+        # Как и настоящий сервер, сразу стримим актив открытого графика
+        asset = self.assets[0]
+        self._subscribe(session, asset, 60)
+        now = self.now()
+        await session.emit("updateStream", [[asset, round(now, 3), self.price(asset, now)]])
+        if self.tick_rate > 0:
+            session.spawn(self._ticks(session))
+
+    async def _assets(self, session):
+        await asyncio.sleep(self.delay("updateAssets"))
+        rows = [
+            [index, asset, asset.replace("_otc", " OTC"), "stock" if asset.startswith("#") else "currency",
+             2, self.payout, 60, 30, 3, 0, 170, 0, [], 0, True, [{"time": 60}, {"time": 300}], -1601, 60, 0]
+            for index, asset in enumerate(self.assets, 1)
+        ]
+        await session.emit("updateAssets", rows)
+
+    def _subscribe(self, session, asset, period):
+        session.subscriptions[asset] = period
+
+    async def _ticks(self, session):
+        """Emit updateStream ticks at tick_rate, catching up in batches when late"""
+        interval = 1.0 / self.tick_rate
+        due = time.monotonic()
+        while True:
+            due += interval
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            if not session.subscriptions:
+                continue
+            now = self.now()
+            await session.emit("updateStream", [[asset, round(now, 3), self.price(asset, now)]
+                                                for asset in session.subscriptions])
+
+    async def _history(self, session, payload):
+        await asyncio.sleep(self.delay("loadHistoryPeriod"))
+        period = payload["period"]
+        end = payload["time"] // period * period
+        count = max(1, payload.get("offset", period * 100) // period)
+        data = []
+        for start in range(end - count * period, end, period):
+            prices = [self.price(payload["asset"], start + period * step / 4) for step in range(5)]
+            data.append({"time": start, "open": prices[0], "close": prices[-1],
+                         "high": max(prices), "low": min(prices), "asset": payload["asset"]})
+        await session.emit("loadHistoryPeriod", {"asset": payload["asset"], "period": period,
+                                                 "index": payload.get("index"), "data": data})
+
+    async def _open_order(self, session, payload):
+        await asyncio.sleep(self.delay("openOrder"))
+        request_id = payload.get("requestId")
+        asset = payload.get("asset")
+        amount = payload.get("amount", 0)
+        if asset not in self.assets:
+            await session.emit("failopenOrder", {"error": "Asset is not available", "requestId": request_id})
+            return
+        if not 0 < amount <= self.balance:
+            await session.emit("failopenOrder", {"error": "Not enough money", "requestId": request_id})
+            return
+
+        now = self.now()
+        duration = self.deal_duration if self.deal_duration is not None else payload.get("time", 60)
+        deal = {
+            "id": f"local-{next(self._ids)}",
+            "openTime": _format_time(now),
+            "closeTime": _format_time(now + duration),
+            "openTimestamp": int(now),
+            "closeTimestamp": int(now + duration),
+            "uid": 1,
+            "isDemo": payload.get("isDemo", 1),
+            "amount": amount,
+            "profit": 0,
+            "percentProfit": self.payout,
+            "percentLoss": 100,
+            "openPrice": self.price(asset, now),
+            "closePrice": 0,
+            "command": 0 if payload.get("action") == "call" else 1,
+            "asset": asset,
+            "requestId": request_id,
+            "openMs": int((now % 1) * 1000),
+            "optionType": payload.get("optionType", 100),
+            "isRollover": False,
+            "isCopySignal": False,
+            "currency": "USD",
+        }
+        self.deals[deal["id"]] = deal
+        self.balance -= amount
+        await session.emit("successopenOrder", deal)
+        await session.emit("successupdateBalance", {"balance": self.balance, "isDemo": deal["isDemo"]})
+        session.spawn(self._close_deal(session, deal, duration))
+
+    async def _close_deal(self, session, deal, duration):
+        await asyncio.sleep(duration + self.delay("closeOrder"))
+        close_price = self.price(deal["asset"], self.now())
+        won = close_price > deal["openPrice"] if deal["command"] == 0 else close_price < deal["openPrice"]
+        deal = dict(deal, closePrice=close_price,
+                    profit=round(deal["amount"] * self.payout / 100, 2) if won else -deal["amount"])
+        self.deals[deal["id"]] = deal
+        if won:
+            self.balance += deal["amount"] + deal["profit"]
+        await session.emit("successcloseOrder", {"profit": deal["profit"], "deals": [deal]})
+        await session.emit("updateClosedDeals", [deal])
+        await session.emit("successupdateBalance", {"balance": self.balance, "isDemo": deal["isDemo"]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Pocket Option stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick-rate", type=float, default=1.0)
+    parser.add_argument("--order-delay", type=float, default=0.0)
+    parser.add_argument("--history-delay", type=float, default=0.0)
+    parser.add_argument("--deal-duration", type=float, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = LocalServer(args.host, args.port, tick_rate=args.tick_rate, deal_duration=args.deal_duration,
+                         delays={"openOrder": args.order_delay, "loadHistoryPeriod": args.history_delay})
+
+    async def run():
+        await server.start()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Module for running many Pocket Option accounts in one process."""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from pocketoptionapi.session_state import SessionState
+from pocketoptionapi.stable_api import PocketOption
+
+logger = logging.getLogger(__name__)
+
+
+class _LoopThread:
+    """Event loop running forever in a daemon thread"""
+
+    def __init__(self, name: str):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.sessions = 0
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+class PocketOptionPool:
+    """Pool of account sessions sharing a few event loops
+
+    Every session is a regular PocketOption instance with its own
+    SessionState, so balances, orders and SSIDs never mix. Instead of one
+    thread and one event loop per account, all websocket clients run as tasks
+    on `loops` shared loop threads; a new session goes to the least loaded
+    loop. For more accounts than one process can handle, run one pool per
+    process and split the SSIDs between them.
+
+    Usage:
+        pool = PocketOptionPool(loops=2)
+        demo = pool.add(demo_ssid, name="demo-1")
+        real = pool.add(real_ssid, name="real-1")
+
+        demo.buy(1, "EURUSD_otc", "call", 60)
+        print(pool.balances())
+
+        pool.close()
+    """
+
+    def __init__(self, loops: int = 1, cache_dir: str = None):
+        """
+        Args:
+            loops (int): Number of shared event loop threads
+            cache_dir (str, optional): Candle cache directory for every session
+        """
+        if loops < 1:
+            raise ValueError("Pool needs at least one loop")
+        self.cache_dir = cache_dir
+        self._loops = [_LoopThread(f"PocketOptionPool-{i}") for i in range(loops)]
+        self._sessions: Dict[str, PocketOption] = {}
+        self._tasks = {}
+        self._session_loops = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __iter__(self):
+        return iter(list(self._sessions.values()))
+
+    def __getitem__(self, name: str) -> PocketOption:
+        return self._sessions[name]
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._sessions)
+
+    def add(self, ssid: str, name: str = None) -> PocketOption:
+        """Create a session and start connecting it
+
+        Args:
+            ssid (str): SSID string for authentication
+            name (str, optional): Session name, generated if omitted
+
+        Returns:
+            PocketOption: Client bound to the pool loop
+        """
+        with self._lock:
+            name = name or f"session-{next(self._counter)}"
+            if name in self._sessions:
+                raise ValueError(f"Session {name} already exists")
+
+            session = PocketOption(ssid, cache_dir=self.cache_dir, state=SessionState())
+            loop_thread = min(self._loops, key=lambda item: item.sessions)
+            loop_thread.sessions += 1
+
+            self._sessions[name] = session
+            self._session_loops[name] = loop_thread
+            self._tasks[name] = loop_thread.submit(self._run_session(name, session))
+
+        logger.info(f"Added session {name} ({len(self._sessions)} in pool)")
+        return session
+
+    async def _run_session(self, name: str, session: PocketOption):
+        websocket = session.api.websocket
+        websocket.state.ssl_Mutual_exclusion = False
+        websocket.state.ssl_Mutual_exclusion_write = False
+        try:
+            await websocket.connect()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Session {name} stopped: {e}")
+
+    def remove(self, name: str):
+        """Disconnect a session and drop it from the pool"""
+        with self._lock:
+            session = self._sessions.pop(name, None)
+            task = self._tasks.pop(name, None)
+            loop_thread = self._session_loops.pop(name, None)
+        if session is None:
+            return
+
+        loop_thread.sessions -= 1
+        if task is not None:
+            task.cancel()
+        try:
+            loop_thread.submit(session.api.websocket.close()).result(5)
+        except Exception as e:
+            logger.warning(f"Error closing session {name}: {e}")
+
+    def get(self, name: str) -> Optional[PocketOption]:
+        return self._sessions.get(name)
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Block until every session is ready or the timeout expires"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for session in list(self._sessions.values()):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not session.wait_ready(remaining):
+                return False
+        return True
+
+    def connected(self) -> List[str]:
+        """Get names of sessions with an open websocket"""
+        return [name for name, session in self._sessions.items() if session.state.websocket_is_connected]
+
+    def balances(self) -> Dict[str, float]:
+        """Get the last known balance of every session"""
+        return {name: session.state.balance for name, session in self._sessions.items()}
+
+    def close(self):
+        """Disconnect all sessions and stop the loop threads"""
+        for name in self.names:
+            self.remove(name)
+        for loop_thread in self._loops:
+            loop_thread.stop()
@@ -0,0 +1,310 @@
+"""Module for measuring latency to Pocket Option regions."""
+import asyncio
+import logging
+import math
+import ssl
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import websockets
+
+from pocketoptionapi.constants import REGION
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {"Origin": "https://pocketoption.com", "Cache-Control": "no-cache"}
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/124.0.0.0 Safari/537.36")
+
+
+def make_ssl_context() -> ssl.SSLContext:
+    """SSL context used for the Pocket Option servers"""
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+def connect_options(url: str, ssl_context: ssl.SSLContext = None) -> dict:
+    """Keyword arguments for websockets.connect() to a region url"""
+    options = {
+        "extra_headers": HEADERS,
+        "user_agent_header": USER_AGENT,
+    }
+    if url.startswith("wss://"):
+        options["ssl"] = ssl_context or make_ssl_context()
+    return options
+
+
+class RegionLatency:
+    """Result of probing one region
+
+    `handshake` is the time to open the websocket, `rtt` the median
+    websocket ping round trip, both in seconds.
+    """
+
+    __slots__ = ('name', 'url', 'handshake', 'rtt', 'error')
+
+    def __init__(self, name, url, handshake=None, rtt=None, error=None):
+        self.name = name
+        self.url = url
+        self.handshake = handshake
+        self.rtt = rtt
+        self.error = error
+
+    @property
+    def score(self) -> float:
+        """Ranking key, lower is better, inf for unreachable regions"""
+        if self.error is not None or self.handshake is None:
+            return math.inf
+        return self.handshake + (self.rtt if self.rtt is not None else self.handshake)
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"RegionLatency({self.name}, error={self.error!r})"
+        rtt = f"{self.rtt * 1000:.1f}ms" if self.rtt is not None else "n/a"
+        return f"RegionLatency({self.name}, handshake={self.handshake * 1000:.1f}ms, rtt={rtt})"
+
+
+class RegionProbe:
+    """Latency prober keeping a ranked list of regions
+
+    Every region gets a websocket handshake followed by a few ping/pong round
+    trips, all regions are probed concurrently. The ranking is published to
+    REGION.ranking (or to the given REGION object), which get_regions()
+    returns first, so WebsocketClient.connect tries the fastest region first.
+
+    Usage:
+        probe = RegionProbe(interval=300)
+        await probe.probe()
+        print(probe.results[0])
+
+        # Periodic refresh on a running loop
+        probe.start()
+    """
+
+    def __init__(self, regions: Dict[str, str] = None, region: REGION = None, pings: int = 3,
+                 timeout: float = 5.0, interval: float = 300.0, ssl_context: ssl.SSLContext = None):
+        """
+        Args:
+            regions (dict, optional): Name -> url, REGION.REGIONS by default
+            region (REGION, optional): Object to publish the ranking to, the REGION class by default
+            pings (int): Ping round trips per region
+            timeout (float): Seconds allowed for one region
+            interval (float): Seconds between refreshes in run()
+            ssl_context (ssl.SSLContext, optional): Context for wss:// urls
+        """
+        self.regions = dict(regions if regions is not None else REGION.REGIONS)
+        self.region = region
+        self.pings = pings
+        self.timeout = timeout
+        self.interval = interval
+        self.ssl_context = ssl_context or make_ssl_context()
+        self.results: List[RegionLatency] = []
+        self.updated_at = None
+        self._task = None
+
+    async def measure(self, name: str, url: str) -> RegionLatency:
+        """Measure handshake time and ping RTT of one region"""
+        try:
+            return await asyncio.wait_for(self._measure(name, url), self.timeout)
+        except asyncio.TimeoutError:
+            return RegionLatency(name, url, error="timeout")
+        except Exception as e:
+            return RegionLatency(name, url, error=str(e) or type(e).__name__)
+
+    async def _measure(self, name: str, url: str) -> RegionLatency:
+        started = time.perf_counter()
+        async with websockets.connect(url, **connect_options(url, self.ssl_context)) as ws:
+            handshake = time.perf_counter() - started
+            rtts = []
+            for _ in range(self.pings):
+                sent = time.perf_counter()
+                pong = await ws.ping()
+                await pong
+                rtts.append(time.perf_counter() - sent)
+        rtt = statistics.median(rtts) if rtts else None
+        return RegionLatency(name, url, handshake, rtt)
+
+    async def probe(self) -> List[RegionLatency]:
+        """Probe all regions concurrently and publish the ranking"""
+        results = await asyncio.gather(*(self.measure(name, url) for name, url in self.regions.items()))
+        self.results = sorted(results, key=lambda result: result.score)
+        self.updated_at = time.time()
+
+        target = self.region if self.region is not None else REGION
+        target.ranking = self.ranked_urls()
+        logger.debug(f"Region ranking: {self.results}")
+        return self.results
+
+    def ranked_urls(self) -> List[str]:
+        """Urls of reachable regions, fastest first"""
+        return [result.url for result in self.results if result.error is None]
+
+    def best(self) -> Optional[RegionLatency]:
+        """Fastest reachable region or None"""
+        if self.results and self.results[0].error is None:
+            return self.results[0]
+        return None
+
+    async def run(self):
+        """Refresh the ranking every `interval` seconds"""
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error(f"Region probe failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, loop: asyncio.AbstractEventLoop = None):
+        """Start periodic probing on a loop, the running one by default"""
+        if self._task is not None and not self._task.done():
+            return self._task
+        if loop is None:
+            self._task = asyncio.ensure_future(self.run())
+        else:
+            self._task = asyncio.run_coroutine_threadsafe(self.run(), loop)
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class HotStandby:
+    """Pre-authenticated spare connection for instant failover
+
+    Keeps a second connection to the best ranked region other than the one
+    the client uses, authenticated with the client SSID and answering
+    Engine.IO pings. When the main connection drops, WebsocketClient.connect
+    takes the spare over instead of opening a new connection, then a new
+    spare is prepared.
+
+    Usage:
+        probe = RegionProbe()
+        api.websocket.standby = HotStandby(api.websocket, probe)
+        api.connect()
+    """
+
+    def __init__(self, client, probe: RegionProbe = None, auth_timeout: float = 10.0, retry_delay: float = 5.0):
+        """
+        Args:
+            client: WebsocketClient the spare belongs to
+            probe (RegionProbe, optional): Source of the region ranking
+            auth_timeout (float): Seconds allowed to authenticate the spare
+            retry_delay (float): Seconds between attempts to open a spare
+        """
+        self.client = client
+        self.probe = probe
+        self.auth_timeout = auth_timeout
+        self.retry_delay = retry_delay
+        self.url = None
+        self._ws = None
+        self._reader = None
+        self._task = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    def start(self):
+        """Start keeping a spare on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._ws is not None:
+            asyncio.ensure_future(self._ws.close())
+            self._ws = None
+
+    def take(self):
+        """Hand the spare over to the client
+
+        Returns:
+            tuple: (websocket, url) or None if no spare is ready
+        """
+        if not self.ready:
+            return None
+        ws, url = self._ws, self.url
+        self._ws = None
+        self.url = None
+        if self._reader is not None:
+            self._reader.cancel()
+        logger.info(f"Failing over to standby connection {url}")
+        return ws, url
+
+    def _pick_url(self) -> Optional[str]:
+        if self.client.url is None:
+            # Ждем, пока клиент выберет основной регион
+            return None
+        urls = self.probe.ranked_urls() if self.probe is not None else []
+        if not urls:
+            urls = self.client.region.get_regions(False)
+        for url in urls:
+            url = self.client.resolve_url(url)
+            if url != self.client.url:
+                return url
+        return None
+
+    async def _authenticate(self, ws):
+        """Run the Socket.IO handshake and wait for successauth"""
+        async for message in ws:
+            if not isinstance(message, str):
+                continue
+            if message.startswith('0') and "sid" in message:
+                await ws.send("40")
+            elif message == "2":
+                await ws.send("3")
+            elif message.startswith('40') and "sid" in message:
+                await ws.send(self.client.state.SSID)
+            elif "successauth" in message:
+                return
+            elif "NotAuthorized" in message:
+                raise ConnectionError("Standby connection not authorized")
+        raise ConnectionError("Standby connection closed during authentication")
+
+    async def _keepalive(self, ws):
+        """Answer pings and drop other frames until the spare is taken"""
+        try:
+            async for message in ws:
+                if message == "2":
+                    await ws.send("3")
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _run(self):
+        while True:
+            url = self._pick_url()
+            if url is None:
+                await asyncio.sleep(self.retry_delay)
+                continue
+            try:
+                ws = await websockets.connect(url, **connect_options(url))
+                try:
+                    await asyncio.wait_for(self._authenticate(ws), self.auth_timeout)
+                except BaseException:
+                    await ws.close()
+                    raise
+                self._ws, self.url = ws, url
+                logger.debug(f"Standby connection ready: {url}")
+
+                self._reader = asyncio.ensure_future(self._keepalive(ws))
+                await asyncio.wait([self._reader])
+                self._reader = None
+                if self._ws is ws:
+                    # Резерв закрылся сам - открываем новый
+                    self._ws = None
+                    logger.warning(f"Standby connection {url} closed")
+                    await asyncio.sleep(self.retry_delay)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to open standby connection to {url}: {e}")
+                await asyncio.sleep(self.retry_delay)
@@ -0,0 +1,105 @@
+"""Module for building OHLC candles from tick history."""
+from itertools import chain
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+# Структура свечи: время начала и цены OHLC
+OHLC_DTYPE = np.dtype([
+    ('time', np.int64),
+    ('open', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('close', np.float64),
+])
+
+
+def resample_ticks(timestamps, prices, periods: Union[int, Iterable[int]],
+                   drop_last: bool = False) -> Dict[int, np.ndarray]:
+    """Aggregate ticks into OHLC candles for one or more timeframes
+
+    Every tick goes to bucket timestamp // period. Bucket boundaries are
+    found once per timeframe and open/high/low/close are computed with
+    np.maximum.reduceat / np.minimum.reduceat, without per-row Python.
+
+    Args:
+        timestamps: Tick timestamps in seconds
+        prices: Tick prices
+        periods (int or iterable): Timeframe(s) in seconds
+        drop_last (bool): Drop the newest, possibly incomplete, candle
+
+    Returns:
+        dict: Period -> structured array with OHLC_DTYPE fields, oldest first
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    if isinstance(periods, int):
+        periods = [periods]
+
+    if timestamps.size > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        prices = prices[order]
+
+    result = {}
+    for period in periods:
+        result[period] = _resample_sorted(timestamps, prices, int(period), drop_last)
+    return result
+
+
+def _resample_sorted(timestamps: np.ndarray, prices: np.ndarray, period: int, drop_last: bool) -> np.ndarray:
+    if timestamps.size == 0:
+        return np.empty(0, dtype=OHLC_DTYPE)
+
+    buckets = (timestamps // period).astype(np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.concatenate((starts[1:], [timestamps.size])) - 1
+
+    candles = np.empty(starts.size, dtype=OHLC_DTYPE)
+    candles['time'] = buckets[starts] * period
+    candles['open'] = prices[starts]
+    candles['high'] = np.maximum.reduceat(prices, starts)
+    candles['low'] = np.minimum.reduceat(prices, starts)
+    candles['close'] = prices[ends]
+
+    if drop_last:
+        candles = candles[:-1]
+    return candles
+
+
+def history_to_arrays(history) -> tuple:
+    """Split loadHistoryPeriod history [[timestamp, price], ...] into two arrays"""
+    if isinstance(history, np.ndarray):
+        data = history.astype(np.float64, copy=False)
+    else:
+        # fromiter по плоской последовательности заметно быстрее np.asarray для списка пар
+        data = np.fromiter(chain.from_iterable(history), dtype=np.float64, count=2 * len(history))
+    if data.size == 0:
+        return np.empty(0), np.empty(0)
+    data = data.reshape(-1, 2)
+    return data[:, 0], data[:, 1]
+
+
+def candles_to_records(candles: np.ndarray) -> List[dict]:
+    """Convert a candle array to [{'open', 'high', 'low', 'close', 'time'}, ...]"""
+    times = candles['time'].tolist()
+    return [
+        {'open': o, 'high': h, 'low': l, 'close': c, 'time': t}
+        for o, h, l, c, t in zip(candles['open'].tolist(), candles['high'].tolist(),
+                                 candles['low'].tolist(), candles['close'].tolist(), times)
+    ]
+
+
+def records_to_candles(records: Iterable[dict]) -> np.ndarray:
+    """Convert [{'time', 'open', 'high', 'low', 'close'}, ...] to a candle array"""
+    return np.array(
+        [(r['time'], r['open'], r['high'], r['low'], r['close']) for r in records],
+        dtype=OHLC_DTYPE
+    )
+
+
+def candles_to_dataframe(candles: np.ndarray):
+    """Convert a candle array to a pandas DataFrame"""
+    import pandas as pd
+
+    return pd.DataFrame(candles)
@@ -0,0 +1,197 @@
+"""Module for firing actions on candle boundaries of the server clock."""
+import asyncio
+import heapq
+import logging
+import math
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Таймфреймы свечей, которые принимает loadHistoryPeriod, от меньшего к большему
+TIMEFRAMES = [60, 120, 180, 300, 600, 900, 1800, 3600, 7200, 14400, 28800, 86400]
+
+
+def next_boundary(timestamp: float, timeframe: int) -> int:
+    """Start of the next candle after timestamp"""
+    return (math.floor(timestamp) // timeframe + 1) * timeframe
+
+
+class CandleScheduler:
+    """Timer wheel firing callbacks at candle boundaries of the server time
+
+    Callbacks are grouped by their due server timestamp and one loop timer
+    is armed for the earliest group, so any number of orders waiting for the
+    same candle open share a single wakeup and are sent back to back. The
+    timer is re-armed against the server clock when it fires early, which
+    keeps the firing error at the loop timer resolution (about 1 ms).
+
+    Detected asset timeframes are cached, concurrent detections of the same
+    asset share one probe. The probe requests all timeframes at once and
+    gives up after `detect_timeout` seconds in total.
+
+    All methods must be called on the websocket client loop.
+
+    Usage:
+        scheduler = api.scheduler
+        boundary = await scheduler.wait_for_new_candle(60)
+
+        # Fire on the next candle of the asset timeframe
+        await scheduler.on_new_candle("EURUSD_otc", api.buyv3, 1, "EURUSD_otc", "call", 60, request_id)
+    """
+
+    def __init__(self, api, clock: Callable[[], float] = None, tolerance: float = 0.0005,
+                 detect_timeout: float = 5.0):
+        """
+        Args:
+            api: PocketOptionAPI used for timeframe detection
+            clock (callable, optional): Server time in seconds, api.server_time by default
+            tolerance (float): Seconds before the due time at which a group may fire
+            detect_timeout (float): Limit in seconds for detecting the timeframe of an asset
+        """
+        self.api = api
+        self.clock = clock or api.server_time
+        self.tolerance = tolerance
+        self.detect_timeout = detect_timeout
+        self.timeframes: Dict[str, int] = {}
+        self._detecting: Dict[str, asyncio.Future] = {}
+        self._slots: Dict[float, List[tuple]] = {}
+        self._heap: List[float] = []
+        self._handle = None
+        self._armed_for = None
+        self._loop = None
+
+    @property
+    def pending(self) -> int:
+        """Number of callbacks waiting to fire"""
+        return sum(len(slot) for slot in self._slots.values())
+
+    def at(self, timestamp: float, callback: Callable = None, *args) -> asyncio.Future:
+        """Run callback(*args) when the server clock reaches timestamp
+
+        Returns:
+            asyncio.Future: Resolved with the callback result (or timestamp without callback)
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._reset(loop)
+
+        future = loop.create_future()
+        slot = self._slots.get(timestamp)
+        if slot is None:
+            slot = self._slots[timestamp] = []
+            heapq.heappush(self._heap, timestamp)
+        slot.append((callback, args, future))
+
+        if self._armed_for is None or timestamp < self._armed_for:
+            self._arm()
+        return future
+
+    def at_next_candle(self, timeframe: int, callback: Callable = None, *args) -> asyncio.Future:
+        """Run callback(*args) at the open of the next candle of timeframe"""
+        return self.at(next_boundary(self.clock(), timeframe), callback, *args)
+
+    async def wait_for_new_candle(self, timeframe: int) -> int:
+        """Wait for the start of a new candle
+
+        Returns:
+            int: Server timestamp of the candle open
+        """
+        boundary = next_boundary(self.clock(), timeframe)
+        await self.at(boundary)
+        return boundary
+
+    async def on_new_candle(self, active: str, callback: Callable, *args):
+        """Run callback(*args) at the next candle open of the asset timeframe
+
+        Raises:
+            ValueError: If the asset timeframe can not be detected
+        """
+        timeframe = await self.timeframe(active)
+        if timeframe is None:
+            raise ValueError(f"Could not detect timeframe of {active}")
+        return await self.at_next_candle(timeframe, callback, *args)
+
+    async def timeframe(self, active: str):
+        """Get the asset timeframe, detecting it once per asset"""
+        if active in self.timeframes:
+            return self.timeframes[active]
+
+        detecting = self._detecting.get(active)
+        if detecting is None:
+            detecting = self._detecting[active] = asyncio.ensure_future(self._detect(active))
+            detecting.add_done_callback(lambda _: self._detecting.pop(active, None))
+        return await asyncio.shield(detecting)
+
+    async def _detect(self, active: str):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.detect_timeout
+        end_time = (int(self.clock()) // 60) * 60
+        # Все запросы уходят сразу, ответы проверяются от меньшего таймфрейма к большему
+        probes = [asyncio.ensure_future(self.api.get_candles_data_async(active, timeframe, 2, end_time))
+                  for timeframe in TIMEFRAMES]
+        try:
+            for timeframe, probe in zip(TIMEFRAMES, probes):
+                history = await asyncio.wait_for(asyncio.shield(probe), max(0.0, deadline - loop.time()))
+                if history and len(history) >= 2 and history[1]['time'] - history[0]['time'] == timeframe:
+                    logger.info(f"Detected active timeframe of {active}: {timeframe} seconds")
+                    self.timeframes[active] = timeframe
+                    return timeframe
+        except asyncio.TimeoutError:
+            logger.error(f"Timeframe detection of {active} took longer than {self.detect_timeout} s")
+            return None
+        finally:
+            for probe in probes:
+                probe.cancel()
+
+        logger.error(f"Could not detect active timeframe of {active}")
+        return None
+
+    def cancel(self):
+        """Cancel every waiting callback"""
+        if self._handle is not None:
+            self._handle.cancel()
+        for slot in self._slots.values():
+            for _, _, future in slot:
+                future.cancel()
+        self._slots.clear()
+        self._heap.clear()
+        self._handle = None
+        self._armed_for = None
+
+    def _reset(self, loop):
+        # Цикл событий сменился - старые таймеры недействительны
+        self.cancel()
+        self._loop = loop
+
+    def _arm(self):
+        if self._handle is not None:
+            self._handle.cancel()
+        while self._heap and self._heap[0] not in self._slots:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._handle = None
+            self._armed_for = None
+            return
+
+        due = self._heap[0]
+        delay = max(0.0, due - self.clock())
+        self._armed_for = due
+        self._handle = self._loop.call_at(self._loop.time() + delay, self._fire)
+
+    def _fire(self):
+        self._handle = None
+        now = self.clock()
+        while self._heap and self._heap[0] <= now + self.tolerance:
+            due = heapq.heappop(self._heap)
+            for callback, args, future in self._slots.pop(due, ()):
+                if future.cancelled():
+                    continue
+                if callback is None:
+                    future.set_result(due)
+                    continue
+                try:
+                    future.set_result(callback(*args))
+                except Exception as e:
+                    logger.error(f"Error in scheduled callback: {e}")
+                    future.set_exception(e)
+        self._arm()
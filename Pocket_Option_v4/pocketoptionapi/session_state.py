@@ -0,0 +1,45 @@
+"""Module for per-session connection state."""
+from collections import deque
+
+
+class SessionState:
+    """Isolated state of one account connection
+
+    Has the same attributes as the global_value module, which stays the
+    default state of a single PocketOption instance. Passing a SessionState
+    lets several accounts live in one process without overwriting each
+    other's SSID, balance and orders.
+
+    Usage:
+        state = SessionState()
+        api = PocketOption(ssid, state=state)
+        print(state.balance)
+    """
+
+    def __init__(self, ssid=None, demo=None):
+        self.websocket_is_connected = False
+        self.ssl_Mutual_exclusion = False
+        self.ssl_Mutual_exclusion_write = False
+
+        self.SSID = ssid
+
+        self.check_websocket_if_error = False
+        self.websocket_error_reason = None
+
+        self.balance_id = None
+        self.balance = None
+        self.balance_type = None
+        self.balance_updated = None
+        self.result = None
+        self.order_data = {}
+        self.order_open = deque(maxlen=1000)
+        self.order_closed = deque(maxlen=1000)
+        self.stat = deque(maxlen=1000)
+        self.DEMO = demo
+
+        self.profit = None
+        self.percent_profit = None
+        self.current_price = None
+        self.volume = None
+        self.available_assets = None
+        self.asset_manager = None
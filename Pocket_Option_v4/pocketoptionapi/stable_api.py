@@ -1,20 +1,31 @@
 import asyncio
-import threading
+import functools
 import time
 import logging
-import pandas as pd
-import json
 import pocketoptionapi.global_value as global_value
 import pocketoptionapi.constants as OP_code
-from tzlocal import get_localzone
-from pocketoptionapi.api import PocketOptionAPI
+from pocketoptionapi.async_api import AsyncPocketOption, parse_demo_status
+from pocketoptionapi.resample import resample_ticks, history_to_arrays, candles_to_records
 from collections import defaultdict
 from collections import deque
 from typing import List, Optional, Any
 
 
-# Получение локальной временной зоны
-local_zone_name = get_localzone()
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def get_local_zone():
+    """Local timezone, detected on first use instead of at import"""
+    from tzlocal import get_localzone
+    return get_localzone()
+
+
+def __getattr__(name):
+    # local_zone_name вычисляется при первом обращении
+    if name == 'local_zone_name':
+        return get_local_zone()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def nested_dict(n, type):
@@ -42,29 +53,22 @@ class PocketOption:
         Returns:
             bool: True for demo account, False for real account
         """
-        try:
-            json_part = ssid.split('["auth",', 1)[1].strip(']')
-            data = json.loads(json_part)
-            return bool(data.get('isDemo', 0))
-        except Exception as e:
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error parsing SSID demo status: {e}")
-            return False
+        return parse_demo_status(ssid)
 
-    def __init__(self, ssid):
+    def __init__(self, ssid, cache_dir=None, state=None):
         """Initialize Pocket Option API
 
+        Blocking wrapper over AsyncPocketOption: coroutines are run on the
+        websocket client loop and their results returned to the caller.
+
         Args:
             ssid (str): SSID string for authentication
+            cache_dir (str, optional): Directory of the local candle cache used by get_candles
+            state (SessionState, optional): Isolated session state, global_value module by default
         """
         self.size = [1, 5, 10, 15, 30, 60, 120, 180, 300, 600, 900, 1800,
                      3600, 7200, 14400, 28800, 43200, 86400, 604800, 2592000]
 
-        # Добавляем автоопределение demo/real режима
-        is_demo = self.parse_demo_status(ssid)
-        global_value.SSID = ssid
-        global_value.DEMO = is_demo
-
         self.suspend = 0.5
         self.thread = None
         self.subscribe_candle = []
@@ -78,12 +82,16 @@ class PocketOption:
                           r"Chrome/66.0.3359.139 Safari/537.36"}
         self.SESSION_COOKIE = {}
 
-        # Инициализируем API с определенным режимом
-        self.api = PocketOptionAPI(ssid)
+        # Асинхронный клиент, все запросы выполняются в его цикле событий
+        self.client = AsyncPocketOption(ssid, cache_dir=cache_dir, state=state)
+        self.state = self.client.state
+        self.candle_store = self.client.candle_store
+        self.api = self.client.api
         self.loop = asyncio.get_event_loop()
 
-        logger = logging.getLogger(__name__)
-        logger.info(f"Initializing {'Demo' if is_demo else 'Real'} account connection")
+    def _run(self, coro, timeout=None):
+        """Run a coroutine of the async client on the websocket loop and return its result"""
+        return self.api.websocket.run(coro, timeout)
 
     def get_server_timestamp(self):
         return self.api.time_sync.server_timestamp
@@ -96,16 +104,17 @@ class PocketOption:
         self.SESSION_COOKIE = cookie
 
     def get_async_order(self, buy_order_id):
-        if self.api.order_async["deals"][0]["id"] == buy_order_id:
-            return self.api.order_async["deals"][0]
-        else:
-            return None
+        record = self.api.orders.get(buy_order_id)
+        if record is not None:
+            return record.deal
+        return None
 
     def get_async_order_id(self, buy_order_id):
         return self.api.order_async["deals"][0][buy_order_id]
 
     def start_async(self):
-        asyncio.run(self.api.connect())
+        """Run the websocket client in the current thread until it stops"""
+        asyncio.run(self.api.websocket.connect())
 
     def connect(self):
         """
@@ -113,100 +122,69 @@ class PocketOption:
         Использует внутренний цикл событий asyncio для выполнения coroutine подключения.
         """
         try:
-            websocket_thread = threading.Thread(target=self.api.connect, daemon=True)
-            websocket_thread.start()
+            self.api.start_websocket_thread()
         except Exception as e:
             print(f"Error connecting: {e}")
             return False
         return True
 
-    @staticmethod
-    def check_connect():
-        if global_value.websocket_is_connected == 0:
+    def wait_ready(self, timeout=None, events=None):
+        """Block until the connection is ready, see PocketOptionAPI.wait_ready()"""
+        return self.api.wait_ready(timeout, events)
+
+    def check_connect(self):
+        if self.state.websocket_is_connected == 0:
             return False
-        elif global_value.websocket_is_connected is None:
+        elif self.state.websocket_is_connected is None:
             return False
         else:
             return True
 
-    @staticmethod
-    def get_balance():
-        if global_value.balance_updated:
-            return global_value.balance
+    def get_balance(self):
+        if self.state.balance_updated:
+            return self.state.balance
         else:
             return None
 
-    @staticmethod
-    def check_open():
-        return global_value.order_open
-
-    @staticmethod
-    def check_order_closed(ido):
-        while ido not in global_value.order_closed:
-            time.sleep(0.1)
+    def check_open(self):
+        return self.api.orders.open_ids()
 
-        for pack in global_value.stat:
-            if pack[0] == ido:
-                print('Order Closed', pack[1])
-        return pack[0]
+    def check_order_closed(self, ido, timeout=None):
+        record = self.api.orders.wait_closed(ido, timeout)
+        print('Order Closed', record.status)
+        return ido
 
     def buy(self, amount, active, action, expirations):
-        self.api.buy_multi_option = {}
-        self.api.buy_successful = None
-        req_id = "buy"
+        return self._run(self.client.buy(amount, active, action, expirations))
 
-        try:
-            if req_id not in self.api.buy_multi_option:
-                self.api.buy_multi_option[req_id] = {"id": None}
-            else:
-                self.api.buy_multi_option[req_id]["id"] = None
-        except Exception as e:
-            logging.error(f"Error initializing buy_multi_option: {e}")
-            return False, None
+    def buy_many(self, orders, timeout=5, on_result=None):
+        """Open several orders at once
 
-        global_value.order_data = None
-        global_value.result = None
+        All openOrder frames are sent in one burst with unique requestIds,
+        see AsyncPocketOption.buy_many_iter().
 
-        self.api.buyv3(amount, active, action, expirations, req_id)
+        Args:
+            orders: List of (amount, active, action, expirations) tuples or dicts
+            timeout (float): Deadline for the whole batch in seconds
+            on_result (callable, optional): Called with every OrderResult as soon as
+                it is known, from the websocket loop thread
 
-        start_t = time.time()
-        while True:
-            if global_value.result is not None and global_value.order_data is not None:
-                break
-            if time.time() - start_t >= 5:
-                if isinstance(global_value.order_data, dict) and "error" in global_value.order_data:
-                    logging.error(global_value.order_data["error"])
-                else:
-                    logging.error("Unknown error occurred during buy operation")
-                return False, None
-            time.sleep(0.1)
+        Returns:
+            BatchResult: Results in submission order
+        """
+        return self._run(self.client.buy_many(orders, timeout, on_result), timeout + 5)
 
-        return global_value.result, global_value.order_data.get("id", None)
+    def _wait_order_reply(self, key, timeout=5, future=None):
+        """Wait for the openOrder reply registered under key
+
+        Returns:
+            tuple: (True, order id) on success, (None, None) if the order was
+                sent but its outcome is not known yet, (False, None) otherwise
+        """
+        return self._run(self.client.wait_order_reply(key, timeout, future))
 
     def check_win(self, id_number):
-        start_t = time.time()
-        order_info = None
-
-        while True:
-            try:
-                order_info = self.get_async_order(id_number)
-                if order_info and "id" in order_info and order_info["id"] is not None:
-                    break
-            except:
-                pass
-
-            if time.time() - start_t >= 120:
-                logging.error("Timeout: Could not retrieve order info in time.")
-                return None, "unknown"
-
-            time.sleep(0.1)
-
-        if order_info and "profit" in order_info:
-            status = "win" if order_info["profit"] > 0 else "lose"
-            return order_info["profit"], status
-        else:
-            logging.error("Invalid order info retrieved.")
-            return None, "unknown"
+        return self._run(self.client.check_win(id_number, timeout=120))
 
     def buy_advanced(self, amount, active, action, expirations, on_new_candle=False):
         """Advanced buy method with new candle mode support
@@ -219,22 +197,16 @@ class PocketOption:
             on_new_candle: If True, wait for new candle
         """
         try:
-            self.api.buy_multi_option = {}
             self.api.buy_successful = None
-            req_id = "buy"
+            req_id = str(self.api.pending.next_request_id())
 
-            # Инициализация опций
-            if req_id not in self.api.buy_multi_option:
-                self.api.buy_multi_option[req_id] = {"id": None}
-            else:
-                self.api.buy_multi_option[req_id]["id"] = None
-
-            # Сброс глобальных значений
-            global_value.order_data = None
-            global_value.result = None
+            # Регистрируем ожидание ответа до отправки ордера
+            key = ("openOrder", req_id)
+            future = self.api.pending.register(key)
+            self.api.orders.requested(req_id, asset=active, amount=amount, direction=action, duration=expirations)
 
             # Используем расширенный метод покупки без параметра timeframe
-            self.api.buy_advanced(
+            sent = self.api.buy_advanced(
                 amount=amount,
                 active=active,
                 direction=action,
@@ -242,21 +214,12 @@ class PocketOption:
                 request_id=req_id,
                 on_new_candle=on_new_candle
             )
+            if not sent:
+                self.api.pending.discard(key)
+                return False, None
 
             # Ждем результат
-            start_t = time.time()
-            while True:
-                if global_value.result is not None and global_value.order_data is not None:
-                    break
-                if time.time() - start_t >= 5:
-                    if isinstance(global_value.order_data, dict) and "error" in global_value.order_data:
-                        logging.error(global_value.order_data["error"])
-                    else:
-                        logging.error("Unknown error occurred during buy operation")
-                    return False, None
-                time.sleep(0.1)
-
-            return global_value.result, global_value.order_data.get("id", None)
+            return self._wait_order_reply(key, future=future)
 
         except Exception as e:
             logging.error(f"Error in buy_advanced: {e}")
@@ -279,84 +242,64 @@ class PocketOption:
             List of candles in format [[time, open, high, low, close], ...]
         """
         try:
-            candles = self.api.get_candles_data(active, timeframe, count)
-            if not candles:
-                return []
-
-            formatted_candles = [
-                [
-                    candle['time'],
-                    candle['open'],
-                    candle['high'],
-                    candle['low'],
-                    candle['close']
-                ]
-                for candle in candles
-            ]
-
-            if self.check_data(formatted_candles, timeframe):
-                return formatted_candles
-            return []
-
+            return self._run(self.client.get_candles(active, timeframe, count))
         except Exception as e:
             logger.error(f"Error in get_candles: {e}")
             return []
 
-    def check_data(self, candles, timeframe):
-        """Check candles data integrity"""
-        try:
-            if not candles:
-                return False
-
-            for i in range(len(candles) - 1):
-                current = candles[i]
-                next_candle = candles[i + 1]
-
-                time_diff = next_candle[0] - current[0]
-                if time_diff != timeframe:
-                    logger.error(f"Invalid time interval: {time_diff}")
-                    return False
-
-                if current[2] < current[3]:
-                    logger.error(f"High less than Low at {datetime.fromtimestamp(current[0])}")
-                    return False
+    def get_candles_range(self, active, timeframe, start, end, fill_gaps=True):
+        """Get historical candles for a time range of any length
 
-                if (current[1] > current[2] or
-                        current[1] < current[3] or
-                        current[4] > current[2] or
-                        current[4] < current[3]):
-                    logger.error(f"Invalid OHLC values at {datetime.fromtimestamp(current[0])}")
-                    return False
+        The range is downloaded in pages with several requests in flight.
 
-            return True
+        Args:
+            active: Asset symbol (e.g. "EURUSD_otc")
+            timeframe: Timeframe in seconds
+            start: First timestamp
+            end: End timestamp, exclusive
+            fill_gaps: Fill missing bars with flat candles
 
+        Returns:
+            List of candles in format [[time, open, high, low, close], ...]
+        """
+        try:
+            return self._run(self.client.get_candles_range(active, timeframe, start, end, fill_gaps))
         except Exception as e:
-            logger.error(f"Error checking candles: {e}")
-            return False
+            logging.error(f"Error in get_candles_range: {e}")
+            return []
+
+    def check_data(self, candles, timeframe):
+        """Check candles data integrity"""
+        return AsyncPocketOption.check_data(candles, timeframe)
 
 
     @staticmethod
-    def process_data_history(data, period):
-        df = pd.DataFrame(data['history'], columns=['timestamp', 'price'])
-        df['datetime'] = pd.to_datetime(df['timestamp'], unit='s', utc=True)
-        df['minute_rounded'] = df['datetime'].dt.floor(f'{period / 60}min')
+    def process_data_history(data, period, as_array=False):
+        """Build OHLC candles from loadHistoryPeriod tick history
 
-        ohlcv = df.groupby('minute_rounded').agg(
-            open=('price', 'first'),
-            high=('price', 'max'),
-            low=('price', 'min'),
-            close=('price', 'last')
-        ).reset_index()
+        Args:
+            data: History reply with 'history' as [[timestamp, price], ...]
+            period: Timeframe in seconds, or a list of timeframes
+            as_array: Return structured NumPy arrays instead of dicts
 
-        ohlcv['time'] = ohlcv['minute_rounded'].apply(lambda x: int(x.timestamp()))
-        ohlcv = ohlcv.drop(columns='minute_rounded')
-        ohlcv = ohlcv.iloc[:-1]
-        ohlcv_dict = ohlcv.to_dict(orient='records')
+        Returns:
+            list of dicts {'open', 'high', 'low', 'close', 'time'} without the
+            last incomplete candle, or a dict period -> result for many periods
+        """
+        timestamps, prices = history_to_arrays(data['history'])
+        candles = resample_ticks(timestamps, prices, period, drop_last=True)
 
-        return ohlcv_dict
+        if not as_array:
+            candles = {p: candles_to_records(c) for p, c in candles.items()}
+        if isinstance(period, int):
+            return candles[period]
+        return candles
 
     @staticmethod
     def process_candle(candle_data, period):
+        # pandas нужен только здесь, импорт при первом вызове
+        import pandas as pd
+
         data_df = pd.DataFrame(candle_data)
         data_df.sort_values(by='time', ascending=True, inplace=True)
         data_df.drop_duplicates(subset='time', keep="first", inplace=True)
@@ -369,6 +312,24 @@ class PocketOption:
     def change_symbol(self, active, period):
         return self.api.change_symbol(active, period)
 
+    def subscribe_ticks(self, active, period=60):
+        """Start streaming ticks of an asset, many assets can be subscribed at once"""
+        return self.api.streams.subscribe(active, period)
+
+    def unsubscribe_ticks(self, active):
+        """Stop streaming ticks of an asset"""
+        return self.api.streams.unsubscribe(active)
+
+    def iter_ticks(self, *actives, maxsize=1000, timeout=None):
+        """Iterate (asset, timestamp, price) ticks of subscribed assets
+
+        Args:
+            *actives: Assets to receive, all subscribed assets if empty
+            maxsize: Queue size before the oldest ticks are dropped
+            timeout: Stop after this many seconds without a tick
+        """
+        return self.api.streams.iter_ticks(*actives, maxsize=maxsize, timeout=timeout)
+
     def sync_datetime(self):
         return self.api.synced_datetime
 
@@ -459,15 +420,7 @@ class PocketOption:
             list: List of Asset objects
         """
         try:
-            if not global_value.asset_manager:
-                self.api.get_assets()
-                start_time = time.time()
-                while not global_value.asset_manager and time.time() - start_time < 10:
-                    time.sleep(0.1)
-
-            if global_value.asset_manager:
-                return global_value.asset_manager.get_all_assets()
-            return []
+            return self._run(self.client.get_assets())
         except Exception as e:
             logging.error(f"Error getting assets: {e}")
             return []
@@ -494,8 +447,8 @@ class PocketOption:
             Asset or None: Asset object if found, None otherwise
         """
         try:
-            if global_value.asset_manager:
-                return global_value.asset_manager.get_asset_by_symbol(symbol)
+            if self.state.asset_manager:
+                return self.state.asset_manager.get_asset_by_symbol(symbol)
             return None
         except Exception as e:
             logging.error(f"Error getting asset by symbol: {e}")
@@ -510,8 +463,8 @@ class PocketOption:
             list: List of Asset objects sorted by profit
         """
         try:
-            if global_value.asset_manager:
-                return global_value.asset_manager.get_profitable_assets(min_profit)
+            if self.state.asset_manager:
+                return self.state.asset_manager.get_profitable_assets(min_profit)
             return []
         except Exception as e:
             logging.error(f"Error getting profitable assets: {e}")
@@ -1,8 +1,9 @@
 # pocketoptionapi/ws/channels/get_assets.py
 
+import weakref
+
 from pocketoptionapi.ws.channels.base import Base
 from pocketoptionapi.ws.objects.asset import AssetManager  # Добавляем этот импорт
-import pocketoptionapi.global_value as global_value
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,12 +11,15 @@ logger = logging.getLogger(__name__)
 
 class GetAssets(Base):
     name = "updateAssets"
-    _instance = None  # Добавляем для синглтона
+    # Один экземпляр на соединение, чтобы у каждого аккаунта был свой AssetManager
+    _instances = weakref.WeakKeyDictionary()
 
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    def __new__(cls, api, *args, **kwargs):
+        instance = cls._instances.get(api)
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instances[api] = instance
+        return instance
 
     def __init__(self, api):
         if not hasattr(self, '_initialized'):
@@ -35,8 +39,8 @@ class GetAssets(Base):
         try:
             logger.debug(f"Processing assets response. Data length: {len(data)}")
             self.asset_manager.process_assets(data)
-            # Сохраняем тот же экземпляр в global_value
-            global_value.asset_manager = self.asset_manager
+            # Сохраняем тот же экземпляр в состоянии сессии
+            self.api.state.asset_manager = self.asset_manager
             logger.debug(f"Assets processed. Total: {len(self.asset_manager.assets)}")
         except Exception as e:
             logger.error(f"Error processing assets: {e}")
@@ -0,0 +1,37 @@
+"""Module for PocketOption symbol subscription websocket chanel."""
+
+from pocketoptionapi.ws.channels.base import Base
+
+
+class SubscribeSymbol(Base):
+    """Class for Pocket option symbol subscription websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "sendMessage"
+
+    def __call__(self, active_id):
+        """Method to keep the tick stream of an asset open.
+
+        :param active_id: The active/asset identifier.
+        """
+
+        data_stream = ["subfor", active_id]
+
+        self.send_websocket_request(self.name, data_stream)
+
+
+class UnsubscribeSymbol(Base):
+    """Class for Pocket option symbol unsubscription websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "sendMessage"
+
+    def __call__(self, active_id):
+        """Method to stop the tick stream of an asset.
+
+        :param active_id: The active/asset identifier.
+        """
+
+        data_stream = ["unsubfor", active_id]
+
+        self.send_websocket_request(self.name, data_stream)
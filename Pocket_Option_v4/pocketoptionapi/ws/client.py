@@ -1,16 +1,25 @@
 import asyncio
+import concurrent.futures
+import inspect
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 import websockets
-import json
 import logging
-import ssl
+import random
 import pocketoptionapi.constants as OP_code
 import pocketoptionapi.global_value as global_value
 from pocketoptionapi.constants import REGION
+from pocketoptionapi.region_probe import connect_options, make_ssl_context
+from pocketoptionapi.ws.decoder import FrameDecoder
 from pocketoptionapi.ws.objects.timesync import TimeSync
 from pocketoptionapi.ws.objects.time_sync import TimeSynchronizer
 from pocketoptionapi.ws.objects.trade_data import TradeData
-from collections import defaultdict
+from pocketoptionapi.ws.objects.bounded_dict import BoundedTimeDict
+from pocketoptionapi.ws.objects.order_registry import OrderUnknownError
+from pocketoptionapi.ws.objects.readiness import Readiness
+from collections import defaultdict, deque
+from collections.abc import Mapping
 
 logger = logging.getLogger(__name__)
 
@@ -18,38 +27,58 @@ timesync = TimeSync()
 sync = TimeSynchronizer()
 
 
-async def on_open():
+async def on_open(state=global_value):
     """Method to process websocket open."""
     print("CONNECTED SUCCESSFUL")
     logger.debug("Websocket client connected.")
-    global_value.websocket_is_connected = True
+    state.websocket_is_connected = True
 
 
-async def send_ping(ws):
-    while global_value.websocket_is_connected is False:
-        await asyncio.sleep(0.1)
+async def send_ping(client):
+    await client.ready.wait_async(["authenticated"])
     while True:
         await asyncio.sleep(20)
-        await ws.send('42["ps"]')
+        await client.send('42["ps"]')
 
 
 class WebsocketClient(object):
     def __init__(self, api) -> None:
-        self.updateHistoryNew = None
-        self.updateStream = None
-        self.history_data_ready = None
-        self.successCloseOrder = False
         self.api = api
+        # Состояние сессии; по умолчанию модуль global_value
+        self.state = getattr(api, 'state', global_value)
         self.message = None
         self.url = None
-        self.ssid = global_value.SSID
+        self.ssid = self.state.SSID
         self.websocket = None
         self.region = REGION()
-        self.loop = asyncio.get_event_loop()
-        self.wait_second_message = False
-        self._updateClosedDeals = False
-        self.trade_handler = TradeData()
+        # Горячий резерв соединения (HotStandby), включается пользователем
+        self.standby = None
+        # Переподключение с экспоненциальной задержкой и случайным разбросом
+        self.reconnect = True
+        self.backoff_base = 0.1
+        self.backoff_max = 30.0
+        self._sessions = 0
+        # requestId ордеров, записанных в текущее соединение, и ордеров,
+        # ожидание которых отменено до отправки
+        self._sent_orders = set()
+        self._dropped_orders = set()
+        self._orders_lock = threading.Lock()
+        # Списки сделок, которые нужно получить для сверки ордеров с неизвестным исходом
+        self._reconcile_events = set()
+        # События готовности: connected, authenticated, first_timestamp, assets_loaded
+        self.ready = Readiness()
+        # Цикл событий, которому принадлежит соединение. Устанавливается в connect()
+        self.loop = None
+        self._loop_ready = threading.Event()
+        self._send_queue = None
+        # Обработчики событий и очередь событий, ожидающих бинарный кадр
+        self._handlers = defaultdict(list)
+        self._binary_events = deque()
+        # Разбор JSON кадров; библиотека выбирается при создании (msgspec, orjson, json)
+        self.decoder = FrameDecoder()
+        self.trade_handler = TradeData(self.state)
         self.available_assets = None
+        self._register_default_handlers()
 
     async def websocket_listener(self, ws):
         try:
@@ -67,7 +96,7 @@ class WebsocketClient(object):
                 await self.websocket.send("42[\"leave\"]")
 
             # Set connection flag to False
-            global_value.websocket_is_connected = False
+            self.state.websocket_is_connected = False
 
             # Close WebSocket connection
             if self.websocket:
@@ -76,12 +105,7 @@ class WebsocketClient(object):
             # Clear data
             self.websocket = None
             self.url = None
-            self._updateClosedDeals = False
-            self.wait_second_message = False
-            self.updateHistoryNew = None
-            self.updateStream = None
-            self.history_data_ready = None
-            self.successCloseOrder = False
+            self._binary_events.clear()
             self.available_assets = None
 
             logger.info("WebSocket connection closed successfully")
@@ -89,240 +113,531 @@ class WebsocketClient(object):
         except Exception as e:
             logger.error(f"Error while closing connection: {e}")
 
+    def resolve_url(self, url):
+        """Replace a region url with the demo server url for demo accounts"""
+        if self.state.DEMO == True:
+            if "session_id" in self.state.SSID:
+                return "wss://demo-api-eu.po.market/socket.io/?EIO=4&transport=websocket"
+            elif "session" in self.state.SSID and "session_id" not in self.state.SSID:
+                return "wss://demo-api-eu.po.market/socket.io/?EIO=4&transport=websocket"
+            else:
+                return "wss://try-demo-eu.po.market/socket.io/?EIO=4&transport=websocket"
+        return url
+
     async def connect(self):
-        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
+        ssl_context = make_ssl_context()
 
         try:
             await self.close()
         except:
             pass
 
-        while not global_value.websocket_is_connected:
+        self._attach_loop(asyncio.get_running_loop())
+        if self.standby is not None:
+            self.standby.start()
+
+        attempt = 0
+        while self.reconnect:
             for url in self.region.get_regions(True):
-                if global_value.DEMO == True:
-                    if "session_id" in global_value.SSID:
-                        url = "wss://demo-api-eu.po.market/socket.io/?EIO=4&transport=websocket"
-                    elif "session" in global_value.SSID and "session_id" not in global_value.SSID:
-                        url = "wss://demo-api-eu.po.market/socket.io/?EIO=4&transport=websocket"
-                    else:
-                        url = "wss://try-demo-eu.po.market/socket.io/?EIO=4&transport=websocket"
-
-                print(url)
-                try:
-                    async with websockets.connect(
-                            url,
-                            ssl=ssl_context,
-                            extra_headers={"Origin": "https://pocketoption.com", "Cache-Control": "no-cache"},
-                            user_agent_header="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-                    ) as ws:
-                        self.websocket = ws
-                        self.url = url
-                        global_value.websocket_is_connected = True
-
-                        # Create and execute tasks
-                        on_message_task = asyncio.create_task(self.websocket_listener(ws))
-                        sender_task = asyncio.create_task(self.send_message(self.message))
-                        ping_task = asyncio.create_task(send_ping(ws))
-
-                        await asyncio.gather(on_message_task, sender_task, ping_task)
-
-                except websockets.ConnectionClosed as e:
-                    global_value.websocket_is_connected = False
-                    await self.on_close(e)
-                    logger.warning("Trying another server")
-
-                except Exception as e:
-                    global_value.websocket_is_connected = False
-                    await self.on_error(e)
-
-            await asyncio.sleep(1)
+                established = await self._connect_url(self.resolve_url(url), ssl_context)
+                await self._failover()
+                if not self.reconnect:
+                    break
+
+                if established:
+                    attempt = 0
+                delay = self.backoff_delay(attempt)
+                attempt += 1
+                logger.info(f"Reconnecting in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                if established:
+                    # После обрыва начинаем снова с лучшего региона
+                    break
 
         return True
 
-    async def send_message(self, message):
-        while global_value.websocket_is_connected is False:
-            await asyncio.sleep(0.1)
+    def backoff_delay(self, attempt):
+        """Reconnect delay for a failed attempt: full jitter over base * 2 ** attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
 
-        self.message = message
+    async def _connect_url(self, url, ssl_context):
+        """Connect to url and serve the connection until it ends
+
+        Returns:
+            bool: True if the connection was established
+        """
+        print(url)
+        established = False
+        try:
+            async with websockets.connect(url, **connect_options(url, ssl_context)) as ws:
+                established = True
+                await self._serve(ws, url)
+
+        except websockets.ConnectionClosed as e:
+            self.state.websocket_is_connected = False
+            await self.on_close(e)
+            logger.warning("Trying another server")
 
-        if global_value.websocket_is_connected and message is not None:
+        except Exception as e:
+            self.state.websocket_is_connected = False
+            await self.on_error(e)
+
+        return established
+
+    async def _serve(self, ws, url, authenticated=False):
+        """Run listener, sender and ping tasks until the connection ends"""
+        self.websocket = ws
+        self.url = url
+        self.state.websocket_is_connected = True
+        self.ready.set("connected")
+        if authenticated:
+            # successauth уже получен резервным соединением
+            await self._on_authenticated()
+
+        # Create and execute tasks
+        on_message_task = asyncio.create_task(self.websocket_listener(ws))
+        sender_task = asyncio.create_task(self.sender())
+        ping_task = asyncio.create_task(send_ping(self))
+        try:
+            await on_message_task
+        finally:
+            sender_task.cancel()
+            ping_task.cancel()
+            self.state.websocket_is_connected = False
+            self.ready.clear("connected")
+            self.ready.clear("authenticated")
+            self._connection_lost()
+
+    def _connection_lost(self):
+        """Settle orders in flight after the connection dropped
+
+        openOrder frames still queued are dropped, so they are not sent on
+        the next connection. Orders that were never written to this
+        connection fail with ConnectionError. An order whose frame was
+        written may have been placed, so its waiter gets OrderUnknownError
+        and the order stays in the UNKNOWN state until _resume() reconciles
+        it with the deal lists of the next session. Other frames stay queued.
+        """
+        error = ConnectionError("Connection lost before the order was sent")
+        kept = []
+        while not self._send_queue.empty():
+            data, future = self._send_queue.get_nowait()
+            if data.startswith('42["openOrder"'):
+                if future is not None and not future.done():
+                    future.set_exception(error)
+            else:
+                kept.append((data, future))
+        for item in kept:
+            self._send_queue.put_nowait(item)
+
+        with self._orders_lock:
+            sent, self._sent_orders = self._sent_orders, set()
+            self._dropped_orders.clear()
+        pending = getattr(self.api, 'pending', None)
+        if pending is None:
+            return
+        for key in pending.pending("openOrder"):
+            if key[1] in sent:
+                self.api.orders.unknown(key[1], "disconnected")
+                pending.reject(key, OrderUnknownError(f"Connection lost after order {key[1]} was sent"))
+            else:
+                self.api.orders.failed(key[1], "disconnected")
+                pending.reject(key, error)
+
+    def _order_request_id(self, data):
+        """Get the requestId of an openOrder frame as a string"""
+        try:
+            request_id = self.decoder.loads(data[2:])[1].get("requestId")
+        except (ValueError, IndexError, AttributeError):
+            return None
+        return str(request_id) if request_id is not None else None
+
+    def abandon_order(self, request_id):
+        """Stop waiting for the reply to an order
+
+        A frame still queued is dropped by the sender and never reaches the
+        server. A frame already written may have opened the order.
+
+        Args:
+            request_id: requestId of the openOrder frame
+
+        Returns:
+            bool: True if the frame was already written
+        """
+        request_id = str(request_id)
+        with self._orders_lock:
+            if request_id in self._sent_orders:
+                self._sent_orders.discard(request_id)
+                return True
+            self._dropped_orders.add(request_id)
+            return False
+
+    async def _failover(self):
+        """Continue on standby connections while they are available"""
+        while self.standby is not None:
+            adopted = self.standby.take()
+            if adopted is None:
+                return
+            ws, url = adopted
+            try:
+                await self._serve(ws, url, authenticated=True)
+            except Exception as e:
+                await self.on_error(e)
+            finally:
+                await ws.close()
+
+    def _attach_loop(self, loop):
+        """Bind the client to the event loop that owns the connection."""
+        if self.loop is not loop:
+            self.loop = loop
+            self._send_queue = asyncio.Queue()
+        self._loop_ready.set()
+
+    async def sender(self):
+        """Drain the outbound queue and write frames to the websocket in order."""
+        while True:
+            data, future = await self._send_queue.get()
+            if data.startswith('42["openOrder"'):
+                request_id = self._order_request_id(data)
+                with self._orders_lock:
+                    dropped = request_id in self._dropped_orders
+                    if dropped:
+                        self._dropped_orders.discard(request_id)
+                    else:
+                        # Обрыв во время записи тоже оставляет исход ордера неизвестным
+                        self._sent_orders.add(request_id)
+                if dropped:
+                    if future is not None:
+                        future.cancel()
+                    continue
             try:
-                await self.websocket.send(message)
+                await self.websocket.send(data)
+            except asyncio.CancelledError:
+                # Соединение закрывается во время записи
+                if future is not None and not future.done():
+                    future.set_exception(ConnectionError("Connection closed while sending"))
+                raise
             except Exception as e:
                 logger.warning(f"Error sending message: {e}")
+                if future is not None and not future.done():
+                    future.set_exception(e)
                 await self.close()
-        elif message is not None:
-            logger.warning("WebSocket not connected")
+                return
+            if future is not None and not future.done():
+                future.set_result(True)
 
-    @staticmethod
-    def dict_queue_add(self, dict, maxdict, key1, key2, key3, value):
-        if key3 in dict[key1][key2]:
-            dict[key1][key2][key3] = value
+    def submit(self, data, wait=False, timeout=None):
+        """Queue a frame for sending from any thread.
+
+        Args:
+            data (str): Raw Socket.IO frame, e.g. '42["ps"]'
+            wait (bool): Block until the frame has been written to the socket
+            timeout (float, optional): Seconds to wait for the loop and, with wait=True, for the write
+
+        Returns:
+            concurrent.futures.Future: Resolved once the frame is written
+        """
+        future = concurrent.futures.Future()
+        if not self._loop_ready.wait(timeout):
+            future.set_exception(TimeoutError("Websocket loop is not running"))
+            return future
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self.loop:
+            # Вызов из потока цикла: кладем в очередь напрямую
+            self._send_queue.put_nowait((data, future))
+            return future
+
+        self.loop.call_soon_threadsafe(self._send_queue.put_nowait, (data, future))
+        if wait:
+            future.result(timeout)
+        return future
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the client loop from another thread
+
+        Args:
+            coro: Coroutine to run
+            timeout (float, optional): Seconds to wait for the result
+
+        Returns:
+            The result of the coroutine
+        """
+        if not self._loop_ready.wait(timeout):
+            coro.close()
+            raise TimeoutError("Websocket loop is not running")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError("Timeout waiting for coroutine result")
+
+    async def send(self, data):
+        """Queue a frame from the client loop and wait until it is written."""
+        future = self.loop.create_future()
+        self._send_queue.put_nowait((data, future))
+        return await future
+
+    async def send_message(self, message):
+        """Send a frame through the outbound queue."""
+        if message is None:
+            return
+        self.message = message
+        if self.loop is asyncio.get_running_loop():
+            await self.send(message)
         else:
-            while True:
-                try:
-                    dic_size = len(dict[key1][key2])
-                except:
-                    dic_size = 0
-                if dic_size < maxdict:
-                    dict[key1][key2][key3] = value
-                    break
-                else:
-                    del dict[key1][key2][sorted(dict[key1][key2].keys(), reverse=False)[0]]
+            await asyncio.wrap_future(self.submit(message))
 
-    async def on_message(self, message):
-        logger.debug(message)
+    def dict_queue_add(self, dict, maxdict, key1, key2, key3, value):
+        """Store value at dict[key1][key2][key3] keeping at most maxdict newest keys"""
+        bucket = dict[key1][key2]
+        if not isinstance(bucket, BoundedTimeDict):
+            bucket = BoundedTimeDict(bucket, maxlen=maxdict)
+            dict[key1][key2] = bucket
+        bucket.maxlen = maxdict
+        bucket.add(key3, value)
+
+    def on(self, event, callback):
+        """Register a handler for a Socket.IO event
+
+        The handler receives the decoded payload of the event. For events whose
+        payload is sent as a binary attachment it is called with the content of
+        that binary frame. Coroutine functions are awaited on the client loop.
+
+        Args:
+            event (str): Event name, e.g. "updateStream"
+            callback (callable): Handler called with the payload
+
+        Returns:
+            callable: The callback, so the method can be used as a decorator
+        """
+        self._handlers[event].append(callback)
+        return callback
+
+    def off(self, event, callback):
+        """Remove a handler registered with on()"""
+        try:
+            self._handlers[event].remove(callback)
+        except ValueError:
+            pass
 
-        if type(message) is bytes:
-            message = message.decode('utf-8')
+    def _register_default_handlers(self):
+        """Register handlers for the events the client itself consumes"""
+        self.on("successauth", self._on_successauth)
+        self.on("successupdateBalance", self._on_balance)
+        self.on("successopenOrder", self._on_open_order)
+        self.on("failopenOrder", self._on_open_order)
+        self.on("successcloseOrder", self._on_close_order)
+        for event in ("successopenOrder", "successcloseOrder", "changeSymbol"):
+            self.on(event, self._on_financial)
+        self.on("updateOpenedDeals", self._on_opened_deals)
+        self.on("updateClosedDeals", self._on_closed_deals)
+        self.on("loadHistoryPeriod", self._on_history_period)
+        self.on("updateStream", self._on_stream)
+        self.on("updateHistoryNew", self._on_history_new)
+        self.on("updateAssets", self._on_assets)
+        self.on("NotAuthorized", self._on_not_authorized)
+
+    async def _dispatch(self, event, payload):
+        """Call every handler registered for event"""
+        handlers = self._handlers.get(event)
+        if not handlers:
+            logger.debug(f"No handler for event: {event}")
+            return
+        for handler in handlers:
             try:
-                message = json.loads(message)
-
-                # Проверяем, является ли сообщение массивом активов
-                if isinstance(message, list) and len(message) > 0:
-                    if all(isinstance(x, list) and len(x) >= 14 for x in message):
-                        try:
-                            if hasattr(self.api, 'get_assets'):
-                                self.api.get_assets.process_assets_response(message)
-                                logger.debug(f"Processed {len(message)} assets")
-                            return
-                        except Exception as e:
-                            logger.error(f"Error processing assets: {e}")
-
-                # Handle trade data
-                self.trade_handler.process_trade_message(message)
-
-                # Balance updates
-                if "balance" in message:
-                    if "uid" in message:
-                        global_value.balance_id = message["uid"]
-                    global_value.balance = message["balance"]
-                    global_value.balance_type = message["isDemo"]
-
-                # Order updates
-                elif "requestId" in message and message["requestId"] == 'buy':
-                    global_value.order_data = message
-                    global_value.order_open.append(message["id"])
-
-                # Deal updates
-                elif "deals" in message:
-                    if message["profit"] > 0:
-                        stat = "win"
-                    else:
-                        stat = "loss"
-                    ido = message["deals"][0]["id"]
-                    pack = [ido, stat]
-                    global_value.order_closed.append(ido)
-                    global_value.stat.append(pack)
-
-                # Symbol updates
-                if "changeSymbol" in str(message):
-                    if "quotation" in message:
-                        global_value.current_price = message.get("quotation", {}).get("bid")
-                        global_value.volume = message.get("quotation", {}).get("volume")
-                        global_value.percent_profit = message.get("profit_percent")
-
-                # Profit updates
-                if "profit" in message:
-                    global_value.profit = message["profit"]
-
-                if "percentProfit" in message:
-                    global_value.percent_profit = message["percentProfit"]
-
-                elif self.wait_second_message and isinstance(message, list):
-                    self.wait_second_message = False
-                    self._updateClosedDeals = False
-
-                elif isinstance(message, dict) and self.successCloseOrder:
-                    self.api.order_async = message
-                    self.successCloseOrder = False
-
-                elif self.history_data_ready and isinstance(message, dict):
-                    self.history_data_ready = False
-                    self.api.history_data = message["data"]
-
-                elif self.updateStream and isinstance(message, list):
-                    self.updateStream = False
-                    self.api.time_sync.server_timestamp = message[0][1]
-
-                elif self.updateHistoryNew and isinstance(message, dict):
-                    self.updateHistoryNew = False
-                    self.api.historyNew = message
+                result = handler(payload)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error in handler for {event}: {e}")
 
+    async def on_message(self, message):
+        if type(message) is bytes:
+            # Бинарный кадр - вложение к последнему заголовку 451-[event,{"_placeholder":true}]
+            event = self._binary_events.popleft() if self._binary_events else None
+            try:
+                payload = self.decoder.decode(event, message)
+            except ValueError:
+                logger.warning(f"Failed to decode binary frame for event: {event}")
                 return
 
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to decode message: {message}")
+            if event is None:
+                logger.debug("Binary frame without a pending event header")
                 return
 
+            await self._dispatch(event, payload)
+            return
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(message)
+
         if message.startswith('0') and "sid" in message:
             await self.websocket.send("40")
 
         elif message == "2":
             await self.websocket.send("3")
 
-        elif "40" and "sid" in message:
-            await self.websocket.send(global_value.SSID)
+        elif message.startswith('40') and "sid" in message:
+            await self.websocket.send(self.state.SSID)
 
         elif message.startswith('451-['):
             try:
-                json_part = message.split("-", 1)[1]
-                message = json.loads(json_part)
-
-                if message[0] == "successauth":
-                    await on_open()
-
-                elif message[0] == "successupdateBalance":
-                    global_value.balance_updated = True
-
-                elif message[0] == "successopenOrder":
-                    global_value.result = True
-
-                elif message[0] == "updateClosedDeals":
-                    self._updateClosedDeals = True
-                    self.wait_second_message = True
-                    await self.websocket.send('42["changeSymbol",{"asset":"AUDNZD_otc","period":60}]')
-
-                elif message[0] == "successcloseOrder":
-                    self.successCloseOrder = True
-                    self.wait_second_message = True
-
-                elif message[0] == "loadHistoryPeriod":
-                    self.history_data_ready = True
-
-                elif message[0] == "updateStream":
-                    self.updateStream = True
-
-                elif message[0] == "updateHistoryNew":
-                    self.updateHistoryNew = True
+                event, *args = self.decoder.loads(message[4:])
+            except ValueError as e:
+                logger.error(f"Failed to parse message: {e}")
+                return
 
-                elif message[0] == "updateAssets":
-                    logger.debug("Received updateAssets notification")
-                    if len(message) > 1 and isinstance(message[1], list):
-                        if hasattr(self.api, 'get_assets'):
-                            self.api.get_assets.process_assets_response(message[1])
-                            logger.debug(f"Assets processed via 451: {len(message[1])} assets")
+            payload = args[0] if args else None
+            if isinstance(payload, dict) and payload.get("_placeholder"):
+                # Данные придут следующим бинарным кадром
+                self._binary_events.append(event)
+            else:
+                await self._dispatch(event, payload)
 
-            except (IndexError, json.JSONDecodeError) as e:
+        elif message.startswith('42['):
+            try:
+                event, *args = self.decoder.loads(message[2:])
+            except ValueError as e:
                 logger.error(f"Failed to parse message: {e}")
                 return
 
-        elif message.startswith("42") and "NotAuthorized" in message:
-            logging.error("User not Authorized: Please Change SSID for one valid")
-            global_value.ssl_Mutual_exclusion = False
-            await self.close()
+            await self._dispatch(event, self.decoder.convert(event, args[0]) if args else None)
+
+    async def _on_successauth(self, payload):
+        await self._on_authenticated()
+
+    async def _on_authenticated(self):
+        """Mark the session authenticated and resume it after a reconnect"""
+        await on_open(self.state)
+        self.ready.set("authenticated")
+        self._sessions += 1
+        if self._sessions > 1:
+            self._resume()
+
+    def _resume(self):
+        """Re-issue subscriptions and idempotent requests lost with the old connection"""
+        streams = getattr(self.api, 'streams', None)
+        if streams is not None:
+            for asset, period in list(streams.subscriptions.items()):
+                self.api.change_symbol(asset, period)
+                self.api.subscribe_symbol(asset)
+        pending = getattr(self.api, 'pending', None)
+        resent = pending.replay() if pending is not None else 0
+        logger.info(f"Session resumed, {resent} pending requests resent")
+
+        orders = getattr(self.api, 'orders', None)
+        if orders is not None and orders.unknown_ids():
+            # Сервер присылает оба списка сделок после авторизации, по ним решаем исход
+            self._reconcile_events = {"updateOpenedDeals", "updateClosedDeals"}
+
+    def _deal_list_received(self, event):
+        """Fail unknown orders once both deal lists of the new session are in"""
+        if not self._reconcile_events:
+            return
+        self._reconcile_events.discard(event)
+        if not self._reconcile_events:
+            for record in self.api.orders.expire_unknown():
+                logger.warning(f"Order {record.request_id} was not placed before the connection dropped")
+
+    def _on_balance(self, message):
+        if isinstance(message, dict) and "balance" in message:
+            if "uid" in message:
+                self.state.balance_id = message["uid"]
+            self.state.balance = message["balance"]
+            self.state.balance_type = message.get("isDemo")
+        self.state.balance_updated = True
+
+    def _on_open_order(self, message):
+        if not isinstance(message, dict):
+            return
+        if "error" not in message:
+            self.state.result = True
+            self.api.orders.opened(message)
+        elif "requestId" in message:
+            self.api.orders.failed(message["requestId"], message["error"])
+        self.state.order_data = message
+        self.trade_handler.process_trade_message(message)
+        if "requestId" in message:
+            with self._orders_lock:
+                self._sent_orders.discard(str(message["requestId"]))
+            self.api.pending.resolve(("openOrder", str(message["requestId"])), message)
+
+    def _on_close_order(self, message):
+        if not isinstance(message, dict):
+            return
+        self.api.order_async = message
+        self.trade_handler.process_trade_message(message)
+        for deal in message.get("deals", []):
+            self.api.orders.closed(deal)
+
+    def _on_financial(self, message):
+        # Прибыль, процент выплаты и котировка для state
+        if isinstance(message, dict):
+            self.trade_handler.update_financial_data(message)
+
+    def _on_opened_deals(self, message):
+        if isinstance(message, list):
+            for deal in message:
+                if isinstance(deal, Mapping):
+                    self.api.orders.opened(deal)
+        self._deal_list_received("updateOpenedDeals")
+
+    async def _on_closed_deals(self, message):
+        self.trade_handler.process_trade_message(message)
+        if isinstance(message, list):
+            for deal in message:
+                if isinstance(deal, Mapping):
+                    self.api.orders.closed(deal)
+        self._deal_list_received("updateClosedDeals")
+        await self.send('42["changeSymbol",{"asset":"AUDNZD_otc","period":60}]')
+
+    def _on_history_period(self, message):
+        if not isinstance(message, dict):
+            return
+        self.api.history_data = message.get("data")
+        self.api.pending.resolve_history(message)
+
+    def _on_stream(self, message):
+        if message:
+            received_ns = time.monotonic_ns()
+            self.api.time_sync.server_timestamp = message[0][1]
+            latency = getattr(self.websocket, 'latency', 0)
+            if latency:
+                self.api.sync.rtt = latency
+            self.api.sync.add_sample(message[0][1], received_ns)
+            self.ready.set("first_timestamp")
+
+    def _on_history_new(self, message):
+        self.api.historyNew = message
+
+    def _on_assets(self, message):
+        if isinstance(message, list) and hasattr(self.api, 'get_assets'):
+            self.api.get_assets.process_assets_response(message)
+            self.ready.set("assets_loaded")
+            logger.debug(f"Processed {len(message)} assets")
+
+    async def _on_not_authorized(self, payload):
+        logging.error("User not Authorized: Please Change SSID for one valid")
+        self.state.ssl_Mutual_exclusion = False
+        # С недействительным SSID переподключаться бессмысленно
+        self.reconnect = False
+        await self.close()
 
     async def on_error(self, error):
         logger.error(error)
-        global_value.websocket_error_reason = str(error)
-        global_value.check_websocket_if_error = True
+        self.state.websocket_error_reason = str(error)
+        self.state.check_websocket_if_error = True
         await self.close()
 
     async def on_close(self, error):
         logger.warning(f"WebSocket connection closed. Reason: {error}")
-        global_value.websocket_is_connected = False
+        self.state.websocket_is_connected = False
         await self.close()
 
 
@@ -0,0 +1,171 @@
+"""Module for decoding JSON payloads of websocket frames."""
+import json
+import logging
+from typing import Any, Dict, List
+
+from pocketoptionapi.ws.objects.records import Tick, assets_from_rows, deals_from_list, ticks_from_rows
+
+logger = logging.getLogger(__name__)
+
+# Порядок выбора библиотеки при backend="auto"
+BACKENDS = ('msgspec', 'orjson', 'stdlib')
+
+# Известные формы бинарных вложений: событие -> тип для типизированного разбора
+STREAM_ROWS = List[Tick]
+DEAL_LIST = List[Dict[str, Any]]
+EVENT_TYPES = {
+    'updateStream': STREAM_ROWS,
+    'updateOpenedDeals': DEAL_LIST,
+    'updateClosedDeals': DEAL_LIST,
+}
+
+# Событие -> преобразование разобранных данных в типизированные записи
+EVENT_RECORDS = {
+    'updateStream': ticks_from_rows,
+    'updateOpenedDeals': deals_from_list,
+    'updateClosedDeals': deals_from_list,
+    'updateAssets': assets_from_rows,
+}
+
+
+def _stdlib_backend():
+    decode = json.JSONDecoder().decode
+
+    def loads(data):
+        # Кадры всегда UTF-8: json.loads(bytes) тратит время на определение кодировки
+        if type(data) is bytes:
+            data = data.decode('utf-8')
+        return decode(data)
+
+    return loads, None
+
+
+def _orjson_backend():
+    import orjson
+    return orjson.loads, None
+
+
+def _msgspec_backend():
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    typed = {event: msgspec.json.Decoder(kind) for event, kind in EVENT_TYPES.items()}
+
+    def loads(data):
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+
+    def typed_loads(event, data):
+        try:
+            payload = typed[event].decode(data)
+        except msgspec.ValidationError:
+            # Форма не совпала с ожидаемой - разбираем без схемы
+            payload = loads(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+        # Строки updateStream уже Tick, ticks_from_rows вернет их как есть
+        return EVENT_RECORDS[event](payload)
+
+    return loads, typed_loads
+
+
+_FACTORIES = {
+    'msgspec': _msgspec_backend,
+    'orjson': _orjson_backend,
+    'stdlib': _stdlib_backend,
+}
+
+
+def available_backends():
+    """Names of the decoder backends importable in this environment"""
+    names = []
+    for name in BACKENDS:
+        try:
+            _FACTORIES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+class FrameDecoder:
+    """JSON decoder for websocket frames with pluggable backends
+
+    Parses bytes of binary frames and text of Socket.IO headers; msgspec
+    and orjson read bytes directly, without a decode('utf-8') copy. With
+    backend="auto" the fastest installed library is used: msgspec, then
+    orjson, then the standard json module. The msgspec backend also
+    decodes known event shapes, such as `updateStream` rows
+    [asset, timestamp, price] and deal lists, with typed decoders and falls
+    back to schemaless parsing on any mismatch.
+
+    Converting deal lists to Deal records costs about as much as the
+    parsing itself, so deal frames decode no faster than plain json.loads;
+    the gain is smaller objects and faster attribute reads afterwards.
+
+    Payloads of known events are returned as records from
+    pocketoptionapi.ws.objects.records on every backend: updateStream as a
+    list of Tick, deal lists as Deal, updateAssets rows as AssetRow.
+
+    All backends raise ValueError for malformed input.
+
+    Usage:
+        decoder = FrameDecoder()              # auto
+        decoder = FrameDecoder("stdlib")      # without optional libraries
+        payload = decoder.decode("updateStream", frame)
+        event, *args = decoder.loads(text[2:])
+
+        api.websocket.decoder = FrameDecoder("orjson")
+    """
+
+    def __init__(self, backend: str = 'auto'):
+        """
+        Args:
+            backend (str): "auto", "msgspec", "orjson" or "stdlib"
+
+        Raises:
+            ValueError: Unknown backend name
+            ImportError: The requested library is not installed
+        """
+        if backend == 'auto':
+            for name in BACKENDS:
+                try:
+                    self.loads, self._typed_loads = _FACTORIES[name]()
+                except ImportError:
+                    continue
+                self.backend = name
+                break
+        elif backend in _FACTORIES:
+            try:
+                self.loads, self._typed_loads = _FACTORIES[backend]()
+            except ImportError:
+                raise ImportError(f"{backend} is required for the {backend} decoder: pip install {backend}")
+            self.backend = backend
+        else:
+            raise ValueError(f"Unknown decoder backend: {backend}, expected one of {', '.join(BACKENDS)}")
+        logger.debug(f"Frame decoder backend: {self.backend}")
+
+    def decode(self, event, data):
+        """Decode the payload of event, using a typed decoder for known shapes
+
+        Args:
+            event (str): Event name from the frame header, may be None
+            data (bytes or str): JSON payload
+
+        Returns:
+            Decoded payload
+        """
+        if self._typed_loads is not None and event in EVENT_TYPES:
+            return self._typed_loads(event, data)
+        return self.convert(event, self.loads(data))
+
+    @staticmethod
+    def convert(event, payload):
+        """Turn an already decoded payload of a known event into records"""
+        records = EVENT_RECORDS.get(event)
+        return records(payload) if records is not None else payload
+
+    def __repr__(self):
+        return f"FrameDecoder({self.backend!r})"
@@ -0,0 +1,60 @@
+"""Module for bounded time-ordered buffers."""
+from collections import OrderedDict
+
+
+class BoundedTimeDict(OrderedDict):
+    """Dict of values ordered by a time key with a maximum size
+
+    Keys are expected to arrive in increasing order (timestamps), which makes
+    insert and eviction of the oldest key O(1). A key older than the newest
+    one is still placed in order, on a slower path.
+
+    Usage:
+        bucket = BoundedTimeDict(maxlen=100)
+        bucket.add(1700000000, value)
+        oldest_time, oldest_value = bucket.oldest()
+    """
+
+    def __init__(self, *args, maxlen: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.maxlen = maxlen
+        if self and any(a > b for a, b in zip(self, list(self)[1:])):
+            self._reorder()
+        self._evict()
+
+    def add(self, key, value):
+        """Insert or replace the value at key and evict the oldest keys"""
+        if key in self:
+            self[key] = value
+            return
+
+        if self and key < next(reversed(self)):
+            if self.maxlen is not None and len(self) >= self.maxlen and key < next(iter(self)):
+                # Старше всех хранимых ключей - сразу был бы вытеснен
+                return
+            self[key] = value
+            self._reorder()
+        else:
+            self[key] = value
+        self._evict()
+
+    def oldest(self):
+        """Get (key, value) of the oldest entry"""
+        key = next(iter(self))
+        return key, self[key]
+
+    def newest(self):
+        """Get (key, value) of the newest entry"""
+        key = next(reversed(self))
+        return key, self[key]
+
+    def _reorder(self):
+        items = sorted(self.items(), key=lambda item: item[0])
+        self.clear()
+        self.update(items)
+
+    def _evict(self):
+        if self.maxlen is None:
+            return
+        while len(self) > self.maxlen:
+            self.popitem(last=False)
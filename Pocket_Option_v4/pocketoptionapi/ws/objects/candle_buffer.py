@@ -0,0 +1,134 @@
+"""Module for fixed-capacity columnar candle storage."""
+import logging
+from typing import Dict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CandleRingBuffer:
+    """Fixed-capacity ring buffer of OHLC candles
+
+    Columns are stored in int64/float64 NumPy arrays of twice the capacity.
+    Every value is written at position i and i + capacity, so the latest
+    `count` candles are always one contiguous slice and can be returned as
+    views without copying. Updating the last bar and appending a new one are
+    O(1); the oldest candle is dropped when the buffer is full.
+
+    Usage:
+        buffer = CandleRingBuffer(capacity=50000)
+        buffer.update(1700000000, 1.1, 1.2, 1.0, 1.15)
+        columns = buffer.get_candles(100)
+        closes = columns['close']
+    """
+
+    COLUMNS = ('time', 'open', 'high', 'low', 'close')
+
+    def __init__(self, capacity: int = 10000):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self._time = np.zeros(2 * capacity, dtype=np.int64)
+        self._open = np.zeros(2 * capacity, dtype=np.float64)
+        self._high = np.zeros(2 * capacity, dtype=np.float64)
+        self._low = np.zeros(2 * capacity, dtype=np.float64)
+        self._close = np.zeros(2 * capacity, dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def last_time(self):
+        """Time of the newest candle or None"""
+        if not self._size:
+            return None
+        return int(self._time[(self._start + self._size - 1) % self.capacity])
+
+    def _write(self, pos: int, time: int, open: float, high: float, low: float, close: float):
+        for pos in (pos, pos + self.capacity):
+            self._time[pos] = time
+            self._open[pos] = open
+            self._high[pos] = high
+            self._low[pos] = low
+            self._close[pos] = close
+
+    def update(self, time: int, open: float, high: float, low: float, close: float):
+        """Update the candle at time or append a new one
+
+        An existing candle keeps its open, takes the new close and extends
+        its high/low, the same way realtime candles are merged elsewhere.
+        """
+        if self._size:
+            last_pos = (self._start + self._size - 1) % self.capacity
+            last_time = self._time[last_pos]
+            if time == last_time:
+                high = max(self._high[last_pos], high)
+                low = min(self._low[last_pos], low)
+                self._write(last_pos, time, self._open[last_pos], high, low, close)
+                return
+            if time < last_time:
+                self._update_past(time, open, high, low, close)
+                return
+
+        if self._size < self.capacity:
+            pos = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            pos = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._write(pos, time, open, high, low, close)
+
+    def _update_past(self, time, open, high, low, close):
+        """Slow path for a candle older than the newest one"""
+        columns = {name: view.copy() for name, view in self.get_candles().items()}
+        index = int(np.searchsorted(columns['time'], time))
+        if index < self._size and columns['time'][index] == time:
+            pos = (self._start + index) % self.capacity
+            high = max(self._high[pos], high)
+            low = min(self._low[pos], low)
+            self._write(pos, time, self._open[pos], high, low, close)
+            return
+
+        if self._size == self.capacity and index == 0:
+            # Свеча старше всего буфера - отбрасываем
+            return
+
+        row = {'time': time, 'open': open, 'high': high, 'low': low, 'close': close}
+        for name in self.COLUMNS:
+            columns[name] = np.insert(columns[name], index, row[name])
+        self.clear()
+        for values in zip(*(columns[name][-self.capacity:] for name in self.COLUMNS)):
+            self.update(*values)
+
+    def extend(self, times, opens, highs, lows, closes):
+        """Update the buffer with many candles in time order"""
+        for values in zip(times, opens, highs, lows, closes):
+            self.update(*values)
+
+    def get_candles(self, count: int = None) -> Dict[str, np.ndarray]:
+        """Get the latest candles as read-only column views
+
+        Args:
+            count (int, optional): Number of candles, all if omitted
+
+        Returns:
+            dict: Column name -> NumPy view, oldest candle first
+        """
+        if count is None or count > self._size:
+            count = self._size
+        begin = (self._start + self._size - count) % self.capacity
+        end = begin + count
+        columns = {}
+        for name, array in zip(self.COLUMNS, (self._time, self._open, self._high, self._low, self._close)):
+            view = array[begin:end]
+            view.flags.writeable = False
+            columns[name] = view
+        return columns
+
+    def clear(self):
+        """Remove all candles"""
+        self._start = 0
+        self._size = 0
@@ -9,6 +9,9 @@ logger = logging.getLogger(__name__)
 
 class Candle:
     """Class for Pocket Option candle."""
+
+    __slots__ = ('__candle_data',)
+
     def __init__(self, candle_data: List):
         if len(candle_data) != 5:
             raise ValueError("Invalid candle data format")
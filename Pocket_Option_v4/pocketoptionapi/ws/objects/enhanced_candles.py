@@ -3,11 +3,16 @@ import logging
 import time
 from datetime import datetime
 from typing import List, Optional, Dict
+import numpy as np
+from pocketoptionapi.ws.objects.candle_buffer import CandleRingBuffer
 
 logger = logging.getLogger(__name__)
 
 class CandleData:
     """Enhanced candle data structure"""
+
+    __slots__ = ('time', 'open', 'close', 'high', 'low')
+
     def __init__(self, time: int, open: float, close: float, high: float, low: float):
         self.time = time
         self.open = open
@@ -15,51 +20,60 @@ class CandleData:
         self.high = high
         self.low = low
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CandleData':
+        return cls(data['time'], data['open'], data['close'], data['high'], data['low'])
+
+    def to_dict(self) -> dict:
+        return {'time': self.time, 'open': self.open, 'close': self.close, 'high': self.high, 'low': self.low}
+
+    def __repr__(self):
+        return f"CandleData(time={self.time}, open={self.open}, close={self.close}, high={self.high}, low={self.low})"
+
 class EnhancedCandles:
-    """Enhanced candles handling class"""
-    def __init__(self):
-        self._candles_cache = {}
+    """Enhanced candles handling class
+
+    Candles are kept per (symbol, timeframe) in fixed-capacity columnar ring
+    buffers, see CandleRingBuffer.
+    """
+    def __init__(self, max_candles: int = 10000):
+        self.max_candles = max_candles
+        self._candles_cache: Dict[tuple, CandleRingBuffer] = {}
         self._last_request_time = {}  # Добавляем отслеживание времени запросов
 
+    def _get_buffer(self, symbol: str, timeframe: int) -> CandleRingBuffer:
+        cache_key = (symbol, timeframe)
+        buffer = self._candles_cache.get(cache_key)
+        if buffer is None:
+            buffer = CandleRingBuffer(self.max_candles)
+            self._candles_cache[cache_key] = buffer
+        return buffer
+
     def update_realtime(self, symbol: str, timeframe: int, candle_data: dict):
         """Update realtime candle data"""
         try:
-            cache_key = f"{symbol}_{timeframe}"
-            if cache_key not in self._candles_cache:
-                self._candles_cache[cache_key] = []
-
-            # Проверяем, существует ли уже свеча с таким временем
-            existing_candle = next(
-                (candle for candle in self._candles_cache[cache_key]
-                 if candle.time == candle_data['time']),
-                None
+            # Обновляем существующую свечу или добавляем новую
+            self._get_buffer(symbol, timeframe).update(
+                candle_data['time'],
+                candle_data['open'],
+                candle_data['high'],
+                candle_data['low'],
+                candle_data['close']
             )
 
-            if existing_candle:
-                # Обновляем существующую свечу
-                existing_candle.close = candle_data['close']
-                existing_candle.high = max(existing_candle.high, candle_data['high'])
-                existing_candle.low = min(existing_candle.low, candle_data['low'])
-            else:
-                # Добавляем новую свечу
-                candle = CandleData(
-                    time=candle_data['time'],
-                    open=candle_data['open'],
-                    close=candle_data['close'],
-                    high=candle_data['high'],
-                    low=candle_data['low']
-                )
-                self._candles_cache[cache_key].append(candle)
-
-                # Сортируем свечи по времени
-                self._candles_cache[cache_key].sort(key=lambda x: x.time)
-
         except Exception as e:
             logger.error(f"Error updating realtime candle: {e}")
 
+    def get_candle_arrays(self, symbol: str, timeframe: int, count: int = 100) -> Dict[str, np.ndarray]:
+        """Get cached candles as read-only column views (time, open, high, low, close)"""
+        buffer = self._candles_cache.get((symbol, timeframe))
+        if buffer is None:
+            return {}
+        return buffer.get_candles(count)
+
     def get_candles(self, symbol: str, timeframe: int, count: int = 100) -> List[CandleData]:
         """Get cached candles for symbol and timeframe"""
-        cache_key = f"{symbol}_{timeframe}"
+        cache_key = (symbol, timeframe)
 
         # Проверяем необходимость обновления данных
         current_time = int(time.time())
@@ -72,12 +86,19 @@ class EnhancedCandles:
 
             self._last_request_time[cache_key] = current_time
 
-        return self._candles_cache.get(cache_key, [])[-count:]
+        columns = self.get_candle_arrays(symbol, timeframe, count)
+        if not columns:
+            return []
+        return [
+            CandleData(time=int(t), open=float(o), close=float(c), high=float(h), low=float(l))
+            for t, o, h, l, c in zip(columns['time'], columns['open'], columns['high'],
+                                     columns['low'], columns['close'])
+        ]
 
     def clear_cache(self, symbol: str = None, timeframe: int = None):
         """Clear candles cache"""
         if symbol and timeframe:
-            cache_key = f"{symbol}_{timeframe}"
+            cache_key = (symbol, timeframe)
             self._candles_cache.pop(cache_key, None)
             self._last_request_time.pop(cache_key, None)
         else:
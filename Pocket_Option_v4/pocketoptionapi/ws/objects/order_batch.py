@@ -0,0 +1,83 @@
+"""Module for results of batch order submission."""
+from typing import Dict, List
+
+
+class OrderResult:
+    """Outcome of one order of a batch
+
+    `index` is the position of the order in the submitted batch, `latency`
+    the seconds from submitting the batch to the server reply.
+    `error` is None for an opened order, otherwise the server error,
+    "timeout", "disconnected" or "invalid order: ...".
+    """
+
+    __slots__ = ('index', 'request_id', 'order_id', 'error', 'latency')
+
+    def __init__(self, index, request_id=None, order_id=None, error=None, latency=None):
+        self.index = index
+        self.request_id = request_id
+        self.order_id = order_id
+        self.error = error
+        self.latency = latency
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return f"OrderResult({self.index}, order_id={self.order_id!r}, latency={self.latency * 1000:.1f}ms)"
+        return f"OrderResult({self.index}, error={self.error!r})"
+
+
+class BatchResult:
+    """Outcomes of a batch of orders in submission order
+
+    Usage:
+        batch = await client.buy_many(orders, timeout=3)
+        if not batch.ok:
+            for result in batch.failed:
+                print(result.index, result.error)
+    """
+
+    __slots__ = ('results', 'elapsed')
+
+    def __init__(self, results: List[OrderResult], elapsed: float):
+        self.results = sorted(results, key=lambda result: result.index)
+        self.elapsed = elapsed
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __getitem__(self, index) -> OrderResult:
+        return self.results[index]
+
+    @property
+    def ok(self) -> bool:
+        """True if every order was opened"""
+        return all(result.ok for result in self.results)
+
+    @property
+    def succeeded(self) -> List[OrderResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[OrderResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def order_ids(self) -> List[str]:
+        """Ids of opened orders in submission order"""
+        return [result.order_id for result in self.results if result.ok]
+
+    @property
+    def errors(self) -> Dict[int, str]:
+        """Batch index -> error of every failed order"""
+        return {result.index: result.error for result in self.results if not result.ok}
+
+    def __repr__(self):
+        return (f"BatchResult({len(self.succeeded)}/{len(self.results)} opened, "
+                f"elapsed={self.elapsed * 1000:.1f}ms)")
@@ -0,0 +1,312 @@
+"""Module for tracking the lifecycle of orders."""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from pocketoptionapi.ws.objects.trade_data import parse_trade_time
+
+logger = logging.getLogger(__name__)
+
+# Направление ордера в числовом виде, как в поле command сделки
+DIRECTIONS = {"call": 0, "put": 1}
+
+
+class OrderUnknownError(ConnectionError):
+    """The connection dropped after the order was sent, it may have been placed
+
+    The order is in the UNKNOWN state until the deal lists of the next
+    session show whether it was opened.
+    """
+
+
+class OrderState:
+    """Order lifecycle states"""
+    REQUESTED = "requested"
+    UNKNOWN = "unknown"
+    OPENED = "opened"
+    CLOSED = "closed"
+    FAILED = "failed"
+
+
+class OrderRecord:
+    """State of a single order
+
+    `transitions` holds (state, local time) pairs in the order they happened.
+    `deal` is the closed deal payload once the order is closed.
+    """
+
+    __slots__ = ('order_id', 'request_id', 'state', 'info', 'deal', 'error', 'transitions', 'future')
+
+    def __init__(self, request_id=None, order_id=None, info=None):
+        self.order_id = order_id
+        self.request_id = request_id
+        self.state = None
+        self.info = info or {}
+        self.deal = None
+        self.error = None
+        self.transitions = []
+        self.future = concurrent.futures.Future()
+
+    def set_state(self, state: str):
+        self.state = state
+        self.transitions.append((state, time.time()))
+
+    @property
+    def profit(self):
+        return self.deal.get("profit") if self.deal else None
+
+    @property
+    def status(self) -> Optional[str]:
+        """'win' or 'loss' for a closed order, None otherwise"""
+        if self.deal is None:
+            return None
+        return "win" if (self.deal.get("profit") or 0) > 0 else "loss"
+
+
+class OrderRegistry:
+    """Registry of orders indexed by order id
+
+    Tracks requested -> opened -> closed transitions, gives every order a
+    completion future and keeps at most `max_closed` closed orders.
+
+    An order sent right before the connection dropped goes to the UNKNOWN
+    state. The first deal of updateOpenedDeals / updateClosedDeals that
+    matches it by requestId moves it on to opened or closed. Without a
+    requestId the deal must match asset, amount and direction and must have
+    been opened no earlier than the order was requested (less
+    `claim_tolerance` seconds for clock skew), so old deals resent after a
+    reconnect are not taken for it. unknown() orders missing from both lists
+    are failed by expire_unknown().
+
+    Usage:
+        api.orders.requested(request_id, asset="EURUSD_otc", amount=1)
+        record = api.orders.wait_closed(order_id, timeout=120)
+        print(record.status, record.profit)
+    """
+
+    def __init__(self, max_closed: int = 10000, claim_tolerance: float = 5.0):
+        self.max_closed = max_closed
+        self.claim_tolerance = claim_tolerance
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, OrderRecord] = {}
+        self._by_request: Dict[str, OrderRecord] = {}
+        self._open: Dict[str, OrderRecord] = {}
+        self._closed: "OrderedDict[str, OrderRecord]" = OrderedDict()
+        # Ордера с неизвестным исходом, по requestId, старые первыми
+        self._unknown: "OrderedDict[str, OrderRecord]" = OrderedDict()
+        # Число ожидающих по id ордеров, которые еще не пришли от сервера
+        self._placeholders: Dict[str, int] = {}
+
+    def requested(self, request_id, **info) -> OrderRecord:
+        """Register an order that has been sent to the server"""
+        record = OrderRecord(request_id=str(request_id), info=info)
+        record.set_state(OrderState.REQUESTED)
+        with self._lock:
+            self._by_request[record.request_id] = record
+        return record
+
+    def opened(self, message: dict) -> Optional[OrderRecord]:
+        """Handle an opened order payload (successopenOrder, updateOpenedDeals)"""
+        order_id = message.get("id")
+        if order_id is None:
+            return None
+
+        with self._lock:
+            record = self._by_id.get(order_id)
+            if record is None and message.get("requestId") is not None:
+                record = self._by_request.pop(str(message["requestId"]), None)
+                if record is not None:
+                    self._unknown.pop(record.request_id, None)
+            if record is None:
+                record = self._claim_unknown(message)
+            if record is None:
+                record = OrderRecord(request_id=message.get("requestId"))
+            if record.state == OrderState.CLOSED:
+                return record
+            record.order_id = order_id
+            record.info.update(message)
+            record.set_state(OrderState.OPENED)
+            self._by_id[order_id] = record
+            self._open[order_id] = record
+        return record
+
+    def closed(self, deal: dict) -> Optional[OrderRecord]:
+        """Handle a closed deal payload (successcloseOrder, updateClosedDeals)"""
+        order_id = deal.get("id")
+        if order_id is None:
+            return None
+
+        with self._lock:
+            record = self._by_id.get(order_id)
+            if record is None:
+                record = self._claim_unknown(deal)
+                if record is not None:
+                    record.order_id = order_id
+                    record.info.update(deal)
+                else:
+                    record = OrderRecord(order_id=order_id, info=dict(deal))
+                self._by_id[order_id] = record
+            elif record.state == OrderState.CLOSED:
+                return record
+            record.deal = deal
+            record.set_state(OrderState.CLOSED)
+            self._open.pop(order_id, None)
+            self._closed[order_id] = record
+            while len(self._closed) > self.max_closed:
+                old_id, _ = self._closed.popitem(last=False)
+                self._by_id.pop(old_id, None)
+
+        if not record.future.done():
+            record.future.set_result(record)
+        return record
+
+    def failed(self, request_id, error) -> Optional[OrderRecord]:
+        """Mark a requested order as rejected by the server"""
+        with self._lock:
+            record = self._by_request.pop(str(request_id), None)
+            self._unknown.pop(str(request_id), None)
+        if record is None:
+            return None
+        record.error = error
+        record.set_state(OrderState.FAILED)
+        if not record.future.done():
+            record.future.set_result(record)
+        return record
+
+    def unknown(self, request_id, error) -> Optional[OrderRecord]:
+        """Mark a requested order whose outcome was lost with the connection
+
+        The record stays registered by request id, so a later reply or deal
+        still completes it.
+        """
+        with self._lock:
+            record = self._by_request.get(str(request_id))
+            if record is None or record.state != OrderState.REQUESTED:
+                return None
+            record.error = error
+            record.set_state(OrderState.UNKNOWN)
+            self._unknown[record.request_id] = record
+        return record
+
+    def unknown_ids(self) -> List[str]:
+        """Get request ids of orders in the UNKNOWN state, oldest first"""
+        with self._lock:
+            return list(self._unknown)
+
+    def expire_unknown(self, error="not placed") -> List[OrderRecord]:
+        """Fail every order still in the UNKNOWN state
+
+        Called once the server has sent both deal lists of a new session:
+        an order missing from them was never placed.
+        """
+        with self._lock:
+            records = list(self._unknown.values())
+            self._unknown.clear()
+            for record in records:
+                self._by_request.pop(record.request_id, None)
+        for record in records:
+            record.error = error
+            record.set_state(OrderState.FAILED)
+            if not record.future.done():
+                record.future.set_result(record)
+        return records
+
+    def _claim_unknown(self, deal) -> Optional[OrderRecord]:
+        """Take the oldest unknown order that deal belongs to, call with the lock held"""
+        if not self._unknown or deal.get("id") in self._by_id:
+            return None
+        request_id = deal.get("requestId")
+        if request_id is not None:
+            record = self._unknown.pop(str(request_id), None)
+        else:
+            record = None
+            opened_at = deal.get("openTimestamp")
+            if opened_at is None:
+                opened_at = parse_trade_time(deal.get("openTime"))
+            if opened_at is None:
+                # Без времени открытия нельзя отличить старую сделку
+                return None
+            for candidate in self._unknown.values():
+                info = candidate.info
+                if (opened_at >= candidate.transitions[0][1] - self.claim_tolerance
+                        and info.get("asset") == deal.get("asset") and info.get("amount") == deal.get("amount")
+                        and DIRECTIONS.get(str(info.get("direction")).lower()) == deal.get("command")):
+                    record = self._unknown.pop(candidate.request_id)
+                    break
+        if record is not None:
+            self._by_request.pop(record.request_id, None)
+        return record
+
+    def get(self, order_id) -> Optional[OrderRecord]:
+        """Get the record of an order by id"""
+        return self._by_id.get(order_id)
+
+    def is_closed(self, order_id) -> bool:
+        return order_id in self._closed
+
+    def open_ids(self) -> List[str]:
+        """Get ids of orders that are open right now"""
+        with self._lock:
+            return list(self._open)
+
+    def closed_records(self) -> List[OrderRecord]:
+        """Get retained closed orders, oldest first"""
+        with self._lock:
+            return list(self._closed.values())
+
+    def _acquire(self, order_id) -> OrderRecord:
+        """Get the record to wait on, with a placeholder for an order not known yet"""
+        with self._lock:
+            record = self._by_id.get(order_id)
+            if record is None:
+                # Ордер еще не известен - ждем его появления
+                record = OrderRecord(order_id=order_id)
+                self._by_id[order_id] = record
+            if record.state is None:
+                self._placeholders[order_id] = self._placeholders.get(order_id, 0) + 1
+            return record
+
+    def _release(self, order_id, record):
+        """Drop the placeholder of an order that never arrived once nobody waits for it"""
+        with self._lock:
+            waiters = self._placeholders.get(order_id)
+            if waiters is None:
+                return
+            if waiters > 1:
+                self._placeholders[order_id] = waiters - 1
+                return
+            del self._placeholders[order_id]
+            if record.state is None and self._by_id.get(order_id) is record:
+                del self._by_id[order_id]
+
+    def wait_closed(self, order_id, timeout: float = None) -> OrderRecord:
+        """Block until the order is closed
+
+        Raises:
+            TimeoutError: If the order is not closed in time
+        """
+        record = self._acquire(order_id)
+        try:
+            return record.future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError(f"Timeout waiting for order {order_id} to close")
+        finally:
+            self._release(order_id, record)
+
+    async def wait_closed_async(self, order_id, timeout: float = None) -> OrderRecord:
+        """Await the order close without blocking the event loop
+
+        Raises:
+            TimeoutError: If the order is not closed in time
+        """
+        record = self._acquire(order_id)
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(record.future)), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Timeout waiting for order {order_id} to close")
+        finally:
+            self._release(order_id, record)
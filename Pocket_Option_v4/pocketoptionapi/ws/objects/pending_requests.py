@@ -0,0 +1,197 @@
+"""Module for correlating websocket requests with their reply frames."""
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class PendingRequests:
+    """Registry of requests waiting for a reply frame
+
+    Every outgoing request registers a future under a key, for example
+    ("openOrder", request_id), ("loadHistoryPeriod", asset, period, index)
+    or ("closeOrder", deal_id). WebsocketClient.on_message resolves the
+    future as soon as the matching reply arrives, so callers wait exactly
+    as long as the server needs and overlapping requests do not clobber
+    each other.
+
+    A resolved future leaves the registry, so a caller that registers,
+    sends and then waits must pass the registered future to wait(): the
+    reply may arrive before the wait starts.
+
+    Usage:
+        future = api.pending.register(("openOrder", request_id))
+        api.buyv3(amount, active, action, expirations, request_id)
+        reply = api.pending.wait(("openOrder", request_id), timeout=5, future=future)
+    """
+
+    def __init__(self, max_unclaimed: int = 1000):
+        """
+        Args:
+            max_unclaimed (int): How many replies without a waiter to keep
+        """
+        self._lock = threading.Lock()
+        self._futures = OrderedDict()
+        self._unclaimed = OrderedDict()
+        # Функции повторной отправки идемпотентных запросов
+        self._replay = {}
+        self.max_unclaimed = max_unclaimed
+        self._ids = itertools.count(int(time.time() * 1000))
+
+    def next_request_id(self) -> int:
+        """Get a request identifier unique within this process"""
+        return next(self._ids)
+
+    def register(self, key, replay=None) -> concurrent.futures.Future:
+        """Register a waiter for key and return its future
+
+        If the reply has already arrived, the returned future is done.
+
+        Args:
+            key: Request key
+            replay (callable, optional): Resends an idempotent request after a reconnect
+        """
+        with self._lock:
+            future = self._unclaimed.pop(key, None)
+            if future is None:
+                future = self._futures.get(key)
+            if future is None:
+                future = concurrent.futures.Future()
+                self._futures[key] = future
+            if replay is not None and not future.done():
+                self._replay[key] = replay
+            return future
+
+    def resolve(self, key, value, keep_unclaimed: bool = False) -> bool:
+        """Complete the waiter for key with value
+
+        Args:
+            key: Request key
+            value: Reply payload
+            keep_unclaimed (bool): Store the reply if nobody waits for it yet
+
+        Returns:
+            bool: True if a waiter was resolved or the reply was stored
+        """
+        with self._lock:
+            future = self._futures.pop(key, None)
+            self._replay.pop(key, None)
+            if future is None:
+                if not keep_unclaimed:
+                    return False
+                future = concurrent.futures.Future()
+                self._unclaimed[key] = future
+                while len(self._unclaimed) > self.max_unclaimed:
+                    self._unclaimed.popitem(last=False)
+        if not future.done():
+            future.set_result(value)
+        return True
+
+    def reject(self, key, error: Exception) -> bool:
+        """Fail the waiter for key with error"""
+        with self._lock:
+            future = self._futures.pop(key, None)
+            self._replay.pop(key, None)
+        if future is None:
+            return False
+        if not future.done():
+            future.set_exception(error)
+        return True
+
+    def discard(self, key):
+        """Forget key without completing its future"""
+        with self._lock:
+            self._futures.pop(key, None)
+            self._unclaimed.pop(key, None)
+            self._replay.pop(key, None)
+
+    def pending(self, *prefix) -> list:
+        """Get keys of unresolved requests that start with prefix, oldest first"""
+        size = len(prefix)
+        with self._lock:
+            return [key for key in self._futures if key[:size] == prefix]
+
+    def replay(self) -> int:
+        """Resend every pending request registered with a replay function
+
+        Returns:
+            int: Number of resent requests
+        """
+        with self._lock:
+            replays = list(self._replay.items())
+        for key, replay in replays:
+            try:
+                replay()
+            except Exception as e:
+                logger.error(f"Error resending {key}: {e}")
+        return len(replays)
+
+    def resolve_first(self, prefix: tuple, value) -> bool:
+        """Resolve the oldest pending request whose key starts with prefix"""
+        keys = self.pending(*prefix)
+        if not keys:
+            return False
+        return self.resolve(keys[0], value)
+
+    def resolve_history(self, message: dict) -> bool:
+        """Resolve a loadHistoryPeriod waiter from its reply
+
+        The reply is matched by asset, period and index when the server echoes
+        them, otherwise it goes to the oldest request for the same asset and
+        period, and finally to the oldest history request at all.
+        """
+        asset = message.get("asset")
+        period = message.get("period")
+        index = message.get("index")
+        if asset is not None and period is not None and index is not None:
+            if self.resolve(("loadHistoryPeriod", asset, period, index), message):
+                return True
+        if asset is not None and period is not None:
+            if self.resolve_first(("loadHistoryPeriod", asset, period), message):
+                return True
+        return self.resolve_first(("loadHistoryPeriod",), message)
+
+    def wait(self, key, timeout: float = None, future: concurrent.futures.Future = None):
+        """Block until the reply for key arrives
+
+        Args:
+            key: Request key
+            timeout (float): Seconds to wait
+            future: Future returned by register(key), required if the request was already sent
+
+        Raises:
+            TimeoutError: If the reply does not arrive in time
+        """
+        if future is None:
+            future = self.register(key)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError(f"Timeout waiting for reply to {key}")
+        finally:
+            self.discard(key)
+
+    async def wait_async(self, key, timeout: float = None, future: concurrent.futures.Future = None):
+        """Await the reply for key without blocking the event loop
+
+        Args:
+            key: Request key
+            timeout (float): Seconds to wait
+            future: Future returned by register(key), required if the request was already sent
+
+        Raises:
+            TimeoutError: If the reply does not arrive in time
+        """
+        if future is None:
+            future = self.register(key)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Timeout waiting for reply to {key}")
+        finally:
+            self.discard(key)
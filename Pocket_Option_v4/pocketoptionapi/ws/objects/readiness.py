@@ -0,0 +1,103 @@
+"""Module for connection readiness events."""
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def _set_done(future):
+    if not future.done():
+        future.set_result(True)
+
+
+class Readiness:
+    """Connection milestones that can be waited for from threads and coroutines
+
+    Events:
+        connected: Websocket is open
+        authenticated: Server accepted the SSID
+        first_timestamp: First server timestamp arrived with updateStream
+        assets_loaded: Assets list was received
+
+    `connected` and `authenticated` are cleared when the connection drops,
+    the data events stay set.
+
+    Usage:
+        if not api.websocket.ready.wait(timeout=10):
+            print(api.websocket.ready.state())
+
+        await api.websocket.ready.wait_async(["authenticated"], timeout=10)
+    """
+
+    EVENTS = ('connected', 'authenticated', 'first_timestamp', 'assets_loaded')
+    # Событий достаточно для торговли; assets_loaded ждут отдельно
+    DEFAULT = ('connected', 'authenticated', 'first_timestamp')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {name: threading.Event() for name in self.EVENTS}
+        self._waiters = {name: [] for name in self.EVENTS}
+
+    def set(self, name: str):
+        """Mark an event as reached and wake up its waiters"""
+        with self._lock:
+            self._events[name].set()
+            waiters, self._waiters[name] = self._waiters[name], []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_set_done, future)
+            except RuntimeError:
+                # Цикл ожидающего уже закрыт
+                pass
+
+    def clear(self, name: str):
+        self._events[name].clear()
+
+    def is_set(self, name: str) -> bool:
+        return self._events[name].is_set()
+
+    def state(self) -> Dict[str, bool]:
+        """Get the status of every event"""
+        return {name: event.is_set() for name, event in self._events.items()}
+
+    def wait(self, names: Iterable[str] = None, timeout: float = None) -> bool:
+        """Block until all events are set
+
+        Args:
+            names (iterable, optional): Events to wait for, DEFAULT if omitted
+            timeout (float, optional): Seconds to wait for all of them together
+
+        Returns:
+            bool: True if all events are set, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for name in names or self.DEFAULT:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._events[name].wait(remaining):
+                return False
+        return True
+
+    async def wait_async(self, names: Iterable[str] = None, timeout: float = None) -> bool:
+        """Await until all events are set without blocking the event loop
+
+        Returns:
+            bool: True if all events are set, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        with self._lock:
+            for name in names or self.DEFAULT:
+                if not self._events[name].is_set():
+                    future = loop.create_future()
+                    self._waiters[name].append((loop, future))
+                    futures.append(future)
+        if not futures:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*futures), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
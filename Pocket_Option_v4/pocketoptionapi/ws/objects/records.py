@@ -0,0 +1,214 @@
+"""Module for compact typed records of stream ticks, deals, trades and assets."""
+from collections.abc import Mapping
+from typing import NamedTuple
+
+
+class Tick(NamedTuple):
+    """One realtime price of `updateStream`
+
+    A tuple, so existing `for asset, timestamp, price in ...` code keeps working.
+    """
+    asset: str
+    timestamp: float
+    price: float
+
+
+def ticks_from_rows(rows):
+    """Convert updateStream rows [[asset, timestamp, price], ...] to Ticks
+
+    Returns the rows unchanged if one of them does not have the tick shape.
+    """
+    try:
+        return [row if type(row) is Tick else Tick(row[0], row[1], row[2]) for row in rows]
+    except (IndexError, KeyError, TypeError):
+        return rows
+
+
+def _make_init(cls):
+    """Build __init__ with one keyword argument per field"""
+    arguments = ''.join(f", {name}=None" for name in cls._fields)
+    lines = [f"def __init__(self{arguments}):"]
+    lines += [f"    self.{name} = {name}" for name in cls._fields]
+    if cls._keep_extra:
+        lines.append("    self._extra = None")
+    if len(lines) == 1:
+        lines.append("    pass")
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['__init__']
+
+
+def _make_from_dict(cls):
+    """Build from_dict with one assignment per field"""
+    lines = ["def from_dict(cls, data):",
+             "    \"\"\"Build a record from a dict with the wire key names\"\"\"",
+             "    record = _new(cls)",
+             "    get = data.get"]
+    lines += [f"    record.{name} = get({name!r})" for name in cls._fields]
+    if cls._keep_extra:
+        lines += ["    record._extra = None if _field_set.issuperset(data) else "
+                  "{key: value for key, value in data.items() if key not in _field_set}"]
+    lines.append("    return record")
+    namespace = {'_new': object.__new__, '_field_set': cls._field_set}
+    exec('\n'.join(lines), namespace)
+    return namespace['from_dict']
+
+
+class Record(Mapping):
+    """Slotted record with a read-only dict view
+
+    Fields are attributes, `record.profit`, for fast access in strategy loops.
+    The record is also a Mapping with the wire key names, so code written for
+    the raw dicts keeps working: `record["profit"]`, `record.get("profit", 0)`,
+    `"profit" in record`, `dict(record)`. Every field is a key of the view,
+    None when the server did not send it, like in the dicts built before.
+    The Mapping view is slower than a dict, attribute access is faster.
+
+    Records are read-only views and are not JSON serializable. Code that
+    stored, changed or json.dumps()-ed the former trade and deal dicts
+    should call to_dict() first; get_trade_details() already returns a dict
+    built from it.
+
+    Subclasses that do not define __init__ or from_dict get them generated
+    with one statement per field, as namedtuple does, which is several
+    times faster than setting the fields in a loop.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _field_set = frozenset()
+    # Хранить ключи без поля в _extra (нужен слот _extra)
+    _keep_extra = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '__init__' not in cls.__dict__:
+            cls.__init__ = _make_init(cls)
+        if 'from_dict' not in cls.__dict__:
+            cls.from_dict = classmethod(_make_from_dict(cls))
+
+    def to_dict(self) -> dict:
+        """Plain dict copy with every field and the extra keys"""
+        return dict(self.items())
+
+    def _extra_get(self, key):
+        raise KeyError(key)
+
+    def _extra_keys(self):
+        return ()
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            return getattr(self, key)
+        return self._extra_get(key)
+
+    def get(self, key, default=None):
+        # Без исключения KeyError на каждый отсутствующий ключ, как в Mapping.get
+        if key in self._field_set:
+            return getattr(self, key)
+        try:
+            return self._extra_get(key)
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        yield from self._fields
+        yield from self._extra_keys()
+
+    def __len__(self):
+        return len(self._fields) + len(self._extra_keys())
+
+    def __repr__(self):
+        fields = ', '.join(f"{key}={value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+
+class Deal(Record):
+    """A deal as sent by the server in updateOpenedDeals / updateClosedDeals
+
+    Keys the record has no field for are kept in a side dict and still
+    show up in the Mapping view and in to_dict().
+
+    Usage:
+        for deal in deals:
+            if deal.profit > 0:
+                print(deal.id, deal.asset, deal.profit)
+        raw = deal.to_dict()
+    """
+
+    _fields = ('id', 'uid', 'requestId', 'asset', 'amount', 'profit', 'percentProfit', 'percentLoss',
+               'openPrice', 'closePrice', 'openTime', 'closeTime', 'openTimestamp', 'closeTimestamp',
+               'command', 'isDemo', 'currency')
+    _field_set = frozenset(_fields)
+    _keep_extra = True
+    __slots__ = _fields + ('_extra',)
+
+    def _extra_get(self, key):
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def _extra_keys(self):
+        return self._extra or ()
+
+
+def deals_from_list(items):
+    """Convert a list of deal dicts to Deals, other items are left as they are"""
+    if not isinstance(items, list):
+        return items
+    return [Deal.from_dict(item) if type(item) is dict else item for item in items]
+
+
+class Trade(Record):
+    """A trade as kept by TradeData
+
+    `direction` is the deal command (0 call, 1 put) or the order action,
+    `status` is "win" or "loss", open/close timestamps are epoch seconds.
+    """
+
+    _fields = ('id', 'openTime', 'closeTime', 'openTimestamp', 'closeTimestamp', 'asset', 'amount', 'profit',
+               'percentProfit', 'openPrice', 'closePrice', 'direction', 'isDemo', 'currency', 'status')
+    _field_set = frozenset(_fields)
+    __slots__ = _fields
+
+    @classmethod
+    def from_deal(cls, deal):
+        """Build a trade from a server deal, a Deal or a dict"""
+        get = deal.get
+        profit = get('profit')
+        return cls(id=get('id'), openTime=get('openTime'), closeTime=get('closeTime'), asset=get('asset'),
+                   amount=get('amount'), profit=profit, percentProfit=get('percentProfit'),
+                   openPrice=get('openPrice'), closePrice=get('closePrice'), direction=get('command'),
+                   isDemo=get('isDemo'), currency=get('currency'),
+                   status='win' if (profit or 0) > 0 else 'loss')
+
+
+class AssetRow(list):
+    """One row of `updateAssets` with named access to the known columns
+
+    Still a list, so index based code such as AssetManager is unaffected.
+    """
+
+    __slots__ = ()
+
+    id = property(lambda self: self[0])
+    symbol = property(lambda self: self[1])
+    name = property(lambda self: self[2])
+    type = property(lambda self: self[3])
+    payout = property(lambda self: self[5])
+    is_active = property(lambda self: self[14] if len(self) > 14 else None)
+
+    @property
+    def is_otc(self) -> bool:
+        return str(self[1]).endswith('_otc')
+
+    def to_dict(self) -> dict:
+        return {'id': self.id, 'symbol': self.symbol, 'name': self.name, 'type': self.type,
+                'payout': self.payout, 'is_active': self.is_active, 'is_otc': self.is_otc}
+
+
+def assets_from_rows(rows):
+    """Convert updateAssets rows to AssetRows, short rows are left as they are"""
+    if not isinstance(rows, list):
+        return rows
+    return [AssetRow(row) if type(row) is list and len(row) > 5 else row for row in rows]
@@ -0,0 +1,201 @@
+"""Module for multi-asset tick streaming in Pocket Option API."""
+import asyncio
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from pocketoptionapi.ws.objects.records import Tick
+
+logger = logging.getLogger(__name__)
+
+
+class TickSubscriber:
+    """Bounded tick queue of a single consumer
+
+    When the consumer falls behind, the oldest queued tick is dropped so the
+    websocket reader never blocks. The number of dropped ticks is kept in
+    `dropped`.
+    """
+
+    def __init__(self, assets: Optional[Iterable[str]], maxsize: int, loop=None):
+        self.assets = frozenset(assets) if assets else None
+        self.loop = loop
+        self.dropped = 0
+        if loop is not None:
+            self.queue = asyncio.Queue(maxsize)
+        else:
+            self.queue = queue.Queue(maxsize)
+
+    def wants(self, asset: str) -> bool:
+        return self.assets is None or asset in self.assets
+
+    def put(self, tick):
+        """Queue a tick, dropping the oldest one if the queue is full"""
+        if self.loop is None:
+            self._put(tick, queue.Full, queue.Empty)
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._put(tick, asyncio.QueueFull, asyncio.QueueEmpty)
+        else:
+            self.loop.call_soon_threadsafe(self._put, tick, asyncio.QueueFull, asyncio.QueueEmpty)
+
+    def _put(self, tick, full_error, empty_error):
+        while True:
+            try:
+                self.queue.put_nowait(tick)
+                return
+            except full_error:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except empty_error:
+                    pass
+
+
+class TickStreams:
+    """Subscription manager for realtime ticks of many assets
+
+    Keeps N assets subscribed at once, decodes every row of `updateStream`
+    batches into per-asset ring buffers and fans ticks out to consumers.
+    A tick is a Tick named tuple (asset, timestamp, price).
+
+    Usage:
+        api.streams.subscribe("EURUSD_otc", 60)
+        api.streams.subscribe("AUDNZD_otc", 60)
+
+        # Blocking consumer
+        for asset, timestamp, price in api.streams.iter_ticks("EURUSD_otc"):
+            ...
+
+        # Async consumer
+        async for asset, timestamp, price in api.streams.stream():
+            ...
+
+        # Latest ticks from the ring buffer
+        ticks = api.streams.get_ticks("EURUSD_otc", 100)
+    """
+
+    def __init__(self, api, buffer_size: int = 1000):
+        """
+        Args:
+            api: PocketOptionAPI instance
+            buffer_size (int): Number of ticks kept per asset
+        """
+        self.api = api
+        self.buffer_size = buffer_size
+        self.subscriptions: Dict[str, int] = {}
+        self._buffers: Dict[str, deque] = {}
+        self._subscribers: List[TickSubscriber] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, asset: str, period: int = 60):
+        """Start receiving ticks for asset
+
+        Args:
+            asset (str): Asset symbol (e.g. "EURUSD_otc")
+            period (int): Chart period in seconds
+        """
+        with self._lock:
+            self.subscriptions[asset] = period
+            if asset not in self._buffers:
+                self._buffers[asset] = deque(maxlen=self.buffer_size)
+
+        self.api.change_symbol(asset, period)
+        self.api.subscribe_symbol(asset)
+        logger.debug(f"Subscribed to {asset} ({period}s)")
+
+    def unsubscribe(self, asset: str):
+        """Stop receiving ticks for asset"""
+        with self._lock:
+            if self.subscriptions.pop(asset, None) is None:
+                return
+            self._buffers.pop(asset, None)
+
+        self.api.unsubscribe_symbol(asset)
+        logger.debug(f"Unsubscribed from {asset}")
+
+    def on_stream(self, message):
+        """Handle an updateStream batch [[asset, timestamp, price], ...]"""
+        if not isinstance(message, list):
+            return
+
+        buffers = self._buffers
+        subscribers = self._subscribers
+        for row in message:
+            if type(row) is Tick:
+                tick = row
+            else:
+                try:
+                    tick = Tick(row[0], row[1], row[2])
+                except (IndexError, TypeError):
+                    continue
+
+            buffer = buffers.get(tick[0])
+            if buffer is not None:
+                buffer.append(tick)
+
+            for subscriber in subscribers:
+                if subscriber.wants(tick[0]):
+                    subscriber.put(tick)
+
+    def get_ticks(self, asset: str, count: int = None) -> list:
+        """Get buffered ticks of asset, oldest first"""
+        buffer = self._buffers.get(asset)
+        if not buffer:
+            return []
+        ticks = list(buffer)
+        return ticks[-count:] if count else ticks
+
+    def latest(self, asset: str):
+        """Get the last tick of asset or None"""
+        buffer = self._buffers.get(asset)
+        return buffer[-1] if buffer else None
+
+    def _add_subscriber(self, subscriber: TickSubscriber):
+        with self._lock:
+            self._subscribers = self._subscribers + [subscriber]
+
+    def _remove_subscriber(self, subscriber: TickSubscriber):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscriber]
+
+    async def stream(self, *assets: str, maxsize: int = 1000):
+        """Async generator of ticks
+
+        Args:
+            *assets (str): Assets to receive, all subscribed assets if empty
+            maxsize (int): Queue size before the oldest ticks are dropped
+        """
+        subscriber = TickSubscriber(assets, maxsize, loop=asyncio.get_running_loop())
+        self._add_subscriber(subscriber)
+        try:
+            while True:
+                yield await subscriber.queue.get()
+        finally:
+            self._remove_subscriber(subscriber)
+
+    def iter_ticks(self, *assets: str, maxsize: int = 1000, timeout: float = None):
+        """Blocking iterator of ticks
+
+        Args:
+            *assets (str): Assets to receive, all subscribed assets if empty
+            maxsize (int): Queue size before the oldest ticks are dropped
+            timeout (float, optional): Stop after this many seconds without a tick
+        """
+        subscriber = TickSubscriber(assets, maxsize)
+        self._add_subscriber(subscriber)
+        try:
+            while True:
+                try:
+                    yield subscriber.queue.get(timeout=timeout)
+                except queue.Empty:
+                    return
+        finally:
+            self._remove_subscriber(subscriber)
@@ -1,10 +1,47 @@
 import logging
 import time
+from collections import deque
 from datetime import datetime, timedelta, timezone
 
 
+# Допустимый дрейф часов, частей на миллион
+MAX_DRIFT_PPM = 500.0
+
+
 class TimeSynchronizer:
-    def __init__(self):
+    """Model of the server clock built from server timestamps
+
+    Every timestamp from updateStream is a sample of the server clock taken
+    `delay` seconds before it is received. The sample with the smallest
+    delay has the largest observed offset, so per `bucket` seconds only
+    that sample is kept. Offset and drift are a least squares fit over the
+    buckets of the last `window` seconds, measured against
+    time.monotonic_ns() so wall clock adjustments do not move the model.
+    Half of the websocket ping round trip is added back as the delay of the
+    best sample.
+
+    now() costs one monotonic_ns() call and a multiply-add.
+
+    Usage:
+        sync = TimeSynchronizer()
+        sync.add_sample(server_timestamp)
+        print(sync.now(), sync.metrics())
+    """
+
+    def __init__(self, window: float = 120.0, bucket: float = 2.0):
+        """
+        :param window: Seconds of samples used for the fit.
+        :param bucket: Seconds per bucket, one best sample is kept per bucket.
+        """
+        self.window_ns = int(window * 1e9)
+        self.bucket_ns = int(bucket * 1e9)
+        self.rtt = 0.0
+        self.samples = 0
+        self.jitter = 0.0
+        self.last_sample_ns = None
+        self._buckets = deque()
+        # (момент модели в ns, смещение в секундах, дрейф) - заменяется целиком
+        self._model = None
         self.server_time_reference = None
         self.local_time_reference = None
         self.timezone_offset = timedelta(seconds=self._get_local_timezone_offset())
@@ -21,30 +58,116 @@ class TimeSynchronizer:
         offset = (local_time - utc_time).total_seconds()
         return offset
 
-    def synchronize(self, server_time):
+    @property
+    def is_synced(self) -> bool:
+        return self._model is not None
+
+    def add_sample(self, server_time, local_ns=None):
         """
-        Sincroniza el tiempo local con el tiempo del servidor.
+        Adds a server timestamp to the model.
 
-        :param server_time: Tiempo del servidor en segundos (puede ser un timestamp).
+        :param server_time: Server time in seconds.
+        :param local_ns: time.monotonic_ns() when the timestamp was received, now by default.
         """
+        if local_ns is None:
+            local_ns = time.monotonic_ns()
+        observed = server_time - local_ns / 1e9
+
+        if self._model is not None:
+            # Разброс задержки относительно текущей модели
+            residual = abs(self._offset_at(local_ns) - self.rtt / 2 - observed)
+            self.jitter += (residual - self.jitter) / 16
+
+        index = local_ns // self.bucket_ns
+        changed = True
+        if self._buckets and self._buckets[-1][0] == index:
+            if observed > self._buckets[-1][2]:
+                self._buckets[-1] = (index, local_ns, observed)
+            else:
+                changed = False
+        else:
+            self._buckets.append((index, local_ns, observed))
+        while self._buckets and local_ns - self._buckets[0][1] > self.window_ns:
+            self._buckets.popleft()
+            changed = True
+
+        self.samples += 1
+        self.last_sample_ns = local_ns
+        if changed:
+            # Пересчет только когда изменился лучший образец
+            self._fit(local_ns)
 
         self.server_time_reference = server_time
         self.local_time_reference = time.time()
 
+    def _fit(self, local_ns):
+        count = len(self._buckets)
+        drift = 0.0
+        if count >= 3:
+            mean_t = sum(item[1] for item in self._buckets) / count
+            mean_o = sum(item[2] for item in self._buckets) / count
+            var = sum((item[1] - mean_t) ** 2 for item in self._buckets)
+            if var > 0:
+                drift = sum((item[1] - mean_t) * (item[2] - mean_o) for item in self._buckets) / var * 1e9
+                drift = max(-MAX_DRIFT_PPM, min(MAX_DRIFT_PPM, drift * 1e6)) / 1e6
+            # Верхняя огибающая: сдвигаем прямую к лучшему образцу
+            offset = max(item[2] - drift * (item[1] - local_ns) / 1e9 for item in self._buckets)
+        else:
+            offset = max(item[2] for item in self._buckets)
+        self._model = (local_ns, offset + self.rtt / 2, drift)
+
+    def _offset_at(self, local_ns):
+        ref_ns, offset, drift = self._model
+        return offset + drift * (local_ns - ref_ns) / 1e9
+
+    def now(self) -> float:
+        """
+        Current server time in seconds, local time.time() until the first sample.
+        """
+        model = self._model
+        if model is None:
+            return time.time()
+        local_ns = time.monotonic_ns()
+        ref_ns, offset, drift = model
+        return local_ns / 1e9 + offset + drift * (local_ns - ref_ns) / 1e9
+
+    def metrics(self) -> dict:
+        """
+        Clock model metrics.
+
+        :return: offset (server minus local wall clock), drift_ppm, jitter and rtt in seconds,
+            samples, buckets in the window and age of the last sample.
+        """
+        if self._model is None:
+            return {'synced': False, 'samples': self.samples}
+        return {
+            'synced': True,
+            'offset': self.now() - time.time(),
+            'drift_ppm': self._model[2] * 1e6,
+            'jitter': self.jitter,
+            'rtt': self.rtt,
+            'samples': self.samples,
+            'buckets': len(self._buckets),
+            'age': (time.monotonic_ns() - self.last_sample_ns) / 1e9,
+        }
+
+    def synchronize(self, server_time):
+        """
+        Sincroniza el tiempo local con el tiempo del servidor.
+
+        :param server_time: Tiempo del servidor en segundos (puede ser un timestamp).
+        """
+        self.add_sample(server_time)
+
     def get_synced_time(self):
         """
         Obtiene el tiempo sincronizado basado en el tiempo actual del sistema.
 
         :return: Tiempo sincronizado en segundos.
         """
-        if self.server_time_reference is None or self.local_time_reference is None:
+        if self._model is None:
             raise ValueError("El tiempo no ha sido sincronizado aún.")
-
-        # Calcula la diferencia de tiempo desde la última sincronización
-        elapsed_time = time.time() - self.local_time_reference
-        # Calcula el tiempo sincronizado
-        synced_time = self.server_time_reference + elapsed_time
-        return synced_time
+        return self.now()
 
     def get_synced_datetime(self):
         """
@@ -1,10 +1,113 @@
+import bisect
+import calendar
 import logging
 import json
+from collections import defaultdict
+from collections.abc import Mapping
 from datetime import datetime, timedelta  # добавляем timedelta
 import pocketoptionapi.global_value as global_value
+from pocketoptionapi.ws.objects.records import Trade
+from pocketoptionapi.ws.objects.trade_ledger import TradeEvent, TradeLedger
 
 logger = logging.getLogger(__name__)
 
+DAY = 86400
+
+
+def parse_trade_time(value):
+    """Convert a trade time to epoch seconds
+
+    Args:
+        value: Epoch number or "%Y-%m-%d %H:%M:%S" string (read as UTC)
+
+    Returns:
+        int or None if the value can not be parsed
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        # fromisoformat заметно быстрее strptime для "%Y-%m-%d %H:%M:%S"
+        return calendar.timegm(datetime.fromisoformat(value).timetuple())
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+
+def _new_aggregate():
+    return {
+        'total_trades': 0,
+        'wins': 0,
+        'losses': 0,
+        'total_profit': 0,
+        'best_trade': None,
+        'worst_trade': None
+    }
+
+
+def _add_to_aggregate(aggregate, trade):
+    aggregate['total_trades'] += 1
+    if trade.status == 'win':
+        aggregate['wins'] += 1
+    else:
+        aggregate['losses'] += 1
+    profit = trade.profit or 0
+    aggregate['total_profit'] += profit
+
+    # Отслеживаем лучшую/худшую сделки
+    if not aggregate['best_trade'] or profit > (aggregate['best_trade'].profit or 0):
+        aggregate['best_trade'] = trade
+    if not aggregate['worst_trade'] or profit < (aggregate['worst_trade'].profit or 0):
+        aggregate['worst_trade'] = trade
+
+
+def _merge_aggregate(aggregate, other):
+    for key in ('total_trades', 'wins', 'losses', 'total_profit'):
+        aggregate[key] += other[key]
+    best, worst = other['best_trade'], other['worst_trade']
+    if best and (not aggregate['best_trade'] or (best.profit or 0) > (aggregate['best_trade'].profit or 0)):
+        aggregate['best_trade'] = best
+    if worst and (not aggregate['worst_trade'] or (worst.profit or 0) < (aggregate['worst_trade'].profit or 0)):
+        aggregate['worst_trade'] = worst
+
+
+def _remove_from_aggregate(aggregate, trade):
+    """Subtract a trade from an aggregate
+
+    Returns:
+        bool: True if the trade was the best or worst one and they must be found again
+    """
+    aggregate['total_trades'] -= 1
+    if trade.status == 'win':
+        aggregate['wins'] -= 1
+    else:
+        aggregate['losses'] -= 1
+    aggregate['total_profit'] -= trade.profit or 0
+    return aggregate['best_trade'] is trade or aggregate['worst_trade'] is trade
+
+
+def _find_extremes(aggregate, trades):
+    best = worst = None
+    for trade in trades:
+        profit = trade.profit or 0
+        if not best or profit > (best.profit or 0):
+            best = trade
+        if not worst or profit < (worst.profit or 0):
+            worst = trade
+    aggregate['best_trade'] = best
+    aggregate['worst_trade'] = worst
+
+
+def _same_trade(old, new):
+    # Метки времени выводятся из openTime/closeTime, поэтому их не сравниваем
+    for name in Trade._fields:
+        if name not in ('openTimestamp', 'closeTimestamp') and getattr(old, name) != getattr(new, name):
+            return False
+    return True
+
 
 class TradeData:
     """
@@ -15,6 +118,13 @@ class TradeData:
     - Tracking open/closed trades
     - Calculating trading statistics
 
+    Trades are indexed by open time (epoch seconds, parsed once on insert)
+    globally, by asset and by demo flag, and per-day aggregates are kept up
+    to date, so range queries and period statistics cost O(log n + k).
+
+    Trades are stored as slotted Trade records, which also read like the
+    former dicts: trade.profit or trade["profit"].
+
     Usage:
         # Get trading statistics
         stats = api.websocket_client.trade_handler.get_statistics()
@@ -27,7 +137,9 @@ class TradeData:
     """
     """Class for handling trade data and statistics"""
 
-    def __init__(self):
+    def __init__(self, state=None):
+        # Состояние сессии; по умолчанию модуль global_value
+        self.state = state if state is not None else global_value
         self.trades = {}  # История всех сделок
         self.open_trades = {}  # Активные сделки
         self.statistics = {
@@ -37,6 +149,16 @@ class TradeData:
             'total_profit': 0,
             'win_rate': 0,
         }
+        # Индексы: отсортированные списки (время открытия, id сделки)
+        self._time_index = []
+        self._asset_index = defaultdict(list)
+        self._demo_index = defaultdict(list)
+        # Агрегаты по дням: (день, актив или None) -> статистика
+        self._daily = defaultdict(_new_aggregate)
+        self._days = []
+        self.asset_statistics = defaultdict(_new_aggregate)
+        # Колоночный журнал всех обработанных сделок
+        self.ledger = TradeLedger()
 
     def process_trade_message(self, message):
         """
@@ -49,33 +171,21 @@ class TradeData:
             # Проверяем, является ли сообщение списком истории сделок
             if isinstance(message, list) and len(message) > 0:
                 # Проверяем структуру сообщения на соответствие истории сделок
-                if all(isinstance(item, dict) and 'id' in item and 'openTime' in item for item in message):
+                if all(isinstance(item, Mapping) and 'id' in item and 'openTime' in item for item in message):
                     logger.debug(f"Received trade history with {len(message)} trades")
                     # Обрабатываем каждую сделку
-                    for trade in message:
-                        trade_id = trade['id']
-                        self.trades[trade_id] = {
-                            'id': trade_id,
-                            'openTime': trade.get('openTime'),
-                            'closeTime': trade.get('closeTime'),
-                            'asset': trade.get('asset'),
-                            'amount': trade.get('amount'),
-                            'profit': trade.get('profit'),
-                            'percentProfit': trade.get('percentProfit'),
-                            'openPrice': trade.get('openPrice'),
-                            'closePrice': trade.get('closePrice'),
-                            'direction': trade.get('command'),
-                            'isDemo': trade.get('isDemo'),
-                            'currency': trade.get('currency'),
-                            'status': 'win' if trade.get('profit', 0) > 0 else 'loss'
-                        }
-                        # Обновляем статистику
-                        self.update_statistics(self.trades[trade_id])
+                    for deal in message:
+                        trade = Trade.from_deal(deal)
+                        # Повторно присланная сделка без изменений пропускается
+                        if self._store_trade(trade):
+                            self.ledger.append(trade, TradeEvent.HISTORY)
+                            # Обновляем статистику
+                            self.update_statistics(trade)
                     return
 
             # Обработка нового ордера
-            if isinstance(message, dict):
-                if "requestId" in message and message["requestId"] == 'buy':
+            if isinstance(message, Mapping):
+                if "requestId" in message:
                     self.handle_new_order(message)
 
                 # Обработка закрытой сделки
@@ -93,19 +203,22 @@ class TradeData:
         try:
             order_id = message.get("id")
             if order_id:
-                self.open_trades[order_id] = {
-                    'id': order_id,
-                    'openTime': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'asset': message.get('asset'),
-                    'amount': message.get('amount'),
-                    'direction': message.get('action'),
-                    'openPrice': message.get('current_price'),
-                    'isDemo': message.get('isDemo', 1)
-                }
+                open_time = datetime.now()
+                self.open_trades[order_id] = Trade(
+                    id=order_id,
+                    openTime=open_time.strftime("%Y-%m-%d %H:%M:%S"),
+                    openTimestamp=int(open_time.timestamp()),
+                    asset=message.get('asset'),
+                    amount=message.get('amount'),
+                    direction=message.get('action'),
+                    openPrice=message.get('current_price'),
+                    isDemo=message.get('isDemo', 1)
+                )
+                self.ledger.append(self.open_trades[order_id], TradeEvent.OPENED)
 
                 # Обновляем глобальные переменные
-                global_value.order_data = message
-                global_value.order_open.append(order_id)
+                self.state.order_data = message
+                self.state.order_open.append(order_id)
 
                 logger.debug(f"New order opened: {order_id}")
 
@@ -120,66 +233,139 @@ class TradeData:
                 deal_id = deal["id"]
 
                 # Собираем полные данные о сделке
-                trade_data = {
-                    'id': deal_id,
-                    'openTime': deal.get('openTime'),
-                    'closeTime': deal.get('closeTime'),
-                    'asset': deal.get('asset'),
-                    'amount': deal.get('amount'),
-                    'profit': deal.get('profit'),
-                    'percentProfit': deal.get('percentProfit'),
-                    'openPrice': deal.get('openPrice'),
-                    'closePrice': deal.get('closePrice'),
-                    'direction': deal.get('command'),
-                    'isDemo': deal.get('isDemo'),
-                    'currency': deal.get('currency'),
-                    'status': 'win' if deal.get('profit', 0) > 0 else 'loss'
-                }
+                trade_data = Trade.from_deal(deal)
 
-                # Сохраняем данные
-                self.trades[deal_id] = trade_data
+                # Сохраняем данные; закрытие приходит еще раз в updateClosedDeals
+                if self._store_trade(trade_data):
+                    self.ledger.append(trade_data, TradeEvent.CLOSED)
 
-                # Обновляем статистику
-                self.update_statistics(trade_data)
+                    # Обновляем статистику
+                    self.update_statistics(trade_data)
 
                 # Обновляем глобальные переменные
-                global_value.order_closed.append(deal_id)
-                global_value.stat.append([deal_id, trade_data['status']])
+                self.state.order_closed.append(deal_id)
+                self.state.stat.append([deal_id, trade_data.status])
 
                 # Удаляем из открытых сделок
                 if deal_id in self.open_trades:
                     del self.open_trades[deal_id]
 
-                logger.debug(f"Deal closed: {deal_id}, Profit: {trade_data['profit']}")
+                logger.debug(f"Deal closed: {deal_id}, Profit: {trade_data.profit}")
 
         except Exception as e:
             logger.error(f"Error handling closed deal: {e}")
 
+    def _store_trade(self, trade):
+        """Save a trade and update indexes and aggregates
+
+        A trade already stored with the same data is skipped. A changed one
+        replaces the stored trade: it is subtracted from the aggregates and
+        the statistics and the new one is added.
+
+        Returns:
+            bool: False if the trade was already stored unchanged
+        """
+        old_trade = self.trades.get(trade.id)
+        if old_trade is not None:
+            if _same_trade(old_trade, trade):
+                return False
+            self._unindex_trade(old_trade)
+            self._revert_statistics(old_trade)
+
+        trade.openTimestamp = parse_trade_time(trade.openTime)
+        trade.closeTimestamp = parse_trade_time(trade.closeTime)
+        self.trades[trade.id] = trade
+        self._index_trade(trade)
+        return True
+
+    def _index_keys(self, trade):
+        day = (trade.openTimestamp or 0) // DAY
+        return day, [(day, None), (day, trade.asset)]
+
+    def _index_trade(self, trade):
+        entry = (trade.openTimestamp or 0, trade.id)
+        bisect.insort(self._time_index, entry)
+        bisect.insort(self._asset_index[trade.asset], entry)
+        bisect.insort(self._demo_index[trade.isDemo], entry)
+
+        day, keys = self._index_keys(trade)
+        position = bisect.bisect_left(self._days, day)
+        if position == len(self._days) or self._days[position] != day:
+            self._days.insert(position, day)
+        for key in keys:
+            _add_to_aggregate(self._daily[key], trade)
+        _add_to_aggregate(self.asset_statistics[trade.asset], trade)
+
+    def _unindex_trade(self, trade):
+        entry = (trade.openTimestamp or 0, trade.id)
+        for index in (self._time_index, self._asset_index[trade.asset], self._demo_index[trade.isDemo]):
+            position = bisect.bisect_left(index, entry)
+            if position < len(index) and index[position] == entry:
+                del index[position]
+
+        # Вычитаем сделку из агрегатов; лучшую/худшую ищем заново, только если это была она
+        day, keys = self._index_keys(trade)
+        for key in keys:
+            if _remove_from_aggregate(self._daily[key], trade):
+                index = self._time_index if key[1] is None else self._asset_index[key[1]]
+                _find_extremes(self._daily[key], (self.trades[trade_id] for _, trade_id in
+                                                  self._range(index, day * DAY, day * DAY + DAY - 1)))
+
+        aggregate = self.asset_statistics[trade.asset]
+        if _remove_from_aggregate(aggregate, trade):
+            _find_extremes(aggregate, (self.trades[trade_id] for _, trade_id in self._asset_index[trade.asset]))
+
+    @staticmethod
+    def _range(index, start=None, end=None):
+        """Get index entries with start <= open time <= end"""
+        low = bisect.bisect_left(index, (start,)) if start is not None else 0
+        high = bisect.bisect_left(index, (end + 1,)) if end is not None else len(index)
+        return index[low:high]
+
     def update_financial_data(self, message):
         """Update financial indicators"""
+        quotation = message.get("quotation")
+        if isinstance(quotation, dict):
+            # Котировка из ответа на changeSymbol
+            self.state.current_price = quotation.get("bid")
+            self.state.volume = quotation.get("volume")
+            self.state.percent_profit = message.get("profit_percent")
         if "profit" in message:
-            global_value.profit = message["profit"]
+            self.state.profit = message["profit"]
         if "percentProfit" in message:
-            global_value.percent_profit = message["percentProfit"]
+            self.state.percent_profit = message["percentProfit"]
         if "current_price" in message:
-            global_value.current_price = message["current_price"]
+            self.state.current_price = message["current_price"]
         if "volume" in message:
-            global_value.volume = message["volume"]
+            self.state.volume = message["volume"]
         if "balance" in message:
-            global_value.balance = message["balance"]
+            self.state.balance = message["balance"]
 
     def update_statistics(self, trade_data):
         """Update trading statistics"""
         self.statistics['total_trades'] += 1
 
-        if trade_data['status'] == 'win':
+        if trade_data.status == 'win':
             self.statistics['wins'] += 1
         else:
             self.statistics['losses'] += 1
 
-        self.statistics['total_profit'] += trade_data['profit']
+        self.statistics['total_profit'] += trade_data.profit
         self.statistics['win_rate'] = (self.statistics['wins'] / self.statistics['total_trades']) * 100
 
+    def _revert_statistics(self, trade_data):
+        """Subtract a replaced trade from the trading statistics"""
+        self.statistics['total_trades'] -= 1
+
+        if trade_data.status == 'win':
+            self.statistics['wins'] -= 1
+        else:
+            self.statistics['losses'] -= 1
+
+        self.statistics['total_profit'] -= trade_data.profit or 0
+        total = self.statistics['total_trades']
+        self.statistics['win_rate'] = (self.statistics['wins'] / total) * 100 if total else 0
+
     def get_trade_history(self):
         """Get complete trade history"""
         return self.trades
@@ -193,28 +379,28 @@ class TradeData:
         return self.statistics
 
     def get_filtered_history(self, asset=None, start_date=None, end_date=None, is_demo=None, min_amount=None):
-        """Get filtered trade history"""
+        """Get filtered trade history sorted by open time"""
         try:
             filtered_trades = []
 
-            for trade_id, trade in self.trades.items():
-                if asset and trade['asset'] != asset:
-                    continue
+            start = parse_trade_time(start_date) if start_date else None
+            end = parse_trade_time(end_date) if end_date else None
 
-                if start_date:
-                    trade_time = datetime.strptime(trade['openTime'], "%Y-%m-%d %H:%M:%S")
-                    if trade_time < datetime.strptime(start_date, "%Y-%m-%d %H:%M:%S"):
-                        continue
+            # Выбираем самый узкий индекс
+            if asset:
+                index = self._asset_index.get(asset, [])
+            elif is_demo is not None:
+                index = self._demo_index.get(is_demo, [])
+            else:
+                index = self._time_index
 
-                if end_date:
-                    trade_time = datetime.strptime(trade['openTime'], "%Y-%m-%d %H:%M:%S")
-                    if trade_time > datetime.strptime(end_date, "%Y-%m-%d %H:%M:%S"):
-                        continue
+            for _, trade_id in self._range(index, start, end):
+                trade = self.trades[trade_id]
 
-                if is_demo is not None and trade['isDemo'] != is_demo:
+                if is_demo is not None and trade.isDemo != is_demo:
                     continue
 
-                if min_amount and trade['amount'] < min_amount:
+                if min_amount and trade.amount < min_amount:
                     continue
 
                 filtered_trades.append(trade)
@@ -232,18 +418,17 @@ class TradeData:
                 trade = self.trades[trade_id]
 
                 # Добавляем дополнительные расчеты
-                duration = (datetime.strptime(trade['closeTime'], "%Y-%m-%d %H:%M:%S") -
-                            datetime.strptime(trade['openTime'], "%Y-%m-%d %H:%M:%S")).total_seconds()
+                duration = float(trade.closeTimestamp - trade.openTimestamp)
 
-                price_change = trade['closePrice'] - trade['openPrice']
-                price_change_percent = (price_change / trade['openPrice']) * 100
+                price_change = trade.closePrice - trade.openPrice
+                price_change_percent = (price_change / trade.openPrice) * 100
 
                 return {
-                    **trade,  # Исходные данные сделки
+                    **trade.to_dict(),  # Исходные данные сделки
                     'duration_seconds': duration,
                     'price_change': price_change,
                     'price_change_percent': price_change_percent,
-                    'direction_str': 'CALL' if trade['direction'] == 0 else 'PUT'
+                    'direction_str': 'CALL' if trade.direction == 0 else 'PUT'
                 }
 
             return None
@@ -252,35 +437,39 @@ class TradeData:
             logger.error(f"Error getting trade details: {e}")
             return None
 
-    def get_statistics_by_period(self, period_start, period_end):
-        """Get trading statistics for specific period"""
+    def get_statistics_by_period(self, period_start, period_end, asset=None):
+        """Get trading statistics for specific period
+
+        Whole days inside the period come from the per-day aggregates, only
+        trades of the partial days at the edges are visited.
+        """
         try:
-            filtered_trades = self.get_filtered_history(start_date=period_start, end_date=period_end)
-
-            stats = {
-                'total_trades': len(filtered_trades),
-                'wins': 0,
-                'losses': 0,
-                'total_profit': 0,
-                'win_rate': 0,
-                'average_profit': 0,
-                'best_trade': None,
-                'worst_trade': None
-            }
-
-            for trade in filtered_trades:
-                if trade['status'] == 'win':
-                    stats['wins'] += 1
-                else:
-                    stats['losses'] += 1
-
-                stats['total_profit'] += trade['profit']
-
-                # Отслеживаем лучшую/худшую сделки
-                if not stats['best_trade'] or trade['profit'] > stats['best_trade']['profit']:
-                    stats['best_trade'] = trade
-                if not stats['worst_trade'] or trade['profit'] < stats['worst_trade']['profit']:
-                    stats['worst_trade'] = trade
+            start = parse_trade_time(period_start)
+            end = parse_trade_time(period_end)
+            if start is None or end is None:
+                raise ValueError(f"Invalid period: {period_start} - {period_end}")
+
+            stats = _new_aggregate()
+            stats['win_rate'] = 0
+            stats['average_profit'] = 0
+
+            first_day = -(-start // DAY)
+            last_day = (end + 1) // DAY - 1
+            if first_day <= last_day:
+                edges = [(start, first_day * DAY - 1), ((last_day + 1) * DAY, end)]
+                low = bisect.bisect_left(self._days, first_day)
+                high = bisect.bisect_right(self._days, last_day)
+                for day in self._days[low:high]:
+                    aggregate = self._daily.get((day, asset))
+                    if aggregate:
+                        _merge_aggregate(stats, aggregate)
+            else:
+                edges = [(start, end)]
+
+            index = self._asset_index.get(asset, []) if asset else self._time_index
+            for edge_start, edge_end in edges:
+                for _, trade_id in self._range(index, edge_start, edge_end):
+                    _add_to_aggregate(stats, self.trades[trade_id])
 
             if stats['total_trades'] > 0:
                 stats['win_rate'] = (stats['wins'] / stats['total_trades']) * 100
@@ -290,4 +479,4 @@ class TradeData:
 
         except Exception as e:
             logger.error(f"Error calculating period statistics: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,254 @@
+"""Module for columnar storage of trade events."""
+import logging
+import os
+import threading
+from typing import Dict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TradeEvent:
+    """Ledger event codes"""
+    HISTORY = 0
+    OPENED = 1
+    CLOSED = 2
+
+
+# Колонки журнала: имя -> (dtype, значение по умолчанию)
+LEDGER_COLUMNS = {
+    'event': (np.int8, -1),
+    'id': (object, None),
+    'asset': (object, None),
+    'direction': (np.int8, -1),
+    'amount': (np.float64, np.nan),
+    'profit': (np.float64, np.nan),
+    'percent_profit': (np.float64, np.nan),
+    'open_price': (np.float64, np.nan),
+    'close_price': (np.float64, np.nan),
+    'open_time': (np.int64, -1),
+    'close_time': (np.int64, -1),
+    'is_demo': (np.int8, -1),
+    'currency': (object, None),
+}
+
+SEGMENT_FORMATS = ('parquet', 'feather')
+
+# Направление сделки в числовом виде, как в поле command истории
+DIRECTIONS = {'call': 0, 'put': 1}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("pyarrow is required for Arrow/Parquet/Feather export: pip install pyarrow")
+    return pyarrow
+
+
+class TradeLedger:
+    """Append-only columnar ledger of trade events
+
+    Every processed trade is appended as one row to typed NumPy column
+    buffers that grow by doubling. Exports return views of the filled part
+    of the buffers, so reading 100k+ trades does not copy them or build
+    intermediate dicts. A trade that is opened and later closed appears as
+    two rows with different `event` codes.
+
+    Rows are keyed on (id, event): a trade appended again with the same
+    event replaces its row in place. If that row has already been written
+    to a segment, the new data is appended as a new row, so the last row
+    of an (id, event) pair is the current one.
+
+    Usage:
+        ledger = api.websocket_client.trade_handler.ledger
+        columns = ledger.to_numpy()
+        df = ledger.to_pandas()
+        ledger.write_segment("~/.pocketoption/ledger")
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._size = 0
+        self._flushed = 0
+        self._segment_number = 0
+        # (id сделки, событие) -> номер строки
+        self._rows = {}
+        self._columns = {
+            name: np.full(capacity, default, dtype=dtype)
+            for name, (dtype, default) in LEDGER_COLUMNS.items()
+        }
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        for name, array in self._columns.items():
+            dtype, default = LEDGER_COLUMNS[name]
+            grown = np.full(2 * array.size, default, dtype=dtype)
+            grown[:self._size] = array[:self._size]
+            self._columns[name] = grown
+
+    def append(self, trade: dict, event: int) -> bool:
+        """Append a trade dict in TradeData format
+
+        Returns:
+            bool: True if a new row was added, False if the row of the same
+                trade and event was replaced
+        """
+        direction = trade.get('direction')
+        if isinstance(direction, str):
+            direction = DIRECTIONS.get(direction.lower())
+
+        row = {
+            'event': event,
+            'id': trade.get('id'),
+            'asset': trade.get('asset'),
+            'direction': direction,
+            'amount': trade.get('amount'),
+            'profit': trade.get('profit'),
+            'percent_profit': trade.get('percentProfit'),
+            'open_price': trade.get('openPrice'),
+            'close_price': trade.get('closePrice'),
+            'open_time': trade.get('openTimestamp'),
+            'close_time': trade.get('closeTimestamp'),
+            'is_demo': trade.get('isDemo'),
+            'currency': trade.get('currency'),
+        }
+
+        # Строки без id не объединяются
+        key = (row['id'], event) if row['id'] is not None else None
+        with self._lock:
+            position = self._rows.get(key) if key is not None else None
+            if position is not None and position >= self._flushed:
+                self._write_row(position, row)
+                return False
+            if self._size == self._columns['event'].size:
+                self._grow()
+            position = self._size
+            self._write_row(position, row)
+            if key is not None:
+                self._rows[key] = position
+            self._size += 1
+        return True
+
+    def _write_row(self, position, row):
+        for name, value in row.items():
+            if value is None:
+                value = LEDGER_COLUMNS[name][1]
+            try:
+                self._columns[name][position] = value
+            except (TypeError, ValueError):
+                # Неожиданный тип - оставляем значение по умолчанию
+                logger.debug(f"Ledger column {name} skipped value {value!r}")
+                self._columns[name][position] = LEDGER_COLUMNS[name][1]
+
+    def to_numpy(self, start: int = 0) -> Dict[str, np.ndarray]:
+        """Get rows from `start` on as read-only column views"""
+        with self._lock:
+            size = self._size
+            columns = dict(self._columns)
+        result = {}
+        for name, array in columns.items():
+            view = array[start:size]
+            view.flags.writeable = False
+            result[name] = view
+        return result
+
+    def to_arrow(self, start: int = 0):
+        """Get rows from `start` on as a pyarrow Table
+
+        Numeric columns are wrapped without copying. Object columns are
+        converted with str(), so numeric and string trade ids give the same
+        string schema in every segment.
+        """
+        pa = _import_pyarrow()
+        columns = self.to_numpy(start)
+        return pa.table({
+            name: pa.array([None if value is None else str(value) for value in values], type=pa.string())
+            if values.dtype == object else pa.array(values)
+            for name, values in columns.items()
+        })
+
+    def to_pandas(self, start: int = 0):
+        """Get rows from `start` on as a pandas DataFrame"""
+        import pandas as pd
+
+        return pd.DataFrame(self.to_numpy(start), copy=False)
+
+    def write_segment(self, directory: str, file_format: str = 'parquet'):
+        """Write rows appended since the last call to a new segment file
+
+        Segments are numbered `segment-000001.<format>` and never rewritten,
+        so the directory can be read back as one dataset.
+
+        Args:
+            directory (str): Target directory, created if missing
+            file_format (str): 'parquet' or 'feather'
+
+        Returns:
+            str: Path of the written segment or None if there were no new rows
+        """
+        if file_format not in SEGMENT_FORMATS:
+            raise ValueError(f"Unsupported segment format: {file_format}")
+        _import_pyarrow()
+
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            start, end = self._flushed, self._size
+        if end == start:
+            return None
+
+        table = self.to_arrow(start).slice(0, end - start)
+        self._segment_number = max(self._segment_number, _last_segment_number(directory)) + 1
+        path = os.path.join(directory, f'segment-{self._segment_number:06d}.{file_format}')
+        tmp_path = path + '.tmp'
+
+        if file_format == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp_path)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, tmp_path)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._flushed = end
+        logger.debug(f"Wrote {end - start} ledger rows to {path}")
+        return path
+
+
+def _last_segment_number(directory: str) -> int:
+    numbers = [0]
+    for name in os.listdir(directory):
+        stem, _, extension = name.partition('.')
+        if stem.startswith('segment-') and extension in SEGMENT_FORMATS:
+            try:
+                numbers.append(int(stem[len('segment-'):]))
+            except ValueError:
+                continue
+    return max(numbers)
+
+
+def read_segments(directory: str):
+    """Read all ledger segments of a directory as one pyarrow Table"""
+    pa = _import_pyarrow()
+    directory = os.path.expanduser(directory)
+    tables = []
+    for name in sorted(os.listdir(directory)):
+        stem, _, extension = name.partition('.')
+        if not stem.startswith('segment-') or extension not in SEGMENT_FORMATS:
+            continue
+        path = os.path.join(directory, name)
+        if extension == 'parquet':
+            import pyarrow.parquet as pq
+            tables.append(pq.read_table(path))
+        else:
+            import pyarrow.feather as feather
+            tables.append(feather.read_table(path))
+    if not tables:
+        return None
+    return pa.concat_tables(tables)
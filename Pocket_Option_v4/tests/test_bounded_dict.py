@@ -0,0 +1,53 @@
+from collections import defaultdict
+
+import pytest
+
+from pocketoptionapi.ws.objects.bounded_dict import BoundedTimeDict
+
+
+def test_oldest_keys_are_evicted_at_maxlen():
+    bucket = BoundedTimeDict(maxlen=3)
+    for key in range(1, 6):
+        bucket.add(key, f"v{key}")
+
+    assert list(bucket) == [3, 4, 5]
+    assert bucket.oldest() == (3, "v3")
+    assert bucket.newest() == (5, "v5")
+
+
+def test_late_key_is_placed_in_order_or_dropped():
+    bucket = BoundedTimeDict(maxlen=3)
+    for key in (10, 20, 30):
+        bucket.add(key, key)
+
+    # Между хранимыми ключами: встает по порядку, вытесняется самый старый
+    bucket.add(25, 25)
+    assert list(bucket) == [20, 25, 30]
+    # Старше всех хранимых ключей - сразу был бы вытеснен
+    bucket.add(5, 5)
+    assert list(bucket) == [20, 25, 30]
+    # Существующий ключ заменяется без вытеснения
+    bucket.add(20, "new")
+    assert list(bucket.items()) == [(20, "new"), (25, 25), (30, 30)]
+
+
+def test_initial_items_are_ordered_and_bounded():
+    bucket = BoundedTimeDict({3: "c", 1: "a", 4: "d", 2: "b"}, maxlen=2)
+
+    assert list(bucket.items()) == [(3, "c"), (4, "d")]
+    assert len(BoundedTimeDict({1: "a", 2: "b"})) == 2
+
+
+def test_dict_queue_add_bounds_nested_buckets():
+    # Клиент импортирует модули, которых может не быть в облегченной сборке
+    pytest.importorskip("pocketoptionapi.ws.objects.base")
+    from pocketoptionapi.ws.client import WebsocketClient
+
+    candles = defaultdict(lambda: defaultdict(dict))
+    candles["EURUSD_otc"][60][100] = "old"
+    for timestamp in (160, 220, 280):
+        WebsocketClient.dict_queue_add(None, candles, 3, "EURUSD_otc", 60, timestamp, timestamp)
+
+    bucket = candles["EURUSD_otc"][60]
+    assert isinstance(bucket, BoundedTimeDict)
+    assert list(bucket) == [160, 220, 280]
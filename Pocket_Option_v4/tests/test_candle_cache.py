@@ -0,0 +1,86 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pocketoptionapi.candle_store import CandleStore
+from pocketoptionapi.history import HistoryDownloader
+from pocketoptionapi.resample import OHLC_DTYPE
+from pocketoptionapi.ws.objects.pending_requests import PendingRequests
+
+START = 1700006400
+
+
+def make_candles(times):
+    return np.array([(t, 1.0, 1.2, 0.9, 1.1) for t in times], dtype=OHLC_DTYPE)
+
+
+class FakeHistoryApi:
+    """Отвечает на loadHistoryPeriod свечами из server_times, окна из fail_windows не отвечают"""
+
+    def __init__(self, server_times, fail_windows=()):
+        self.pending = PendingRequests()
+        self.server_times = server_times
+        self.fail_windows = fail_windows
+        self.requests = []
+
+    def getcandles(self, asset, interval, count, end_time):
+        self.requests.append((end_time - count * interval, end_time))
+        if end_time in self.fail_windows:
+            return
+        data = [{'time': t, 'open': 1.0, 'high': 1.2, 'low': 0.9, 'close': 1.1}
+                for t in self.server_times if end_time - count * interval <= t < end_time]
+        message = {'asset': asset, 'period': interval, 'index': end_time, 'data': data}
+        asyncio.get_running_loop().call_soon(self.pending.resolve_history, message)
+
+
+def test_empty_ranges_are_not_reported_missing(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.write("EURUSD_otc", 60, make_candles([START + 120, START + 180]))
+    end = START + 600
+    assert store.missing_ranges("EURUSD_otc", 60, START, end) == [(START, START + 120), (START + 240, end)]
+
+    store.mark_empty("EURUSD_otc", 60, START, START + 120)
+    store.mark_empty("EURUSD_otc", 60, START + 240, START + 360)
+    store.mark_empty("EURUSD_otc", 60, START + 300, START + 420)
+    assert store.missing_ranges("EURUSD_otc", 60, START, end) == [(START + 420, end)]
+
+
+def test_fetch_complete_reports_failed_windows():
+    downloader = HistoryDownloader(None, window_candles=5, timeout=0.05, retries=0)
+    downloader.api = FakeHistoryApi([START + 60 * i for i in range(10)], fail_windows=(START + 600,))
+
+    candles, complete = asyncio.run(downloader.fetch_complete("EURUSD_otc", 60, START, START + 600))
+    assert not complete
+    assert [candle['time'] for candle in candles] == [START + 60 * i for i in range(5)]
+
+    downloader.api.fail_windows = ()
+    candles, complete = asyncio.run(downloader.fetch_complete("EURUSD_otc", 60, START, START + 600))
+    assert complete
+    assert len(candles) == 10
+
+
+def test_cached_candles_store_only_real_bars(tmp_path):
+    pytest.importorskip("pocketoptionapi.ws.objects.base")
+    from pocketoptionapi.async_api import AsyncPocketOption
+
+    end = (int(time.time()) // 60) * 60
+    start = end - 10 * 60
+    # У сервера нет первых двух свечей (рынок закрыт) и свечи start + 300
+    server_times = [t for t in range(start + 120, end, 60) if t != start + 300]
+    api = FakeHistoryApi(server_times)
+    api.history_downloader = HistoryDownloader(api, timeout=0.05, retries=0)
+    client = SimpleNamespace(api=api, candle_store=CandleStore(str(tmp_path)))
+
+    candles = asyncio.run(AsyncPocketOption._get_cached_candles(client, "EURUSD_otc", 60, 10))
+    # Пропуск заполнен при чтении, но в хранилище только настоящие свечи
+    assert [candle['time'] for candle in candles] == list(range(start + 120, end, 60))
+    stored = client.candle_store.read("EURUSD_otc", 60, start, end)['time'].tolist()
+    assert stored == server_times
+
+    requests = len(api.requests)
+    asyncio.run(AsyncPocketOption._get_cached_candles(client, "EURUSD_otc", 60, 10))
+    # Повторно запрашивается не больше последней свечи
+    assert all(request_start >= end - 60 for request_start, _ in api.requests[requests:])
@@ -0,0 +1,217 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pocketoptionapi.ws.objects.order_registry import OrderRegistry, OrderState, OrderUnknownError
+from pocketoptionapi.ws.objects.pending_requests import PendingRequests
+
+
+def make_deal(deal_id, request_id=None, asset="EURUSD_otc", amount=1, command=0, profit=None, opened=None):
+    deal = {"id": deal_id, "asset": asset, "amount": amount, "command": command,
+            "openTimestamp": time.time() if opened is None else opened}
+    if request_id is not None:
+        deal["requestId"] = request_id
+    if profit is not None:
+        deal["profit"] = profit
+    return deal
+
+
+def test_unknown_order_is_matched_by_asset_amount_and_direction():
+    orders = OrderRegistry()
+    orders.requested("1", asset="EURUSD_otc", amount=1, direction="put")
+    record = orders.unknown("1", "disconnected")
+    assert record.state == OrderState.UNKNOWN
+    assert not record.future.done()
+
+    # Сделка другого ордера не подходит по направлению
+    other = orders.opened(make_deal("deal-0", command=0))
+    assert other is not record
+    assert orders.unknown_ids() == ["1"]
+
+    assert orders.opened(make_deal("deal-1", command=1)) is record
+    assert record.state == OrderState.OPENED
+    assert orders.unknown_ids() == []
+
+    orders.closed(make_deal("deal-1", command=1, profit=1.5))
+    assert record.future.result(0).status == "win"
+
+
+def test_old_deal_does_not_claim_unknown_order():
+    orders = OrderRegistry()
+    orders.requested("7", asset="EURUSD_otc", amount=1, direction="call")
+    record = orders.unknown("7", "disconnected")
+
+    # updateClosedDeals после переподключения присылает старые сделки с теми же параметрами
+    old = orders.closed(make_deal("old-deal", command=0, profit=1.8, opened=1000))
+    assert old is not record
+    assert record.state == OrderState.UNKNOWN
+    assert record.order_id is None
+    assert orders.unknown_ids() == ["7"]
+
+    # Сделка без времени открытия тоже не подходит
+    orders.opened({"id": "no-time", "asset": "EURUSD_otc", "amount": 1, "command": 0})
+    assert orders.unknown_ids() == ["7"]
+
+    assert orders.closed(make_deal("new-deal", command=0, profit=1.8)) is record
+    assert record.state == OrderState.CLOSED
+
+
+def test_tracked_deal_does_not_claim_unknown_order():
+    orders = OrderRegistry()
+    tracked = orders.opened(make_deal("deal-8"))
+    orders.requested("8", asset="EURUSD_otc", amount=1, direction="call")
+    record = orders.unknown("8", "disconnected")
+    assert orders.closed(make_deal("deal-8", profit=1)) is tracked
+    assert record.state == OrderState.UNKNOWN
+
+
+def test_unknown_order_is_closed_by_request_id():
+    orders = OrderRegistry()
+    orders.requested("2", asset="EURUSD_otc", amount=1, direction="call")
+    record = orders.unknown("2", "disconnected")
+    assert orders.closed(make_deal("deal-2", request_id=2, profit=-1)) is record
+    assert record.state == OrderState.CLOSED
+    assert orders.get("deal-2") is record
+
+
+def test_expire_unknown_fails_orders_missing_from_deal_lists():
+    orders = OrderRegistry()
+    orders.requested("3", asset="EURUSD_otc", amount=1, direction="call")
+    record = orders.unknown("3", "disconnected")
+    assert orders.expire_unknown() == [record]
+    assert record.state == OrderState.FAILED
+    assert record.future.result(0) is record
+    assert orders.unknown_ids() == []
+
+
+def test_only_requested_orders_become_unknown():
+    orders = OrderRegistry()
+    assert orders.unknown("missing", "disconnected") is None
+    orders.requested("4", asset="EURUSD_otc", amount=1, direction="call")
+    orders.failed("4", "timeout")
+    assert orders.unknown("4", "disconnected") is None
+
+
+def test_wait_for_unknown_id_leaves_no_record_after_timeout():
+    orders = OrderRegistry()
+    with pytest.raises(TimeoutError):
+        orders.wait_closed("never", timeout=0.01)
+    assert orders.get("never") is None
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(orders.wait_closed_async("never", timeout=0.01))
+    assert orders.get("never") is None
+
+
+def test_placeholder_is_kept_while_another_waiter_is_active():
+    async def scenario():
+        orders = OrderRegistry()
+        waiting = asyncio.ensure_future(orders.wait_closed_async("deal-5", timeout=2))
+        await asyncio.sleep(0)
+        with pytest.raises(TimeoutError):
+            await orders.wait_closed_async("deal-5", timeout=0.01)
+
+        orders.closed(make_deal("deal-5", profit=2))
+        record = await waiting
+        assert record.status == "win"
+        assert orders.get("deal-5") is record
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_wait_drops_placeholder():
+    async def scenario():
+        orders = OrderRegistry()
+        waiting = asyncio.ensure_future(orders.wait_closed_async("deal-6"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert orders.get("deal-6") is None
+
+    asyncio.run(scenario())
+
+
+def make_client():
+    # Клиент импортирует модули, которых может не быть в облегченной сборке
+    pytest.importorskip("pocketoptionapi.ws.objects.base")
+    from pocketoptionapi.ws.client import WebsocketClient
+
+    api = SimpleNamespace(pending=PendingRequests(), orders=OrderRegistry(), state=SimpleNamespace(SSID=""))
+    client = WebsocketClient(api)
+    client._send_queue = asyncio.Queue()
+    return client
+
+
+def test_connection_lost_fails_unsent_orders_and_marks_sent_ones_unknown():
+    async def scenario():
+        client = make_client()
+        api = client.api
+        futures = {}
+        for request_id in ("sent", "queued"):
+            futures[request_id] = api.pending.register(("openOrder", request_id))
+            api.orders.requested(request_id, asset="EURUSD_otc", amount=1, direction="call")
+        sent, queued = futures["sent"], futures["queued"]
+
+        client._sent_orders.add("sent")
+        client._send_queue.put_nowait(('42["openOrder",{"requestId":"queued"}]', None))
+        client._send_queue.put_nowait(('42["ps"]', None))
+        client._connection_lost()
+
+        with pytest.raises(OrderUnknownError):
+            sent.result(0)
+        with pytest.raises(ConnectionError) as error:
+            queued.result(0)
+        assert not isinstance(error.value, OrderUnknownError)
+        assert client._send_queue.qsize() == 1
+        assert api.orders.unknown_ids() == ["sent"]
+
+        # Новая сессия: оба списка сделок пришли, ордера в них нет
+        client._resume()
+        client._deal_list_received("updateOpenedDeals")
+        assert api.orders.unknown_ids() == ["sent"]
+        client._deal_list_received("updateClosedDeals")
+        assert api.orders.unknown_ids() == []
+
+    asyncio.run(scenario())
+
+
+def test_timeout_marks_sent_order_unknown_and_drops_queued_frame():
+    async def scenario():
+        client = make_client()
+        from pocketoptionapi.async_api import AsyncPocketOption
+
+        api = client.api
+        api.websocket = client
+        owner = SimpleNamespace(api=api)
+        futures, records = {}, {}
+        for request_id in ("sent", "queued"):
+            futures[request_id] = api.pending.register(("openOrder", request_id))
+            records[request_id] = api.orders.requested(request_id, asset="EURUSD_otc", amount=1, direction="call")
+        client._sent_orders.add("sent")
+
+        result = AsyncPocketOption._abandon_order(owner, ("openOrder", "sent"), futures["sent"], "timeout")
+        assert result == "unknown"
+        assert records["sent"].state == OrderState.UNKNOWN
+        assert api.orders.unknown_ids() == ["sent"]
+
+        result = AsyncPocketOption._abandon_order(owner, ("openOrder", "queued"), futures["queued"], "timeout")
+        assert result == "timeout"
+        assert records["queued"].state == OrderState.FAILED
+
+        # Кадр отмененного ордера еще в очереди: отправитель его пропускает
+        written = []
+        client.websocket = SimpleNamespace(send=lambda data: written.append(data) or asyncio.sleep(0))
+        client._send_queue.put_nowait(('42["openOrder",{"requestId":"queued"}]', None))
+        client._send_queue.put_nowait(('42["ps"]', None))
+        sender = asyncio.ensure_future(client.sender())
+        while client._send_queue.qsize():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        sender.cancel()
+        assert written == ['42["ps"]']
+        assert "queued" not in client._sent_orders
+
+    asyncio.run(scenario())
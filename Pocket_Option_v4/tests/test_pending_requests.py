@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import pytest
+
+from pocketoptionapi.ws.objects.pending_requests import PendingRequests
+
+
+def test_reply_before_wait_is_delivered_through_registered_future():
+    pending = PendingRequests()
+    key = ("openOrder", "1")
+    future = pending.register(key)
+    # Ответ приходит между отправкой и ожиданием
+    assert pending.resolve(key, {"id": "deal-1"})
+    assert pending.wait(key, timeout=0.1, future=future) == {"id": "deal-1"}
+    assert pending.pending("openOrder") == []
+
+
+def test_reply_before_wait_async_is_delivered_through_registered_future():
+    pending = PendingRequests()
+    key = ("loadHistoryPeriod", "EURUSD_otc", 60, 1700000000)
+    future = pending.register(key)
+    pending.resolve_history({"asset": "EURUSD_otc", "period": 60, "index": 1700000000, "data": []})
+
+    reply = asyncio.run(pending.wait_async(key, timeout=0.1, future=future))
+    assert reply["data"] == []
+
+
+def test_reply_after_wait_started():
+    pending = PendingRequests()
+    key = ("openOrder", "2")
+    future = pending.register(key)
+    timer = threading.Timer(0.05, pending.resolve, (key, {"id": "deal-2"}))
+    timer.start()
+    try:
+        assert pending.wait(key, timeout=2, future=future) == {"id": "deal-2"}
+    finally:
+        timer.cancel()
+
+
+def test_unclaimed_reply_is_returned_by_register():
+    pending = PendingRequests()
+    key = ("openOrder", "3")
+    assert pending.resolve(key, {"id": "deal-3"}, keep_unclaimed=True)
+    future = pending.register(key)
+    assert future.done()
+    assert pending.wait(key, timeout=0.1, future=future) == {"id": "deal-3"}
+
+
+def test_reply_without_waiter_is_dropped_by_default():
+    pending = PendingRequests()
+    assert not pending.resolve(("openOrder", "4"), {"id": "deal-4"})
+
+
+def test_wait_times_out_and_forgets_key():
+    pending = PendingRequests()
+    key = ("openOrder", "5")
+    future = pending.register(key)
+    with pytest.raises(TimeoutError):
+        pending.wait(key, timeout=0.01, future=future)
+    assert pending.pending("openOrder") == []
+
+
+def test_reject_fails_waiter():
+    pending = PendingRequests()
+    key = ("openOrder", "6")
+    future = pending.register(key)
+    pending.reject(key, ConnectionError("disconnected"))
+    with pytest.raises(ConnectionError):
+        pending.wait(key, timeout=0.1, future=future)
+
+
+def test_history_reply_goes_to_oldest_matching_request():
+    pending = PendingRequests()
+    first = pending.register(("loadHistoryPeriod", "EURUSD_otc", 60, 1))
+    second = pending.register(("loadHistoryPeriod", "EURUSD_otc", 60, 2))
+    pending.resolve_history({"asset": "EURUSD_otc", "period": 60, "data": [1]})
+    assert first.result(0) == {"asset": "EURUSD_otc", "period": 60, "data": [1]}
+    assert not second.done()
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from pocketoptionapi.ws.objects.records import Deal, Record, Trade
+
+
+def test_declared_fields_are_keys_even_when_none():
+    trade = Trade(id="1", asset="EURUSD_otc", profit=0.92)
+
+    assert trade["closePrice"] is None
+    assert trade.get("closePrice", 0) is None
+    assert "closePrice" in trade
+    assert len(trade) == len(Trade._fields)
+    assert list(trade) == list(Trade._fields)
+    with pytest.raises(KeyError):
+        trade["unknown"]
+    assert trade.get("unknown", 0) == 0
+
+
+def test_to_dict_keeps_every_field_and_extra_keys():
+    deal = Deal.from_dict({"id": "1", "profit": 0.92, "asset": "EURUSD_otc", "openMs": 120})
+    raw = deal.to_dict()
+
+    assert raw == dict(deal)
+    assert raw["openMs"] == 120
+    assert raw["closePrice"] is None
+    assert set(raw) == set(Deal._fields) | {"openMs"}
+    # Запись не сериализуется, ее копия - да
+    with pytest.raises(TypeError):
+        json.dumps(deal)
+    assert json.loads(json.dumps(raw)) == raw
+
+
+def test_generated_constructors_do_not_replace_defined_ones():
+    class Point(Record):
+        _fields = ('x', 'y')
+        _field_set = frozenset(_fields)
+        __slots__ = _fields
+
+        def __init__(self, x=0, y=0):
+            self.x, self.y = x, -y
+
+        @classmethod
+        def from_dict(cls, data):
+            return cls(data["x"], data["y"])
+
+    class Plain(Record):
+        _fields = ('a',)
+        _field_set = frozenset(_fields)
+        __slots__ = _fields
+
+    assert dict(Point(1, 2)) == {"x": 1, "y": -2}
+    assert dict(Point.from_dict({"x": 3, "y": 4})) == {"x": 3, "y": -4}
+    assert dict(Plain.from_dict({"a": 5, "b": 6})) == {"a": 5}
+    assert dict(Plain()) == {"a": None}
+    with pytest.raises(TypeError):
+        Plain(b=1)
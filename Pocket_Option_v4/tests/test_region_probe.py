@@ -0,0 +1,160 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pocketoptionapi.constants import REGION
+from pocketoptionapi.local_server import LocalServer
+from pocketoptionapi.region_probe import HotStandby, RegionProbe
+
+SSID = '42["auth",{"session":"local","isDemo":0,"uid":1,"platform":2}]'
+# Задержка в одну сторону; порядок словаря не совпадает с ожидаемым рейтингом
+DELAYS = {"SLOW": 0.06, "FAST": 0.0, "MIDDLE": 0.03}
+
+
+class DelayProxy:
+    """TCP proxy adding `delay` seconds to every chunk in both directions"""
+
+    def __init__(self, target_port, delay):
+        self.target_port = target_port
+        self.delay = delay
+        self.server = None
+        self.url = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket"
+        return self
+
+    async def _pipe(self, reader, writer):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                await asyncio.sleep(self.delay)
+                writer.write(data)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection("127.0.0.1", self.target_port)
+        await asyncio.gather(self._pipe(client_reader, server_writer), self._pipe(server_reader, client_writer),
+                             return_exceptions=True)
+
+    def close(self):
+        self.server.close()
+
+
+async def start_regions():
+    """Start one local server per delay, return (name -> url, name -> server, proxies)"""
+    regions, servers, proxies = {}, {}, []
+    for name, delay in DELAYS.items():
+        server = await LocalServer(tick_rate=0).start()
+        proxy = await DelayProxy(server.port, delay).start()
+        regions[name], servers[name] = proxy.url, server
+        proxies.append(proxy)
+    return regions, servers, proxies
+
+
+async def stop_regions(servers, proxies):
+    for proxy in proxies:
+        proxy.close()
+    for server in servers.values():
+        await server.stop()
+
+
+async def wait_for(condition, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_probe_ranks_regions_by_latency():
+    async def scenario():
+        regions, servers, proxies = await start_regions()
+        # Закрытый порт: регион недоступен
+        regions["DOWN"] = "ws://127.0.0.1:1/socket.io/?EIO=4&transport=websocket"
+        region = REGION()
+        region.REGIONS = regions
+        try:
+            probe = RegionProbe(regions, region=region, pings=2, timeout=2.0)
+            results = await probe.probe()
+        finally:
+            await stop_regions(servers, proxies)
+
+        assert [result.name for result in results] == ["FAST", "MIDDLE", "SLOW", "DOWN"]
+        assert results[-1].error is not None
+        assert probe.best().name == "FAST"
+        assert probe.ranked_urls() == [regions["FAST"], regions["MIDDLE"], regions["SLOW"]]
+        assert region.get_regions(False)[:3] == probe.ranked_urls()
+
+    asyncio.run(scenario())
+
+
+def test_standby_connects_to_best_region_other_than_main():
+    async def scenario():
+        regions, servers, proxies = await start_regions()
+        region = REGION()
+        region.REGIONS = regions
+        standby = None
+        try:
+            probe = RegionProbe(regions, region=region, pings=2)
+            await probe.probe()
+            client = SimpleNamespace(url=regions["FAST"], region=region, state=SimpleNamespace(SSID=SSID),
+                                     resolve_url=lambda url: url)
+            standby = HotStandby(client, probe, retry_delay=0.05)
+            standby.start()
+            await wait_for(lambda: standby.ready)
+
+            ws, url = standby.take()
+            assert url == regions["MIDDLE"]
+            assert not standby.ready
+            await ws.close()
+        finally:
+            if standby is not None:
+                standby.stop()
+            await stop_regions(servers, proxies)
+
+    asyncio.run(scenario())
+
+
+def test_client_fails_over_to_standby_when_main_connection_drops():
+    # Клиент импортирует модули, которых может не быть в облегченной сборке
+    pytest.importorskip("pocketoptionapi.ws.objects.base")
+    from pocketoptionapi.session_state import SessionState
+    from pocketoptionapi.ws.client import WebsocketClient
+
+    async def scenario():
+        regions, servers, proxies = await start_regions()
+        state = SessionState(SSID, demo=False)
+        client = WebsocketClient(SimpleNamespace(state=state))
+        client.region.REGIONS = regions
+        connect_task = None
+        try:
+            probe = RegionProbe(regions, region=client.region, pings=2)
+            await probe.probe()
+            client.standby = HotStandby(client, probe, retry_delay=0.05)
+            connect_task = asyncio.ensure_future(client.connect())
+            await wait_for(lambda: client.websocket is not None and client.standby.ready)
+
+            main_url, standby_url = client.url, client.standby.url
+            assert main_url == regions["FAST"]
+            assert standby_url == regions["MIDDLE"]
+
+            servers["FAST"].drop_connections()
+            await wait_for(lambda: client.url == standby_url and state.websocket_is_connected)
+        finally:
+            client.reconnect = False
+            if client.standby is not None:
+                client.standby.stop()
+            if connect_task is not None:
+                connect_task.cancel()
+                await asyncio.gather(connect_task, return_exceptions=True)
+            await stop_regions(servers, proxies)
+
+    asyncio.run(scenario())
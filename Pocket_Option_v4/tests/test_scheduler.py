@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from pocketoptionapi.scheduler import TIMEFRAMES, CandleScheduler, next_boundary
+
+
+class FakeApi:
+    """Отвечает на loadHistoryPeriod свечами нативного таймфрейма актива"""
+
+    def __init__(self, native, delay=0.01, slow=()):
+        self.native = native
+        self.delay = delay
+        self.slow = slow
+        self.requested = []
+
+    def server_time(self):
+        return time.time()
+
+    async def get_candles_data_async(self, active, interval, count, end_time=None):
+        assert interval in TIMEFRAMES
+        self.requested.append(interval)
+        await asyncio.sleep(60 if interval in self.slow else self.delay)
+        step = interval if interval == self.native else self.native
+        return [{'time': end_time - step}, {'time': end_time}]
+
+
+def test_timeframes_are_accepted_by_history_requests():
+    assert TIMEFRAMES == [60, 120, 180, 300, 600, 900, 1800, 3600, 7200, 14400, 28800, 86400]
+
+
+def test_detect_sends_probes_at_once_and_caches_result():
+    api = FakeApi(native=300)
+    scheduler = CandleScheduler(api)
+
+    async def scenario():
+        started = time.perf_counter()
+        first, second = await asyncio.gather(scheduler.timeframe("EURUSD_otc"), scheduler.timeframe("EURUSD_otc"))
+        elapsed = time.perf_counter() - started
+        assert await scheduler.timeframe("EURUSD_otc") == 300
+        return first, second, elapsed
+
+    first, second, elapsed = asyncio.run(scenario())
+    assert first == second == 300
+    assert sorted(api.requested) == TIMEFRAMES
+    assert elapsed < 0.5
+
+
+def test_detect_gives_up_after_detect_timeout():
+    api = FakeApi(native=900, slow=(120,))
+    scheduler = CandleScheduler(api, detect_timeout=0.1)
+
+    async def scenario():
+        started = time.perf_counter()
+        timeframe = await scheduler.timeframe("AUDNZD_otc")
+        return timeframe, time.perf_counter() - started
+
+    timeframe, elapsed = asyncio.run(scenario())
+    assert timeframe is None
+    assert elapsed < 1
+    assert "AUDNZD_otc" not in scheduler.timeframes
+
+
+def test_next_boundary():
+    assert next_boundary(1700000000.5, 60) == 1700000040
+    assert next_boundary(1700000040, 60) == 1700000100
@@ -0,0 +1,76 @@
+import random
+import time
+
+import pytest
+
+from pocketoptionapi.ws.objects.time_sync import TimeSynchronizer
+
+OFFSET = 3600.25
+DRIFT = 50e-6
+MAX_DELAY = 0.02
+
+
+def feed(sync, seconds=120.0, step=0.25, seed=3):
+    """Feed server timestamps of a clock with a known offset and drift
+
+    Every timestamp is received 0..MAX_DELAY seconds after the server took
+    it. The last one is received now.
+
+    Returns:
+        callable: True server time for a time.monotonic_ns() value
+    """
+    rng = random.Random(seed)
+    base_ns = time.monotonic_ns() - int(seconds * 1e9)
+
+    def server(local_ns):
+        return base_ns / 1e9 + OFFSET + (local_ns - base_ns) / 1e9 * (1 + DRIFT)
+
+    count = int(seconds / step)
+    for i in range(count + 1):
+        local_ns = base_ns + int(i * step * 1e9)
+        sync.add_sample(server(local_ns) - rng.uniform(0, MAX_DELAY), local_ns)
+    return server
+
+
+def test_now_follows_server_clock_with_offset_and_drift():
+    sync = TimeSynchronizer()
+    server = feed(sync)
+
+    assert sync.is_synced
+    assert sync.now() == pytest.approx(server(time.monotonic_ns()), abs=0.01)
+
+    metrics = sync.metrics()
+    assert metrics["synced"]
+    assert metrics["drift_ppm"] == pytest.approx(DRIFT * 1e6, abs=15)
+    assert metrics["offset"] == pytest.approx(server(time.monotonic_ns()) - time.time(), abs=0.01)
+    # Разброс задержки относительно модели не больше самой задержки
+    assert 0 < metrics["jitter"] < MAX_DELAY
+    assert metrics["samples"] == 481
+    assert metrics["buckets"] in (60, 61)
+    assert 0 <= metrics["age"] < 1
+
+
+def test_half_rtt_is_added_to_the_best_sample():
+    plain, with_rtt = TimeSynchronizer(), TimeSynchronizer()
+    with_rtt.rtt = 0.1
+    feed(plain)
+    feed(with_rtt)
+
+    assert with_rtt.now() - plain.now() == pytest.approx(0.05, abs=0.005)
+
+
+def test_old_buckets_leave_the_window():
+    sync = TimeSynchronizer(window=10.0)
+    feed(sync, seconds=60.0)
+
+    assert sync.metrics()["buckets"] in (5, 6)
+
+
+def test_local_clock_before_first_sample():
+    sync = TimeSynchronizer()
+
+    assert not sync.is_synced
+    assert sync.metrics() == {"synced": False, "samples": 0}
+    assert sync.now() == pytest.approx(time.time(), abs=0.01)
+    with pytest.raises(ValueError):
+        sync.get_synced_time()
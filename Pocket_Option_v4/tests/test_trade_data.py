@@ -0,0 +1,164 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from pocketoptionapi.ws.objects.trade_data import DAY, TradeData, parse_trade_time
+
+START = 1700000000
+ASSETS = ("EURUSD_otc", "AUDCAD_otc", "BTCUSD")
+
+
+def make_state():
+    return SimpleNamespace(order_closed=[], stat=[], order_open=[], order_data=None)
+
+
+def make_deal(rng, deal_id, profit=None):
+    open_time = START + rng.randrange(0, 10 * DAY)
+    return {
+        "id": f"deal-{deal_id}",
+        "openTime": open_time,
+        "closeTime": open_time + 60,
+        "asset": rng.choice(ASSETS),
+        "amount": rng.choice((1, 5, 10)),
+        "profit": rng.choice((-10, -5, 0, 4, 8, 9)) if profit is None else profit,
+        "openPrice": 1.1,
+        "closePrice": 1.2,
+        "command": rng.randrange(2),
+        "isDemo": rng.randrange(2),
+        "currency": "USD",
+    }
+
+
+def brute_force_stats(trades, start, end, asset=None):
+    selected = [trade for trade in trades if start <= trade.openTimestamp <= end
+                and (asset is None or trade.asset == asset)]
+    return {
+        "total_trades": len(selected),
+        "wins": sum(1 for trade in selected if trade.status == "win"),
+        "losses": sum(1 for trade in selected if trade.status != "win"),
+        "total_profit": sum(trade.profit for trade in selected),
+        "best": max((trade.profit for trade in selected), default=None),
+        "worst": min((trade.profit for trade in selected), default=None),
+    }
+
+
+def indexed_stats(handler, start, end, asset=None):
+    stats = handler.get_statistics_by_period(start, end, asset)
+    return {
+        "total_trades": stats["total_trades"],
+        "wins": stats["wins"],
+        "losses": stats["losses"],
+        "total_profit": stats["total_profit"],
+        "best": stats["best_trade"].profit if stats["best_trade"] else None,
+        "worst": stats["worst_trade"].profit if stats["worst_trade"] else None,
+    }
+
+
+@pytest.fixture
+def handler():
+    rng = random.Random(7)
+    handler = TradeData(make_state())
+    deals = [make_deal(rng, i) for i in range(300)]
+    handler.process_trade_message(deals)
+    # Повторная доставка: те же сделки и часть сделок с измененными данными
+    handler.process_trade_message(deals)
+    changed = [dict(deal, profit=rng.choice((-20, 0, 30)), openTime=deal["openTime"] + DAY)
+               for deal in rng.sample(deals, 60)]
+    handler.process_trade_message(changed)
+    # Закрытие, уже пришедшее в updateClosedDeals
+    for deal in changed[:20]:
+        handler.handle_closed_deal({"deals": [dict(deal)]})
+    return handler
+
+
+def test_redelivered_trades_are_not_counted_twice(handler):
+    trades = list(handler.trades.values())
+    assert len(trades) == 300
+    assert handler.statistics["total_trades"] == 300
+    assert handler.statistics["total_profit"] == sum(trade.profit for trade in trades)
+    # Измененные сделки заменяют свою строку журнала
+    assert len(handler.ledger) == 300
+    profits = dict(zip(handler.ledger.to_numpy()["id"], handler.ledger.to_numpy()["profit"]))
+    assert profits == {trade.id: trade.profit for trade in trades}
+
+
+def test_filtered_history_matches_brute_force(handler):
+    trades = list(handler.trades.values())
+    start, end = START + 2 * DAY + 3600, START + 7 * DAY - 1800
+    for asset in (None,) + ASSETS:
+        for is_demo in (None, 0, 1):
+            for min_amount in (None, 5):
+                expected = sorted(
+                    (trade for trade in trades
+                     if start <= trade.openTimestamp <= end
+                     and (asset is None or trade.asset == asset)
+                     and (is_demo is None or trade.isDemo == is_demo)
+                     and (not min_amount or trade.amount >= min_amount)),
+                    key=lambda trade: (trade.openTimestamp, trade.id))
+                result = handler.get_filtered_history(asset=asset, start_date=start, end_date=end,
+                                                      is_demo=is_demo, min_amount=min_amount)
+                assert [trade.id for trade in result] == [trade.id for trade in expected]
+
+
+@pytest.mark.parametrize("start_offset, end_offset", [
+    (0, 12 * DAY),
+    (DAY, 4 * DAY - 1),
+    (DAY + 5000, 6 * DAY + 100),
+    (3 * DAY + 10, 3 * DAY + 20000),
+])
+def test_period_statistics_match_brute_force(handler, start_offset, end_offset):
+    trades = list(handler.trades.values())
+    start, end = START + start_offset, START + end_offset
+    for asset in (None,) + ASSETS:
+        assert indexed_stats(handler, start, end, asset) == brute_force_stats(trades, start, end, asset)
+
+
+def test_asset_statistics_follow_replaced_extremes():
+    handler = TradeData(make_state())
+    rng = random.Random(1)
+    deals = [dict(make_deal(rng, i, profit=profit), asset="EURUSD_otc") for i, profit in enumerate((5, 50, -40))]
+    handler.process_trade_message(deals)
+
+    # Лучшая и худшая сделки пришли заново с другим результатом
+    handler.process_trade_message([dict(deals[1], profit=1), dict(deals[2], profit=2)])
+
+    aggregate = handler.asset_statistics["EURUSD_otc"]
+    assert aggregate["total_trades"] == 3
+    assert aggregate["total_profit"] == 8
+    assert aggregate["best_trade"].profit == 5
+    assert aggregate["worst_trade"].profit == 1
+    assert parse_trade_time(deals[0]["openTime"]) == handler.trades["deal-0"].openTimestamp
+
+
+def test_financial_data_from_quotation_and_profit():
+    state = make_state()
+    handler = TradeData(state)
+    handler.update_financial_data({"asset": "EURUSD_otc", "profit_percent": 92,
+                                   "quotation": {"bid": 1.0854, "volume": 12}})
+    assert (state.current_price, state.volume, state.percent_profit) == (1.0854, 12, 92)
+
+    # percentProfit ответа на ордер важнее процента из котировки
+    handler.update_financial_data({"profit": 8.5, "percentProfit": 85})
+    assert (state.profit, state.percent_profit) == (8.5, 85)
+
+
+def test_client_updates_financial_state_from_events():
+    # Клиент импортирует модули, которых может не быть в облегченной сборке
+    pytest.importorskip("pocketoptionapi.ws.objects.base")
+    from pocketoptionapi.ws.client import WebsocketClient
+    from pocketoptionapi.ws.objects.order_registry import OrderRegistry
+    from pocketoptionapi.ws.objects.pending_requests import PendingRequests
+
+    api = SimpleNamespace(pending=PendingRequests(), orders=OrderRegistry(), state=SimpleNamespace(SSID=""))
+    client = WebsocketClient(api)
+
+    async def scenario():
+        await client.on_message('42["changeSymbol",{"asset":"EURUSD_otc","profit_percent":92,'
+                                '"quotation":{"bid":1.0854,"volume":12}}]')
+        await client.on_message('42["successcloseOrder",{"profit":4.6,"deals":[]}]')
+
+    asyncio.run(scenario())
+    state = client.state
+    assert (state.current_price, state.volume, state.percent_profit, state.profit) == (1.0854, 12, 92, 4.6)
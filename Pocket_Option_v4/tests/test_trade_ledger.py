@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from pocketoptionapi.ws.objects.trade_ledger import TradeEvent, TradeLedger
+
+
+def make_trade(trade_id, profit=1.0, **fields):
+    trade = {"id": trade_id, "asset": "EURUSD_otc", "amount": 1, "profit": profit, "direction": 0,
+             "openTimestamp": 1700000000, "closeTimestamp": 1700000060, "isDemo": 1, "currency": "USD"}
+    trade.update(fields)
+    return trade
+
+
+def test_same_trade_and_event_replaces_row():
+    ledger = TradeLedger(capacity=2)
+    assert ledger.append(make_trade("a"), TradeEvent.OPENED)
+    assert ledger.append(make_trade("a", profit=2.0), TradeEvent.CLOSED)
+    assert not ledger.append(make_trade("a", profit=3.0, currency=None), TradeEvent.CLOSED)
+    assert ledger.append(make_trade("b"), TradeEvent.CLOSED)
+
+    columns = ledger.to_numpy()
+    assert len(ledger) == 3
+    assert list(columns["id"]) == ["a", "a", "b"]
+    assert list(columns["profit"]) == [1.0, 3.0, 1.0]
+    # Поле без значения в новой строке сбрасывается к значению по умолчанию
+    assert columns["currency"][1] is None
+
+
+def test_rows_without_id_are_not_merged():
+    ledger = TradeLedger()
+    ledger.append(make_trade(None), TradeEvent.HISTORY)
+    ledger.append(make_trade(None), TradeEvent.HISTORY)
+    assert len(ledger) == 2
+
+
+def test_to_arrow_converts_numeric_ids_to_strings():
+    pa = pytest.importorskip("pyarrow")
+    ledger = TradeLedger()
+    ledger.append(make_trade(101), TradeEvent.CLOSED)
+    ledger.append(make_trade("deal-2"), TradeEvent.CLOSED)
+
+    table = ledger.to_arrow()
+    assert table.schema.field("id").type == pa.string()
+    assert table.column("id").to_pylist() == ["101", "deal-2"]
+    assert table.column("profit").to_numpy().dtype == np.float64
+
+
+def test_row_changed_after_flush_goes_to_next_segment(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    ledger = TradeLedger()
+    ledger.append(make_trade(7), TradeEvent.CLOSED)
+    first = ledger.write_segment(str(tmp_path))
+    assert ledger.append(make_trade(7, profit=-1.0), TradeEvent.CLOSED)
+    second = ledger.write_segment(str(tmp_path))
+
+    assert pq.read_table(first).column("profit").to_pylist() == [1.0]
+    assert pq.read_table(second).column("profit").to_pylist() == [-1.0]
+    assert ledger.write_segment(str(tmp_path)) is None